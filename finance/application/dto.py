@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, Dict, List, Optional, Protocol, Self
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Self
 
 
 @dataclass
@@ -39,8 +39,7 @@ class BudgetItemDto:
         }
     
 
-@dataclass
-class TransactionDto:
+class TransactionDto(NamedTuple):
     reference: str
     day: str
     source: str
@@ -82,6 +81,34 @@ class TransactionDto:
         }
 
 
+@dataclass
+class CategorizationRuleDto:
+    field: str
+    pattern: str
+    category: str
+    tag: str
+    ignore: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Self:
+        return cls(
+            field=data['field'],
+            pattern=data['pattern'],
+            category=data['category'],
+            tag=data['tag'],
+            ignore=str(data['ignore']),
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            'field': self.field,
+            'pattern': self.pattern,
+            'category': self.category,
+            'tag': self.tag,
+            'ignore': self.ignore,
+        }
+
+
 class CellDto(Protocol):
 
     @property
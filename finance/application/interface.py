@@ -1,6 +1,6 @@
-from typing import List, Protocol
+from typing import Iterable, List, Optional, Protocol
 
-from finance.application.dto import BudgetItemDto, InteractorResultDto, TransactionDto
+from finance.application.dto import BudgetItemDto, CategorizationRuleDto, InteractorResultDto, TransactionDto
 
 
 class BudgetRepositoryInterface(Protocol):
@@ -17,7 +17,19 @@ class HistoryRepositoryInterface(Protocol):
     def save_history(self, filename: str, history: List[TransactionDto]) -> None:
         ...
 
-    def load_history(self, filename: str) -> List[TransactionDto]:
+    def save_history_changes(self, filename: str, upserted: List[TransactionDto], deleted: List[str]) -> None:
+        ...
+
+    def load_history(self, filename: str, month: Optional[int] = None, category: Optional[str] = None, year: Optional[int] = None) -> List[TransactionDto]:
+        ...
+
+
+class RuleRepositoryInterface(Protocol):
+
+    def save_rules(self, filename: str, rules: List[CategorizationRuleDto]) -> None:
+        ...
+
+    def load_rules(self, filename: str) -> List[CategorizationRuleDto]:
         ...
 
 
@@ -53,6 +65,15 @@ class HistoryPresenterInterface(Protocol):
     def present_history(self, result: InteractorResultDto) -> None:
         ...
 
+    def present_rules(self, result: InteractorResultDto) -> None:
+        ...
+
+    def present_suggestions(self, result: InteractorResultDto) -> None:
+        ...
+
+    def present_query(self, result: InteractorResultDto) -> None:
+        ...
+
     def present_success(self, result: InteractorResultDto) -> None:
         ...
 
@@ -77,5 +98,5 @@ class InputReaderInterface(Protocol):
 
 class TransactionImporterInterface(Protocol):
 
-    def import_transactions(self, filename: str) -> List[TransactionDto]:
+    def import_transactions(self, filename: str) -> Iterable[TransactionDto]:
         ...
@@ -1,9 +1,9 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from finance.application.dto import InteractorResultDto
 from finance.application.interface import ReportPresenterInterface
 from finance.domain.budget import Budget, BudgetCategory
-from finance.domain.report import CategoryReport, MonthResult
+from finance.domain.report import CategoryMonthTotals, CategoryReport, MonthResult
 from finance.domain.transaction import History, Transaction
 
 
@@ -14,24 +14,26 @@ class CategoryReportUseCase:
         self.history = history
         self.presenter = presenter
 
-    def execute(self, category: str, months: int) -> None:
+    def execute(self, category: str, months: int, year: Optional[int] = None) -> None:
         budget = self.budget.get_budget_item_by_name(category)
-        transactions = self.history.get_transactions_by_category(category)
-        report = CategoryReport(category, months, budget.amount, transactions)
+        report = CategoryReport(category, months, budget.amount, self.history.aggregates.get_monthly_totals(category, year))
         result = InteractorResultDto(success=True, operation='Category Report', data=report)
         self.presenter.present_category_report(result)
 
 
 class AllCategoryReportUseCase:
 
-    def __init__(self, budget: Budget, category_report_use_case: CategoryReportUseCase) -> None:
+    def __init__(self, budget: Budget, history: History, presenter: ReportPresenterInterface) -> None:
         self.budget = budget
-        self.category_report_use_case = category_report_use_case
+        self.history = history
+        self.presenter = presenter
 
-    def execute(self, months: int) -> None:
-        items = self.budget.list_budget_items()
-        for item in items:
-            self.category_report_use_case.execute(item.name, months)
+    def execute(self, months: int, year: Optional[int] = None) -> None:
+        totals = CategoryMonthTotals(self.history.aggregates.get_category_month_totals(year))
+        for item in self.budget.list_budget_items():
+            report = CategoryReport(item.name, months, item.amount, totals.get_monthly_totals(item.name))
+            result = InteractorResultDto(success=True, operation='Category Report', data=report)
+            self.presenter.present_category_report(result)
 
 
 class MonthResultUseCase:
@@ -41,9 +43,9 @@ class MonthResultUseCase:
         self.history = history
         self.presenter = presenter
 
-    def execute(self, month: int) -> None:
-        transactions = self.history.get_transactions_by_month(month)
+    def execute(self, month: int, year: Optional[int] = None) -> None:
+        totals = self.history.aggregates.get_category_totals(month, year)
         items = {category: [item.name for item in self.budget.get_budget_item_by_category(category)] for category in BudgetCategory}
-        report = MonthResult(month, transactions, items)
+        report = MonthResult.from_totals(month, totals, items, year)
         result = InteractorResultDto(success=True, operation='Month Result', data=report)
         self.presenter.present_month_result(result)
@@ -0,0 +1,75 @@
+import os
+
+from finance.application.dto import CategorizationRuleDto, InteractorResultDto
+from finance.application.interface import HistoryPresenterInterface, RuleRepositoryInterface
+from finance.domain.exception import RuleInvalidException
+from finance.domain.rule import CategorizationRule, RuleField, RuleSet
+
+
+class AddRuleUseCase:
+
+    def __init__(self, rules: RuleSet, presenter: HistoryPresenterInterface) -> None:
+        self.rules = rules
+        self.presenter = presenter
+
+    def execute(self, field: str, pattern: str, category: str, tag: str = '', ignore: bool = False) -> None:
+        operation = 'Add Rule'
+        try:
+            rule = CategorizationRule(RuleField(field), pattern, category, tag, ignore)
+            response = self.rules.add_rule(rule)
+            result = InteractorResultDto(success=True, operation=operation, data=[response.to_dict()])
+        except ValueError:
+            result = InteractorResultDto(success=False, operation=operation, error=f'"{field}" is not a valid rule field. The valid fields are: {[member.value for member in RuleField]}')
+        except RuleInvalidException as e:
+            result = InteractorResultDto(success=False, operation=operation, error=str(e))
+        self.presenter.present_rules(result)
+
+
+class ListRulesUseCase:
+
+    def __init__(self, rules: RuleSet, presenter: HistoryPresenterInterface) -> None:
+        self.rules = rules
+        self.presenter = presenter
+
+    def execute(self) -> None:
+        operation = 'List Rules'
+        response = [rule.to_dict() for rule in self.rules.list_rules()]
+        result = InteractorResultDto(success=True, operation=operation, data=response)
+        self.presenter.present_rules(result)
+
+
+class SaveRulesUseCase:
+
+    def __init__(self, rules: RuleSet, repository: RuleRepositoryInterface, presenter: HistoryPresenterInterface) -> None:
+        self.rules = rules
+        self.repository = repository
+        self.presenter = presenter
+
+    def execute(self, project_name: str) -> None:
+        operation = 'Save Rules'
+        rules_data = [CategorizationRuleDto.from_dict(rule.to_dict()) for rule in self.rules.list_rules()]
+        filename = os.path.join(project_name, 'rules.csv')
+        self.repository.save_rules(filename, rules_data)
+        result = InteractorResultDto(success=True, operation=operation, data=f'Rules with {len(rules_data)} items saved on {filename}')
+        self.presenter.present_success(result)
+
+
+class LoadRulesUseCase:
+
+    def __init__(self, rules: RuleSet, repository: RuleRepositoryInterface, presenter: HistoryPresenterInterface) -> None:
+        self.rules = rules
+        self.repository = repository
+        self.presenter = presenter
+
+    def execute(self, project_name: str) -> None:
+        operation = 'Load Rules'
+        filename = os.path.join(project_name, 'rules.csv')
+        try:
+            response = self.repository.load_rules(filename)
+            self.rules.rules = [CategorizationRule.from_dict(item.to_dict()) for item in response]
+        except (OSError, RuleInvalidException) as e:
+            result = InteractorResultDto(success=False, operation=operation, error=str(e))
+            self.presenter.present_failure(result)
+            return
+        result = InteractorResultDto(success=True, operation=operation, data=f'Rules loaded from {filename} with {len(response)} items')
+        self.presenter.present_success(result)
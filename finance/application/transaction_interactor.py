@@ -1,39 +1,76 @@
+from datetime import date
+from itertools import batched
 import os
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from finance.application.dto import InteractorResultDto, TransactionDto
 from finance.application.interface import HistoryPresenterInterface, HistoryRepositoryInterface, TransactionImporterInterface
-from finance.domain.exception import TransactionExistsException, TransactionNotFoundException, TransactionUpdateException
+from finance.domain.exception import FilterInvalidException, QueryInvalidException, TransactionNotFoundException, TransactionUpdateException
+from finance.domain.filter import TransactionFilter, parse_bool
+from finance.domain.query import Query
+from finance.domain.rule import RuleSet
 from finance.domain.transaction import History, Transaction
 
 
+def parse_changes(kwargs: Dict[str, Any], fields: Dict[str, Callable[[str], Any]], failure: str) -> Dict[str, Any]:
+    invalid = [field for field in kwargs if field not in fields]
+    if invalid:
+        raise TransactionUpdateException(f'{failure} The following fields can not be changed: {' '.join(invalid)}')
+    changes = {}
+    for field, value in kwargs.items():
+        try:
+            changes[field] = fields[field](value) if isinstance(value, str) else value
+        except ValueError as e:
+            raise TransactionUpdateException(f'{failure} "{value}" is not a valid {field}: {str(e)}')
+    if 'month' in changes and not 1 <= changes['month'] <= 12:
+        raise TransactionUpdateException(f'{failure} The month should be between 1 and 12: {changes['month']}')
+    return changes
+
+
 class ImportTransactionsUseCase:
 
-    def __init__(self, history: History, importer: TransactionImporterInterface, presenter: HistoryPresenterInterface) -> None:
+    def __init__(self, history: History, importer: TransactionImporterInterface, presenter: HistoryPresenterInterface, batch_size: int = 1000, rules: Optional[RuleSet] = None) -> None:
         self.history = history
         self.importer = importer
         self.presenter = presenter
+        self.batch_size = batch_size
+        self.rules = rules
 
     def execute(self, filename: str) -> None:
-        result: InteractorResultDto = None
         operation = 'Import Transactions'
+        presented = False
+        if self.history.partial:
+            error = f'Failed to import transactions. The history of {self.history.checkpoint} was loaded for a single period, load it whole before importing'
+            self.presenter.present_import_transactions(InteractorResultDto(success=False, operation=operation, error=error))
+            return
         try:
-            transaction_dto_list = self.importer.import_transactions(filename)
+            transactions = self.importer.import_transactions(filename)
+            batches = [transactions] if isinstance(transactions, list) else batched(transactions, self.batch_size)
+            for batch in batches:
+                response = self.commit(batch)
+                self.presenter.present_import_transactions(InteractorResultDto(success=True, operation=operation, data=response))
+                presented = True
         except Exception as e:
-            result = InteractorResultDto(success=False, operation=operation, error=str(e))
-
-        response = {'imported': [], 'duplicated': []}
-        if result is None:
-            for transaction_dto in transaction_dto_list:
-                transaction = Transaction.from_dict(transaction_dto.to_dict())
-                try:
-                    self.history.add_transaction(transaction)
-                    response['imported'].append(transaction.to_dict())
-                except TransactionExistsException as e:
-                    response['duplicated'].append(str(e))
-            result = InteractorResultDto(success=True, operation=operation, data=response)
-
-        self.presenter.present_import_transactions(result)
+            self.presenter.present_import_transactions(InteractorResultDto(success=False, operation=operation, error=str(e)))
+            return
+
+        if not presented:
+            self.presenter.present_import_transactions(InteractorResultDto(success=True, operation=operation, data={'imported': [], 'duplicated': []}))
+
+    def commit(self, batch: Sequence[TransactionDto]) -> Dict[str, List]:
+        transactions = Transaction.from_rows(batch)
+        if self.rules is not None:
+            references = set()
+            for transaction in transactions:
+                if transaction.reference in references or self.history.has_transaction(transaction.reference):
+                    continue
+                references.add(transaction.reference)
+                self.rules.categorize(transaction)
+        imported, duplicated = self.history.add_transactions(transactions)
+        return {
+            'imported': [transaction.to_dict() for transaction in imported],
+            'duplicated': [transaction.reference for transaction in duplicated],
+        }
 
 
 class ReviewTransactionsUseCase:
@@ -46,14 +83,52 @@ class ReviewTransactionsUseCase:
         result: InteractorResultDto = None
         operation = 'Review Transactions'
         transactions = self.history.get_unreviewed_transactions()
-        response = [TransactionDto.from_dict(item.to_dict()) for item in transactions]
+        response = list(map(TransactionDto._make, Transaction.to_rows(transactions)))
 
         result = InteractorResultDto(success=True, operation=operation, data=response)
         self.presenter.present_review_transactions(result)
         return response
     
 
+class SuggestCategoriesUseCase:
+
+    def __init__(self, history: History, presenter: HistoryPresenterInterface, count: int = 3) -> None:
+        self.history = history
+        self.presenter = presenter
+        self.count = count
+
+    def execute(self, reference: str) -> List[str]:
+        operation = 'Suggest Categories'
+        try:
+            transaction = self.history.get_transaction(reference)
+        except TransactionNotFoundException as e:
+            self.presenter.present_suggestions(InteractorResultDto(success=False, operation=operation, error=str(e)))
+            return []
+
+        suggestions = self.history.suggest_categories(transaction, self.count)
+        response = [{'category': category, 'probability': probability} for category, probability in suggestions]
+        self.presenter.present_suggestions(InteractorResultDto(success=True, operation=operation, data=response))
+        return [category for category, _ in suggestions]
+
+
+class ReviewClustersUseCase:
+
+    def __init__(self, history: History, presenter: HistoryPresenterInterface) -> None:
+        self.history = history
+        self.presenter = presenter
+
+    def execute(self) -> List[List[TransactionDto]]:
+        operation = 'Review Clusters'
+        clusters = self.history.get_unreviewed_clusters()
+        response = [list(map(TransactionDto._make, Transaction.to_rows(cluster))) for cluster in clusters]
+
+        result = InteractorResultDto(success=True, operation=operation, data=response)
+        self.presenter.present_review_transactions(result)
+        return response
+
+
 class UpdateTransactionUseCase:
+    fields: Dict[str, Callable[[str], Any]] = {'category': str, 'month': int, 'tag': str, 'comments': str}
 
     def __init__(self, history: History, presenter: HistoryPresenterInterface) -> None:
         self.history = history
@@ -69,11 +144,10 @@ class UpdateTransactionUseCase:
             result = InteractorResultDto(success=False, operation=operation, error=str(e))
 
         if result is None:
-            fields = ['category', 'month', 'tag', 'comments']
-            for field in fields:
-                if field in kwargs:
-                    transaction.__setattr__(field, kwargs[field])
             try:
+                changes = parse_changes({field: value for field, value in kwargs.items() if field in self.fields}, self.fields, 'Failed to update transaction.')
+                for field, value in changes.items():
+                    transaction.__setattr__(field, value)
                 response = self.history.update_transaction(transaction)
                 result = InteractorResultDto(success=True, operation=operation, data=response.to_dict())
             except (TransactionNotFoundException, TransactionUpdateException) as e:
@@ -82,6 +156,38 @@ class UpdateTransactionUseCase:
         self.presenter.present_transaction(result)
     
 
+class BulkUpdateTransactionsUseCase:
+    fields: Dict[str, Callable[[str], Any]] = {'category': str, 'month': int, 'tag': str, 'comments': str, 'ignore': parse_bool}
+
+    def __init__(self, history: History, presenter: HistoryPresenterInterface) -> None:
+        self.history = history
+        self.presenter = presenter
+
+    def execute(self, references: Optional[List[str]] = None, where: Optional[str] = None, **kwargs) -> None:
+        operation = 'Bulk Update Transactions'
+        try:
+            changes = self.validate(kwargs)
+            if where is not None:
+                matches = TransactionFilter.parse(where)
+                transactions = [transaction for transaction in self.history.list_transactions() if matches(transaction)]
+            else:
+                transactions = [self.history.get_transaction(reference) for reference in references or []]
+            for transaction in transactions:
+                for field, value in changes.items():
+                    transaction.__setattr__(field, value)
+            response = self.history.update_transactions(transactions)
+        except (FilterInvalidException, TransactionNotFoundException, TransactionUpdateException) as e:
+            result = InteractorResultDto(success=False, operation=operation, error=str(e))
+            self.presenter.present_failure(result)
+            return
+
+        result = InteractorResultDto(success=True, operation=operation, data=f'{len(response)} transactions updated')
+        self.presenter.present_success(result)
+
+    def validate(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return parse_changes(kwargs, self.fields, 'Failed to update transactions.')
+
+
 class IgnoreTransactionUseCase:
 
     def __init__(self, history: History, presenter: HistoryPresenterInterface) -> None:
@@ -133,15 +239,61 @@ class ListTransactionsUseCase:
         self.history = history
         self.presenter = presenter
 
-    def execute(self, month: int) -> None:
+    def execute(self, month: int, year: Optional[int] = None) -> None:
         result: InteractorResultDto = None
         operation = 'List Transactions'
-        transactions = sorted(self.history.get_transactions_by_month(month), key=lambda x: x.day)
+        transactions = sorted(self.history.get_transactions_by_month(month, year), key=lambda x: x.day)
+        response = [transaction.to_dict() for transaction in transactions]
+        result = InteractorResultDto(success=True, operation=operation, data=response)
+        self.presenter.present_history(result)
+
+
+class ListTransactionsBetweenUseCase:
+
+    def __init__(self, history: History, presenter: HistoryPresenterInterface) -> None:
+        self.history = history
+        self.presenter = presenter
+
+    def execute(self, start: date, end: date) -> None:
+        operation = 'List Transactions Between'
+        transactions = self.history.get_transactions_between(start, end)
+        response = [transaction.to_dict() for transaction in transactions]
+        result = InteractorResultDto(success=True, operation=operation, data=response)
+        self.presenter.present_history(result)
+
+
+class SearchTransactionsUseCase:
+
+    def __init__(self, history: History, presenter: HistoryPresenterInterface) -> None:
+        self.history = history
+        self.presenter = presenter
+
+    def execute(self, query: str) -> None:
+        operation = 'Search Transactions'
+        transactions = self.history.search_transactions(query)
         response = [transaction.to_dict() for transaction in transactions]
         result = InteractorResultDto(success=True, operation=operation, data=response)
         self.presenter.present_history(result)
 
 
+class QueryTransactionsUseCase:
+
+    def __init__(self, history: History, presenter: HistoryPresenterInterface) -> None:
+        self.history = history
+        self.presenter = presenter
+
+    def execute(self, query: str) -> None:
+        operation = 'Query Transactions'
+        try:
+            response = Query.parse(query).execute(self.history)
+            data = {'plan': response.plan, 'fields': response.fields, 'rows': response.rows}
+            result = InteractorResultDto(success=True, operation=operation, data=data)
+        except QueryInvalidException as e:
+            result = InteractorResultDto(success=False, operation=operation, error=str(e))
+
+        self.presenter.present_query(result)
+
+
 class SaveHistoryUseCase:
 
     def __init__(self, history: History, repository: HistoryRepositoryInterface, presenter: HistoryPresenterInterface) -> None:
@@ -151,10 +303,22 @@ class SaveHistoryUseCase:
 
     def execute(self, project_name: str) -> None:
         operation = 'Save Budget'
-        history_data = [TransactionDto.from_dict(item.to_dict()) for item in self.history.list_transactions()]
         filename = os.path.join(project_name, 'history.csv')
-        self.repository.save_history(filename, history_data)
-        result = InteractorResultDto(success=True, operation=operation, data=f'History with {len(history_data)} transactions saved on {filename}')
+        if self.history.partial and self.history.checkpoint != filename:
+            error = f'Failed to save history. The history of {self.history.checkpoint} was loaded for a single period and can only be saved there'
+            self.presenter.present_failure(InteractorResultDto(success=False, operation=operation, error=error))
+            return
+        if self.history.checkpoint == filename:
+            upserted, deleted = self.history.get_changes()
+            history_data = list(map(TransactionDto._make, Transaction.to_rows(upserted)))
+            self.repository.save_history_changes(filename, history_data, deleted)
+            message = f'History with {len(history_data)} changed and {len(deleted)} deleted transactions saved on {filename}'
+        else:
+            history_data = list(map(TransactionDto._make, Transaction.to_rows(self.history.list_transactions())))
+            self.repository.save_history(filename, history_data)
+            message = f'History with {len(history_data)} transactions saved on {filename}'
+        self.history.mark_saved(filename)
+        result = InteractorResultDto(success=True, operation=operation, data=message)
         self.presenter.present_success(result)
 
 
@@ -165,11 +329,13 @@ class LoadHistoryUseCase:
         self.repository = repository
         self.presenter = presenter
 
-    def execute(self, project_name: str) -> None:
+    def execute(self, project_name: str, month: Optional[int] = None, category: Optional[str] = None, year: Optional[int] = None) -> None:
         operation = 'Load Budget'
         filename = os.path.join(project_name, 'history.csv')
-        response = self.repository.load_history(filename)
-        data = [Transaction.from_dict(item.to_dict()) for item in response]
+        response = self.repository.load_history(filename, month=month, category=category, year=year)
+        data = Transaction.from_rows(response)
         self.history.items = {item.reference: item for item in data}
+        self.history.mark_saved(filename)
+        self.history.partial = month is not None or category is not None or year is not None
         result = InteractorResultDto(success=True, operation=operation, data=f'History loaded from {filename} with {len(data)} transactions')
         self.presenter.present_success(result)
@@ -0,0 +1,130 @@
+import argparse
+from contextlib import redirect_stdout
+from datetime import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+import time
+from typing import Any, Callable, Dict, List
+
+from finance.bench.generator import ErsteStatementGenerator
+from finance.domain.budget import Budget
+from finance.domain.transaction import History
+from finance.infrastructure.importer import ErsteBankCsvTransactionImporter
+from finance.infrastructure.presenter import CmdBudgetPresenter, CmdHistoryPresenter, CmdReportPresenter
+from finance.infrastructure.repository import CsvBudgetRepository, CsvHistoryRepository
+from finance.infrastructure.view import CmdBudgetView, CmdHistoryView, CmdReportView
+from finance.interface.facade import BudgetUseCaseFacadeFactory, HistoryUseCaseFacadeFactory, ReportUseCaseFacadeFactory
+
+
+class Benchmark:
+
+    def __init__(self, rows: int, directory: str, repeat: int, seed: int) -> None:
+        self.rows = rows
+        self.directory = directory
+        self.repeat = repeat
+        self.generator = ErsteStatementGenerator(rows, seed)
+        self.statement = os.path.join(directory, f'statement-{rows}.csv')
+        self.project = os.path.join(directory, f'project-{rows}')
+
+    def create_facades(self, budget: Budget, history: History, snapshots: bool = True) -> Any:
+        budget_facade = BudgetUseCaseFacadeFactory.create_facade(budget, CsvBudgetRepository(snapshots=snapshots), CmdBudgetPresenter(CmdBudgetView()))
+        history_facade = HistoryUseCaseFacadeFactory.create_facade(history, ErsteBankCsvTransactionImporter(), CsvHistoryRepository(snapshots=snapshots), CmdHistoryPresenter(CmdHistoryView()))
+        report_facade = ReportUseCaseFacadeFactory.create_facade(history, budget, CmdReportPresenter(CmdReportView()))
+        return budget_facade, history_facade, report_facade
+
+    def measure(self, operation: str, setup: Callable[[int], Callable[[], None]]) -> Dict[str, Any]:
+        runs = []
+        for run in range(self.repeat):
+            function = setup(run)
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                start = time.perf_counter()
+                function()
+                runs.append(time.perf_counter() - start)
+        result = {'rows': self.rows, 'operation': operation, 'seconds': min(runs), 'runs': runs}
+        print(f'{self.rows:>9} {operation:<20} {min(runs):10.4f}s', file=sys.stderr)
+        return result
+
+    def loaded(self) -> Any:
+        budget, history = Budget(), History()
+        budget_facade, history_facade, report_facade = self.create_facades(budget, history)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            budget_facade.load_use_case.execute(self.project)
+            history_facade.load_use_case.execute(self.project)
+        return history_facade, report_facade
+
+    def run(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.statement):
+            self.generator.write_statement(self.statement)
+        if not os.path.exists(self.project):
+            self.generator.write_project(self.project)
+
+        def import_statement(_: int) -> Callable[[], None]:
+            _, history_facade, _ = self.create_facades(Budget(), History())
+            return lambda: history_facade.import_use_case.execute(self.statement)
+
+        def load_project(snapshots: bool) -> Callable[[int], Callable[[], None]]:
+            def setup(_: int) -> Callable[[], None]:
+                budget_facade, history_facade, _ = self.create_facades(Budget(), History(), snapshots)
+                return lambda: (budget_facade.load_use_case.execute(self.project), history_facade.load_use_case.execute(self.project))
+            return setup
+
+        history_facade, report_facade = self.loaded()
+
+        def save_project(run: int) -> Callable[[], None]:
+            project = os.path.join(self.directory, f'save-{self.rows}-{run}')
+            os.makedirs(project, exist_ok=True)
+            history_facade.save_use_case.history.checkpoint = None
+            return lambda: history_facade.save_use_case.execute(project)
+
+        return [
+            self.measure('import', import_statement),
+            self.measure('load', load_project(False)),
+            self.measure('load_snapshot', load_project(True)),
+            self.measure('save', save_project),
+            self.measure('list', lambda _: lambda: history_facade.list_use_case.execute(1)),
+            self.measure('review', lambda _: history_facade.review_use_case.execute),
+            self.measure('report_month', lambda _: lambda: report_facade.month_report.execute(1)),
+            self.measure('report_category_all', lambda _: lambda: report_facade.all_category_report.execute(12)),
+        ]
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(arguments: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='python -m finance.bench', description='Times the finance use cases on synthetic Erste statements')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help='number of transactions per run')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per operation; the fastest is reported')
+    parser.add_argument('--seed', type=int, default=42, help='seed of the statement generator')
+    parser.add_argument('--directory', help='where statements and projects are generated and kept (default: a temporary directory)')
+    parser.add_argument('--output', default='bench.json', help='JSON file the results are written to')
+    args = parser.parse_args(arguments)
+
+    with TemporaryDirectory() as temporary:
+        directory = args.directory or temporary
+        os.makedirs(directory, exist_ok=True)
+        results = []
+        for rows in args.sizes:
+            results.extend(Benchmark(rows, directory, args.repeat, args.seed).run())
+
+    report = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'results': results,
+    }
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,72 @@
+import csv
+from datetime import date, timedelta
+import os
+from random import Random
+from typing import Iterator, List, Tuple
+from uuid import UUID
+
+from finance.application.dto import BudgetItemDto, TransactionDto
+
+ERSTE_HEADER = ['Booking date', 'Partner name', 'Partner IBAN', 'BIC/SWIFT', 'Partner account number', 'Bank code', 'Amount', 'Currency', 'Booking details', 'Booking reference']
+SOURCES = ['BILLA DANKT', 'SPAR DANKT', 'HOFER DANKT', 'LIDL DANKT', 'WIENER LINIEN', 'OBB PERSONENVERKEHR', 'AMAZON EU SARL', 'NETFLIX INTERNATIONAL', 'WIEN ENERGIE', 'A1 TELEKOM', 'HAUSVERWALTUNG', 'EMPLOYER GMBH', 'APOTHEKE', 'DM DROGERIE', 'IKEA', 'MUSEUMSQUARTIER']
+BUDGET: List[Tuple[str, float, str]] = [
+    ('salary', 42000.0, 'Income'),
+    ('rent', -12000.0, 'Needs'),
+    ('groceries', -4800.0, 'Needs'),
+    ('utilities', -1800.0, 'Needs'),
+    ('transport', -600.0, 'Needs'),
+    ('eatingout', -1500.0, 'Wants'),
+    ('shopping', -1200.0, 'Wants'),
+    ('streaming', -200.0, 'Wants'),
+    ('etf', -6000.0, 'Savings'),
+]
+TAGS = ['', '', '', 'lidl', 'hofer', 'billa', 'gift', 'holiday']
+
+
+class ErsteStatementGenerator:
+
+    def __init__(self, rows: int, seed: int = 42, start: date = date(2015, 1, 1)) -> None:
+        self.rows = rows
+        self.seed = seed
+        self.start = start
+
+    def generate_rows(self) -> Iterator[List[str]]:
+        random = Random(self.seed)
+        days = min(3650, max(1, self.rows // 30))
+        for index in range(self.rows):
+            day = self.start + timedelta(days=index * days // self.rows)
+            source = random.choice(SOURCES)
+            amount = round(random.uniform(-400.0, 150.0), 2)
+            notes = f'POS {random.randrange(10**8):08d} {source} {random.randrange(1000, 9999)} WIEN {day.strftime("%d.%m")}'
+            reference = f'{self.seed:04d}{index:012d}'
+            iban = f'AT{random.randrange(10**18):018d}'
+            yield [day.strftime('%d.%m.%Y'), source, iban, 'GIBAATWWXXX', iban[-11:], '20111', f'{amount:,.2f}', 'EUR', notes, reference]
+
+    def write_statement(self, filename: str) -> None:
+        with open(filename, 'w', newline='') as csv_file:
+            csv_write = csv.writer(csv_file, delimiter=';')
+            csv_write.writerow(ERSTE_HEADER)
+            csv_write.writerows(self.generate_rows())
+
+    def generate_transactions(self) -> Iterator[TransactionDto]:
+        random = Random(self.seed + 1)
+        for row in self.generate_rows():
+            day, month, year = row[0].split('.')
+            category = random.choice(BUDGET)[0] if random.random() < 0.9 else ''
+            tag = random.choice(TAGS) if category else ''
+            yield TransactionDto(row[9], f'{year}-{month}-{day}', row[1], row[6].replace(',', ''), row[8], category, str(int(month)), tag, '', str(random.random() < 0.02))
+
+    def generate_budget(self) -> List[BudgetItemDto]:
+        random = Random(self.seed)
+        return [BudgetItemDto(str(UUID(int=random.getrandbits(128), version=4)), name, str(amount), category, '') for name, amount, category in BUDGET]
+
+    def write_project(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'budget.csv'), 'w', newline='') as csv_file:
+            csv_write = csv.writer(csv_file)
+            for item in self.generate_budget():
+                csv_write.writerow(item.to_dict().values())
+        with open(os.path.join(directory, 'history.csv'), 'w', newline='') as csv_file:
+            csv_write = csv.writer(csv_file)
+            for item in self.generate_transactions():
+                csv_write.writerow(item.to_dict().values())
@@ -0,0 +1,57 @@
+import argparse
+from datetime import date, datetime
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from finance.bench.__main__ import get_commit
+from finance.bench.generator import ErsteStatementGenerator
+from finance.domain.transaction import parse_day
+from finance.infrastructure.importer import parse_statement_row
+from finance.infrastructure.parsing import parse_statement_day
+
+
+def parse_statement_row_with_strptime(row: List[str]) -> tuple:
+    day = datetime.strptime(row[0], '%d.%m.%Y').date()
+    return (row[9], day.isoformat(), row[1], row[6].replace(',', ''), row[8], '', str(day.month), '', '', str(False))
+
+
+def measure(function: Callable[[Any], Any], values: List[Any], repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            function(value)
+        runs.append(time.perf_counter() - start)
+    return min(runs) / len(values) * 1e9
+
+
+def main(arguments: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='python -m finance.bench.parsing', description='Per-row cost of date and amount parsing in the import path')
+    parser.add_argument('--rows', type=int, default=200_000, help='number of statement rows parsed per run')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement; the fastest is reported')
+    parser.add_argument('--output', default='bench-parsing.json', help='JSON file the results are written to')
+    args = parser.parse_args(arguments)
+
+    rows = list(ErsteStatementGenerator(args.rows).generate_rows())
+    statement_days = [row[0] for row in rows]
+    iso_days = [parse_statement_day(day)[0] for day in statement_days]
+
+    comparisons = {
+        'statement day': (lambda text: datetime.strptime(text, '%d.%m.%Y').date(), parse_statement_day, statement_days),
+        'iso day': (date.fromisoformat, parse_day, iso_days),
+        'statement row': (parse_statement_row_with_strptime, parse_statement_row, rows),
+    }
+    results: List[Dict[str, Any]] = []
+    for name, (before, after, values) in comparisons.items():
+        before_ns, after_ns = measure(before, values, args.repeat), measure(after, values, args.repeat)
+        results.append({'operation': name, 'rows': len(values), 'before_ns': before_ns, 'after_ns': after_ns, 'speedup': before_ns / after_ns})
+        print(f'{name:<14} {before_ns:9.0f} ns/row -> {after_ns:7.0f} ns/row {before_ns / after_ns:6.2f}x', file=sys.stderr)
+
+    with open(args.output, 'w') as output:
+        json.dump({'commit': get_commit(), 'results': results}, output, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,58 @@
+import argparse
+import json
+import os
+import sys
+from tempfile import TemporaryDirectory
+import time
+from typing import Any, Callable, Dict, List
+
+from finance.bench.__main__ import get_commit
+from finance.bench.generator import ErsteStatementGenerator
+from finance.infrastructure.importer import ErsteBankCsvTransactionImporter
+from finance.infrastructure.repository import CsvHistoryRepository
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+def main(arguments: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='python -m finance.bench.split', description='Times range-split parsing of one large statement and history file')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='number of transactions in the files')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='worker counts to compare')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement; the fastest is reported')
+    parser.add_argument('--output', default='bench-split.json', help='JSON file the results are written to')
+    args = parser.parse_args(arguments)
+
+    results: List[Dict[str, Any]] = []
+    with TemporaryDirectory() as directory:
+        statement = os.path.join(directory, 'statement.csv')
+        history = os.path.join(directory, 'history.csv')
+        generator = ErsteStatementGenerator(args.rows)
+        generator.write_statement(statement)
+        CsvHistoryRepository(snapshots=False).save_history(history, list(generator.generate_transactions()))
+
+        operations = {
+            'import': lambda workers: lambda: sum(1 for _ in ErsteBankCsvTransactionImporter(workers, split_size=0).import_transactions(statement)),
+            'load_history': lambda workers: lambda: CsvHistoryRepository(workers=workers, split_size=0, snapshots=False).load_history(history),
+        }
+        for operation, setup in operations.items():
+            baseline = None
+            for workers in args.workers:
+                seconds = measure(setup(workers), args.repeat)
+                baseline = baseline or seconds
+                results.append({'rows': args.rows, 'operation': operation, 'workers': workers, 'seconds': seconds, 'speedup': baseline / seconds})
+                print(f'{args.rows:>9} {operation:<14} {workers:>3} workers {seconds:10.4f}s {baseline / seconds:6.2f}x', file=sys.stderr)
+
+    report = {'commit': get_commit(), 'cpus': os.cpu_count(), 'results': results}
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+CubeKey = Tuple[int, int, str, str, bool]
+
+
+@dataclass
+class AggregateCell:
+    total: float = 0.0
+    count: int = 0
+
+
+class AggregateCube:
+
+    def __init__(self) -> None:
+        self.cells: Dict[CubeKey, AggregateCell] = {}
+
+    def add(self, key: CubeKey, amount: float) -> None:
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = AggregateCell()
+        cell.total += amount
+        cell.count += 1
+
+    def subtract(self, key: CubeKey, amount: float) -> None:
+        cell = self.cells[key]
+        cell.count -= 1
+        if cell.count == 0:
+            del self.cells[key]
+        else:
+            cell.total -= amount
+
+    def clear(self) -> None:
+        self.cells.clear()
+
+    def get_category_totals(self, month: int, year: Optional[int] = None) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for (cell_year, cell_month, category, _, _), cell in self.cells.items():
+            if cell_month == month and (year is None or cell_year == year):
+                totals[category] = totals.get(category, 0.0) + cell.total
+        return totals
+
+    def get_monthly_totals(self, category: str, year: Optional[int] = None) -> Dict[int, float]:
+        totals: Dict[int, float] = {}
+        for (cell_year, month, cell_category, _, _), cell in self.cells.items():
+            if cell_category == category and (year is None or cell_year == year):
+                totals[month] = totals.get(month, 0.0) + cell.total
+        return totals
+
+    def get_category_month_totals(self, year: Optional[int] = None) -> Dict[str, Dict[int, float]]:
+        totals: Dict[str, Dict[int, float]] = {}
+        for (cell_year, month, category, _, _), cell in self.cells.items():
+            if year is not None and cell_year != year:
+                continue
+            months = totals.setdefault(category, {})
+            months[month] = months.get(month, 0.0) + cell.total
+        return totals
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum
+from sys import intern
 from typing import Any, Dict, List, Self
 from uuid import UUID
 
@@ -14,7 +15,7 @@ class BudgetCategory(Enum):
     Savings = 4,
 
 
-@dataclass
+@dataclass(slots=True)
 class BudgetItem:
     identifier: UUID
     name: str = field(compare=False)
@@ -26,7 +27,7 @@ class BudgetItem:
     def from_dict(cls, data: Dict[str, str]) -> Self:
         return cls(
             identifier=UUID(data['identifier']),
-            name=data['name'],
+            name=intern(data['name']),
             amount=float(data['amount']),
             category=BudgetCategory[data['category']],
             note=data['note']
@@ -0,0 +1,394 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Callable, Collection, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from finance.domain.aggregate import AggregateCube, CubeKey
+from finance.domain.exception import TransactionExistsException, TransactionNotFoundException
+from finance.domain.transaction import CategorySuggester, History, TextIndex, Transaction, get_period_year
+
+
+class StringTable:
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> str:
+        return self.values[code]
+
+    def find(self, value: str) -> int:
+        return self.codes.get(value, -1)
+
+
+class StringHeap:
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.offsets = array('Q', [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def append(self, value: str) -> None:
+        self.data += value.encode()
+        self.offsets.append(len(self.data))
+
+    def get(self, row: int) -> str:
+        return self.data[self.offsets[row]:self.offsets[row+1]].decode()
+
+
+class ReferenceTable:
+
+    def __init__(self) -> None:
+        self.heap = StringHeap()
+        self.alive = bytearray()
+        self.slots = array('i', [-1]) * 8
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        return (row for row, alive in enumerate(self.alive) if alive)
+
+    def find(self, reference: str) -> int:
+        mask = len(self.slots) - 1
+        slot = hash(reference) & mask
+        while (row := self.slots[slot]) != -1:
+            if self.alive[row] and self.heap.get(row) == reference:
+                return row
+            slot = (slot + 1) & mask
+        return -1
+
+    def add(self, reference: str) -> int:
+        row = len(self.heap)
+        self.heap.append(reference)
+        self.alive.append(1)
+        self.size += 1
+        if 2 * len(self.heap) > len(self.slots):
+            self.resize(2 * len(self.slots))
+        else:
+            self.insert(reference, row)
+        return row
+
+    def remove(self, row: int) -> None:
+        self.alive[row] = 0
+        self.size -= 1
+
+    def get(self, row: int) -> str:
+        return self.heap.get(row)
+
+    def insert(self, reference: str, row: int) -> None:
+        mask = len(self.slots) - 1
+        slot = hash(reference) & mask
+        while self.slots[slot] != -1:
+            slot = (slot + 1) & mask
+        self.slots[slot] = row
+
+    def resize(self, capacity: int) -> None:
+        self.slots = array('i', [-1]) * capacity
+        for row in range(len(self.heap)):
+            self.insert(self.heap.get(row), row)
+
+
+class RowTextIndex:
+
+    def __init__(self, history: 'ColumnarHistory') -> None:
+        self.history = history
+        self.postings: Dict[str, array] = {}
+        self.reindexed: Set[int] = set()
+        self.vocabulary: List[str] = []
+        self.vocabulary_sorted = True
+
+    def get_tokens(self, row: int) -> Set[str]:
+        history = self.history
+        return set(TextIndex.tokenize(f'{history.notes.get(row)} {history.source_table.decode(history.sources[row])} {history.comment_table.decode(history.comments[row])}'))
+
+    def add(self, row: int) -> None:
+        for token in self.get_tokens(row):
+            rows = self.postings.get(token)
+            if rows is None:
+                self.postings[token] = array('i', [row])
+                self.vocabulary_sorted = False
+            else:
+                rows.append(row)
+
+    def reindex(self, row: int) -> None:
+        self.reindexed.add(row)
+        self.add(row)
+
+    def get(self, token: str, prefix: bool = False) -> Collection[int]:
+        if not prefix:
+            return self.postings.get(token, ())
+        if not self.vocabulary_sorted:
+            self.vocabulary = sorted(self.postings)
+            self.vocabulary_sorted = True
+        first = bisect_left(self.vocabulary, token)
+        last = bisect_left(self.vocabulary, token + '\U0010ffff', lo=first)
+        return set().union(*(self.postings[word] for word in self.vocabulary[first:last]))
+
+    def search(self, query: str) -> Set[int]:
+        terms = TextIndex.parse(query)
+        if not terms:
+            return set()
+        smallest, *matches = sorted((self.get(token, prefix) for token, prefix in terms), key=len)
+        rows = set(smallest).intersection(*matches)
+        alive = self.history.references.alive
+        return {row for row in rows if alive[row] and (row not in self.reindexed or self.matches(row, terms))}
+
+    def matches(self, row: int, terms: List[Tuple[str, bool]]) -> bool:
+        tokens = self.get_tokens(row)
+        return all(any(word.startswith(token) for word in tokens) if prefix else token in tokens for token, prefix in terms)
+
+    def clear(self) -> None:
+        self.postings.clear()
+        self.reindexed.clear()
+        self.vocabulary.clear()
+        self.vocabulary_sorted = True
+
+
+class RowCategorySuggester(CategorySuggester):
+
+    def insert(self, transaction: Transaction) -> None:
+        if transaction.category:
+            self.learn(transaction.category, self.tokenize(transaction), 1)
+
+    def discard(self, transaction: Transaction) -> None:
+        if transaction.category:
+            self.learn(transaction.category, self.tokenize(transaction), -1)
+
+
+class ColumnarItems(Mapping[str, Transaction]):
+
+    def __init__(self, history: 'ColumnarHistory') -> None:
+        self.history = history
+
+    def __getitem__(self, reference: str) -> Transaction:
+        row = self.history.references.find(reference)
+        if row == -1:
+            raise KeyError(reference)
+        return self.history.materialize(row)
+
+    def __contains__(self, reference: object) -> bool:
+        return self.history.references.find(reference) != -1
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.history.references.get(row) for row in self.history.references)
+
+    def __len__(self) -> int:
+        return len(self.history.references)
+
+
+class ColumnarHistory(History):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._text_index = RowTextIndex(self)
+        self._suggester = RowCategorySuggester()
+        self._indexes = []
+        self._aggregates = AggregateCube()
+        self.clear()
+
+    def clear(self) -> None:
+        self.references = ReferenceTable()
+        self.days = array('i')
+        self.amounts = array('d')
+        self.months = array('b')
+        self.ignores = bytearray()
+        self.sources = array('i')
+        self.categories = array('i')
+        self.tags = array('i')
+        self.comments = array('i')
+        self.notes = StringHeap()
+        self.source_table = StringTable()
+        self.category_table = StringTable()
+        self.tag_table = StringTable()
+        self.comment_table = StringTable()
+        self.month_rows: Dict[int, array] = {}
+        self.category_rows: Dict[int, array] = {}
+        self.unreviewed_rows = array('i')
+        self.day_rows = array('i')
+        self.day_rows_sorted = True
+        self._aggregates.clear()
+        self._text_index.clear()
+        self._suggester.clear()
+
+    @property
+    def aggregates(self) -> AggregateCube:
+        return self._aggregates
+
+    @property
+    def items(self) -> Mapping[str, Transaction]:
+        return ColumnarItems(self)
+
+    @items.setter
+    def items(self, items: Mapping[str, Transaction]) -> None:
+        self.clear()
+        for transaction in items.values():
+            self.add_transaction(transaction)
+        self._changes.clear()
+        self.checkpoint = None
+        self.partial = False
+
+    def has_transaction(self, reference: str) -> bool:
+        return self.references.find(reference) != -1
+
+    def add_transaction(self, transaction: Transaction) -> Transaction:
+        if self.has_transaction(transaction.reference):
+            raise TransactionExistsException(transaction.reference)
+
+        return self._insert_transaction(transaction)
+
+    def _insert_transaction(self, transaction: Transaction) -> Transaction:
+        row = self.references.add(transaction.reference)
+        self.days.append(transaction.day.toordinal())
+        self.amounts.append(transaction.amount)
+        self.sources.append(self.source_table.encode(transaction.source))
+        self.notes.append(transaction.notes)
+        self.months.append(int(transaction.month))
+        self.categories.append(self.category_table.encode(transaction.category))
+        self.tags.append(self.tag_table.encode(transaction.tag))
+        self.comments.append(self.comment_table.encode(transaction.comments))
+        self.ignores.append(1 if transaction.ignore else 0)
+        self.month_rows.setdefault(self.months[row], array('i')).append(row)
+        self.category_rows.setdefault(self.categories[row], array('i')).append(row)
+        if not transaction.category:
+            self.unreviewed_rows.append(row)
+        if self.day_rows and self.days[row] < self.days[self.day_rows[-1]]:
+            self.day_rows_sorted = False
+        self.day_rows.append(row)
+        self._aggregates.add(self.aggregate_key(row), self.amounts[row])
+        self._text_index.add(row)
+        self._suggester.add(transaction)
+        self._changes[transaction.reference] = True
+        return transaction
+
+    def _insert_transactions(self, transactions: List[Transaction]) -> None:
+        for transaction in transactions:
+            self._insert_transaction(transaction)
+
+    def _replace_transaction(self, transaction: Transaction) -> Transaction:
+        row = self.references.find(transaction.reference)
+        month = int(transaction.month)
+        category = self.category_table.encode(transaction.category)
+        self._suggester.discard(self.materialize(row))
+        self._aggregates.subtract(self.aggregate_key(row), self.amounts[row])
+        if month != self.months[row]:
+            self.months[row] = month
+            self.month_rows.setdefault(month, array('i')).append(row)
+        if category != self.categories[row]:
+            self.categories[row] = category
+            self.category_rows.setdefault(category, array('i')).append(row)
+            if not transaction.category:
+                self.unreviewed_rows.append(row)
+        self.tags[row] = self.tag_table.encode(transaction.tag)
+        comments = self.comment_table.encode(transaction.comments)
+        if comments != self.comments[row]:
+            self.comments[row] = comments
+            self._text_index.reindex(row)
+        self.ignores[row] = 1 if transaction.ignore else 0
+        self._aggregates.add(self.aggregate_key(row), self.amounts[row])
+        self._suggester.add(transaction)
+        self._changes[transaction.reference] = True
+        return transaction
+
+    def delete_transaction(self, reference: str) -> Transaction:
+        if not self.has_transaction(reference):
+            raise TransactionNotFoundException(f'Failed to delete transaction. Transaction with reference "{reference}" does not exist')
+
+        row = self.references.find(reference)
+        transaction = self.materialize(row)
+        self._suggester.discard(transaction)
+        self._aggregates.subtract(self.aggregate_key(row), self.amounts[row])
+        self.references.remove(row)
+        self._changes[reference] = False
+        if len(self.days) > 2 * len(self.references):
+            self.compact()
+        return transaction
+
+    def get_transaction(self, reference: str) -> Transaction:
+        row = self.references.find(reference)
+        if row == -1:
+            raise TransactionNotFoundException(f'Failed to get transaction. Transaction with reference "{reference}" does not exist')
+
+        return self.materialize(row)
+
+    def get_unreviewed_transactions(self) -> List[Transaction]:
+        empty = self.category_table.find('')
+        return self.materialize_rows(self.unreviewed_rows, lambda row: self.categories[row] == empty)
+
+    def get_transactions_by_category(self, category: str) -> List[Transaction]:
+        code = self.category_table.find(category)
+        return self.materialize_rows(self.category_rows.get(code, ()), lambda row: self.categories[row] == code)
+
+    def get_transactions_by_month(self, month: int, year: Optional[int] = None) -> List[Transaction]:
+        rows = self.month_rows.get(month, ())
+        if year is not None:
+            return self.materialize_rows(rows, lambda row: self.months[row] == month and self.get_year(row) == year)
+        rows = sorted(rows, key=self.get_year)
+        return self.materialize_rows(rows, lambda row: self.months[row] == month)
+
+    def get_periods(self) -> List[Tuple[int, int]]:
+        return sorted({(self.get_year(row), self.months[row]) for row in self.references})
+
+    def get_transactions_between(self, start: date, end: date) -> List[Transaction]:
+        if not self.day_rows_sorted:
+            self.day_rows = array('i', sorted(self.day_rows, key=self.days.__getitem__))
+            self.day_rows_sorted = True
+        first = bisect_left(self.day_rows, start.toordinal(), key=self.days.__getitem__)
+        last = bisect_right(self.day_rows, end.toordinal(), lo=first, key=self.days.__getitem__)
+        return self.materialize_rows(self.day_rows[first:last], lambda row: True)
+
+    def search_transactions(self, query: str) -> List[Transaction]:
+        rows = sorted(self._text_index.search(query), key=lambda row: (self.days[row], self.references.get(row)))
+        return [self.materialize(row) for row in rows]
+
+    def list_transactions(self) -> List[Transaction]:
+        return [self.materialize(row) for row in self.references]
+
+    def materialize(self, row: int) -> Transaction:
+        return Transaction(
+            reference=self.references.get(row),
+            day=date.fromordinal(self.days[row]),
+            source=self.source_table.decode(self.sources[row]),
+            amount=self.amounts[row],
+            notes=self.notes.get(row),
+            category=self.category_table.decode(self.categories[row]),
+            month=self.months[row],
+            tag=self.tag_table.decode(self.tags[row]),
+            comments=self.comment_table.decode(self.comments[row]),
+            ignore=bool(self.ignores[row]),
+        )
+
+    def get_year(self, row: int) -> int:
+        return get_period_year(date.fromordinal(self.days[row]), self.months[row])
+
+    def aggregate_key(self, row: int) -> CubeKey:
+        return (self.get_year(row), self.months[row], self.category_table.decode(self.categories[row]), self.tag_table.decode(self.tags[row]), bool(self.ignores[row]))
+
+    def materialize_rows(self, rows: array, matches: Callable[[int], bool]) -> List[Transaction]:
+        seen = set()
+        transactions = []
+        for row in rows:
+            if row in seen or not self.references.alive[row] or not matches(row):
+                continue
+            seen.add(row)
+            transactions.append(self.materialize(row))
+        return transactions
+
+    def compact(self) -> None:
+        transactions = self.list_transactions()
+        changes = dict(self._changes)
+        self.clear()
+        for transaction in transactions:
+            self.add_transaction(transaction)
+        self._changes = changes
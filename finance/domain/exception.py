@@ -11,7 +11,10 @@ class BudgetCategoryNotFoundException(Exception):
 
 
 class TransactionExistsException(Exception):
-    pass
+
+    def __init__(self, reference: str) -> None:
+        super().__init__(f'Failed to add transaction. Transaction with reference "{reference}" already exists')
+        self.reference = reference
 
 
 class TransactionNotFoundException(Exception):
@@ -20,3 +23,15 @@ class TransactionNotFoundException(Exception):
 
 class TransactionUpdateException(Exception):
     pass
+
+
+class RuleInvalidException(Exception):
+    pass
+
+
+class FilterInvalidException(Exception):
+    pass
+
+
+class QueryInvalidException(Exception):
+    pass
@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from datetime import date
+import operator
+import re
+import shlex
+from typing import Any, Callable, Dict, List, Self
+
+from finance.domain.exception import FilterInvalidException
+from finance.domain.transaction import TextIndex, Transaction
+
+
+def parse_bool(value: str) -> bool:
+    if value.lower() not in ('true', 'false'):
+        raise ValueError(f'"{value}" is not True or False')
+    return value.lower() == 'true'
+
+
+FIELDS: Dict[str, Callable[[str], Any]] = {
+    'reference': str,
+    'day': date.fromisoformat,
+    'source': str,
+    'amount': float,
+    'notes': str,
+    'category': str,
+    'month': int,
+    'year': int,
+    'tag': str,
+    'comments': str,
+    'ignore': parse_bool,
+    'text': str,
+}
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '~': lambda value, text: text.lower() in value.lower(),
+    'in': lambda value, values: values[0] <= value <= values[1] if isinstance(values, tuple) else value in values,
+}
+
+
+@dataclass(slots=True)
+class Condition:
+    field: str
+    operator: str
+    value: Any
+
+    pattern = re.compile(r'^(\w+)(!=|<=|>=|=|~|<|>)(.*)$')
+
+    @classmethod
+    def parse(cls, text: str) -> Self:
+        match = cls.pattern.match(text)
+        if match is None:
+            raise FilterInvalidException(f'Failed to parse filter. "{text}" is not a condition like <field><operator><value>')
+        field, symbol, value = match.groups()
+        cls.validate(field, symbol)
+        try:
+            return cls(field, symbol, FIELDS[field](value))
+        except ValueError as e:
+            raise FilterInvalidException(f'Failed to parse filter. "{value}" is not a valid {field}: {str(e)}')
+
+    @classmethod
+    def parse_in(cls, field: str, values: str) -> Self:
+        cls.validate(field, 'in')
+        try:
+            if '..' in values:
+                first, last = values.split('..', 1)
+                return cls(field, 'in', (FIELDS[field](first), FIELDS[field](last)))
+            return cls(field, 'in', frozenset(FIELDS[field](value) for value in values.split(',')))
+        except ValueError as e:
+            raise FilterInvalidException(f'Failed to parse filter. "{values}" is not a valid range or list of {field}: {str(e)}')
+
+    @staticmethod
+    def validate(field: str, symbol: str) -> None:
+        if field not in FIELDS:
+            raise FilterInvalidException(f'Failed to parse filter. "{field}" is not a valid field. The valid fields are: {list(FIELDS)}')
+        if symbol == '~' and FIELDS[field] is not str:
+            raise FilterInvalidException(f'Failed to parse filter. "~" only applies to text fields, not to "{field}"')
+        if field == 'text' and symbol != '~':
+            raise FilterInvalidException('Failed to parse filter. "text" only supports "~", as in text~"amazon gift*"')
+
+    def matches(self, transaction: Transaction) -> bool:
+        if self.field == 'text':
+            return self.matches_text(transaction)
+        return OPERATORS[self.operator](getattr(transaction, self.field), self.value)
+
+    def matches_text(self, transaction: Transaction) -> bool:
+        tokens = set(TextIndex.tokenize(f'{transaction.notes} {transaction.source} {transaction.comments}'))
+        for term in self.value.split():
+            words = TextIndex.tokenize(term)
+            if any(word not in tokens for word in words[:-1]):
+                return False
+            if words and term.endswith('*'):
+                if not any(token.startswith(words[-1]) for token in tokens):
+                    return False
+            elif words and words[-1] not in tokens:
+                return False
+        return True
+
+
+class TransactionFilter:
+
+    def __init__(self, conditions: List[Condition]) -> None:
+        self.conditions = conditions
+
+    @classmethod
+    def parse(cls, text: str) -> Self:
+        try:
+            words = shlex.split(text)
+        except ValueError as e:
+            raise FilterInvalidException(f'Failed to parse filter. {str(e)}')
+        return cls.from_words(words)
+
+    @classmethod
+    def from_words(cls, words: List[str]) -> Self:
+        conditions = []
+        position = 0
+        while position < len(words):
+            if conditions:
+                if words[position].lower() != 'and' or position + 1 == len(words):
+                    raise FilterInvalidException(f'Failed to parse filter. "{' '.join(words)}" should be conditions joined by "and"')
+                position += 1
+            if position + 2 < len(words) and words[position + 1].lower() == 'in':
+                conditions.append(Condition.parse_in(words[position], words[position + 2]))
+                position += 3
+            else:
+                conditions.append(Condition.parse(words[position]))
+                position += 1
+        if not conditions:
+            raise FilterInvalidException('Failed to parse filter. The filter has no conditions')
+        return cls(conditions)
+
+    def __call__(self, transaction: Transaction) -> bool:
+        return all(condition.matches(transaction) for condition in self.conditions)
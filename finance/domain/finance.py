@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from finance.domain.budget import Budget
+from finance.domain.rule import RuleSet
 from finance.domain.transaction import History
 
 
@@ -8,3 +9,4 @@ from finance.domain.transaction import History
 class Finance:
     budget: Budget
     history: History
+    rules: RuleSet = field(default_factory=RuleSet)
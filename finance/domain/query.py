@@ -0,0 +1,216 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import shlex
+from typing import Any, Callable, Dict, Iterable, List, Optional, Self, Tuple
+
+from finance.domain.exception import FilterInvalidException, QueryInvalidException
+from finance.domain.filter import FIELDS, Condition, TransactionFilter
+from finance.domain.transaction import History, TextIndex, Transaction
+
+AGGREGATES: Dict[str, Callable[[List[Any]], Any]] = {
+    'count': len,
+    'sum': sum,
+    'avg': lambda values: sum(values) / len(values),
+    'min': min,
+    'max': max,
+}
+KEYWORDS = {'where', 'group', 'order', 'limit', *AGGREGATES}
+NUMERIC_FIELDS = {'amount', 'month', 'year'}
+
+
+@dataclass(slots=True)
+class Aggregate:
+    function: str
+    field: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f'{self.function}({self.field})' if self.field else self.function
+
+    def compute(self, transactions: List[Transaction]) -> Any:
+        if self.field is None:
+            return len(transactions)
+        value = AGGREGATES[self.function]([getattr(transaction, self.field) for transaction in transactions])
+        return round(value, 2) if isinstance(value, float) else value
+
+
+@dataclass
+class QueryPlan:
+    description: str
+    scan: Callable[[History], Iterable[Transaction]]
+
+
+@dataclass
+class QueryResult:
+    plan: str
+    fields: List[str]
+    rows: List[List[Any]]
+
+
+@dataclass
+class Query:
+    conditions: List[Condition] = field(default_factory=list)
+    group_by: Optional[str] = None
+    aggregates: List[Aggregate] = field(default_factory=list)
+    order_by: Optional[str] = None
+    descending: bool = False
+    limit: Optional[int] = None
+
+    @classmethod
+    def parse(cls, text: str) -> Self:
+        try:
+            words = shlex.split(text)
+        except ValueError as e:
+            raise QueryInvalidException(f'Failed to parse query. {str(e)}')
+        query = cls()
+        position = 0
+
+        def clause() -> List[str]:
+            nonlocal position
+            start = position
+            while position < len(words) and words[position].lower() not in KEYWORDS:
+                position += 1
+            return words[start:position]
+
+        while position < len(words):
+            keyword = words[position].lower()
+            position += 1
+            if keyword == 'where' and not query.conditions:
+                try:
+                    query.conditions = TransactionFilter.from_words(clause()).conditions
+                except FilterInvalidException as e:
+                    raise QueryInvalidException(str(e))
+            elif keyword in ('group', 'order') and position < len(words) and words[position].lower() == 'by':
+                position += 1
+                if keyword == 'order' and position < len(words):
+                    position += 1
+                    arguments = [words[position - 1], *clause()]
+                else:
+                    arguments = clause()
+                if keyword == 'group':
+                    if len(arguments) != 1 or arguments[0] not in FIELDS or arguments[0] == 'text':
+                        raise QueryInvalidException(f'Failed to parse query. "group by" takes one field: {' '.join(arguments)}')
+                    query.group_by = arguments[0]
+                else:
+                    if len(arguments) not in (1, 2) or (len(arguments) == 2 and arguments[1].lower() not in ('asc', 'desc')):
+                        raise QueryInvalidException(f'Failed to parse query. "order by" takes a column and optionally asc or desc: {' '.join(arguments)}')
+                    query.order_by = arguments[0]
+                    query.descending = len(arguments) == 2 and arguments[1].lower() == 'desc'
+            elif keyword == 'limit':
+                arguments = clause()
+                if len(arguments) != 1 or not arguments[0].isdigit():
+                    raise QueryInvalidException(f'Failed to parse query. "limit" takes a number: {' '.join(arguments)}')
+                query.limit = int(arguments[0])
+            elif keyword in AGGREGATES:
+                arguments = clause()
+                if len(arguments) > 1 or (not arguments and keyword != 'count'):
+                    raise QueryInvalidException(f'Failed to parse query. "{keyword}" takes one field')
+                if arguments and (arguments[0] not in FIELDS or arguments[0] == 'text'):
+                    raise QueryInvalidException(f'Failed to parse query. "{arguments[0]}" is not a valid field. The valid fields are: {list(FIELDS)[:-1]}')
+                if keyword in ('sum', 'avg') and arguments[0] not in NUMERIC_FIELDS:
+                    raise QueryInvalidException(f'Failed to parse query. "{keyword}" only applies to numeric fields {sorted(NUMERIC_FIELDS)}, not to "{arguments[0]}"')
+                query.aggregates.append(Aggregate(keyword, arguments[0] if arguments else None))
+            else:
+                raise QueryInvalidException(f'Failed to parse query. Unexpected "{words[position - 1]}"')
+        if query.group_by and not query.aggregates:
+            query.aggregates.append(Aggregate('count'))
+        return query
+
+    def get_conditions(self, name: str, *operators: str) -> List[Condition]:
+        return [condition for condition in self.conditions if condition.field == name and condition.operator in operators]
+
+    def plan(self) -> QueryPlan:
+        references = self.get_conditions('reference', '=')
+        if references:
+            reference = references[0].value
+            return QueryPlan(f'reference lookup {reference}', lambda history: [history.get_transaction(reference)] if history.has_transaction(reference) else [])
+
+        texts = [condition for condition in self.get_conditions('text', '~') if TextIndex.tokenize(condition.value)]
+        if texts:
+            terms = texts[0].value
+            return QueryPlan(f'text index "{terms}"', lambda history: history.search_transactions(terms))
+
+        categories = self.get_conditions('category', '=')
+        if categories:
+            category = categories[0].value
+            return QueryPlan(f'category index {category}', lambda history: history.get_transactions_by_category(category))
+
+        months = self.get_conditions('month', '=', 'in')
+        years = self.get_conditions('year', '=')
+        year = years[0].value if years else None
+        if months and months[0].operator == '=' and year is not None:
+            month = months[0].value
+            return QueryPlan(f'month index {year}-{month:02}', lambda history: history.get_transactions_by_month(month, year))
+
+        bounds = self.get_day_bounds()
+        if bounds is not None:
+            start, end = bounds
+            return QueryPlan(f'day index {start}..{end}', lambda history: history.get_transactions_between(start, end))
+
+        if months:
+            values = self.get_month_values(months[0])
+            if values:
+                label = ','.join(str(month) for month in values) + (f' of {year}' if year is not None else '')
+                return QueryPlan(f'month index {label}', lambda history: [transaction for month in values for transaction in history.get_transactions_by_month(month, year)])
+
+        return QueryPlan('full scan', lambda history: history.list_transactions())
+
+    def get_day_bounds(self) -> Optional[Tuple[date, date]]:
+        start, end = None, None
+        for condition in self.get_conditions('day', '=', '>', '>=', '<', '<=', 'in'):
+            if condition.operator == 'in' and not isinstance(condition.value, tuple):
+                low, high = min(condition.value), max(condition.value)
+            elif condition.operator == 'in':
+                low, high = condition.value
+            else:
+                low = condition.value if condition.operator in ('=', '>=') else condition.value + timedelta(days=1) if condition.operator == '>' else None
+                high = condition.value if condition.operator in ('=', '<=') else condition.value - timedelta(days=1) if condition.operator == '<' else None
+            if low is not None:
+                start = low if start is None else max(start, low)
+            if high is not None:
+                end = high if end is None else min(end, high)
+        if start is None and end is None:
+            return None
+        return start or date.min, end or date.max
+
+    def get_month_values(self, condition: Condition) -> List[int]:
+        if condition.operator == '=':
+            return [condition.value]
+        if isinstance(condition.value, tuple):
+            return list(range(max(condition.value[0], 1), min(condition.value[1], 12) + 1))
+        return sorted(month for month in condition.value if 1 <= month <= 12)
+
+    def execute(self, history: History) -> QueryResult:
+        plan = self.plan()
+        matches = TransactionFilter(self.conditions)
+        transactions = [transaction for transaction in plan.scan(history) if matches(transaction)]
+
+        if self.group_by is not None:
+            groups: Dict[Any, List[Transaction]] = {}
+            for transaction in transactions:
+                groups.setdefault(getattr(transaction, self.group_by), []).append(transaction)
+            fields = [self.group_by, *(aggregate.name for aggregate in self.aggregates)]
+            rows = [[key, *(aggregate.compute(group) for aggregate in self.aggregates)] for key, group in groups.items()]
+        elif self.aggregates:
+            fields = [aggregate.name for aggregate in self.aggregates]
+            rows = [[aggregate.compute(transactions) if transactions or aggregate.function in ('count', 'sum') else None for aggregate in self.aggregates]]
+        else:
+            fields = list(Transaction.__dataclass_fields__)
+            rows = [[getattr(transaction, name) for name in fields] for transaction in transactions]
+
+        if self.order_by is not None:
+            column = self.get_column(fields)
+            rows.sort(key=lambda row: (row[column] is None, row[column]), reverse=self.descending)
+        elif self.group_by is not None:
+            rows.sort(key=lambda row: row[0])
+        if self.limit is not None:
+            rows = rows[:self.limit]
+        return QueryResult(plan.description, fields, rows)
+
+    def get_column(self, fields: List[str]) -> int:
+        if self.order_by in fields:
+            return fields.index(self.order_by)
+        for index, name in enumerate(fields):
+            if name.split('(')[0] == self.order_by:
+                return index
+        raise QueryInvalidException(f'Failed to run query. "{self.order_by}" is not a column of the result: {fields}')
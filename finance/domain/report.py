@@ -1,69 +1,78 @@
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Self, Tuple
 
 from finance.domain.budget import BudgetCategory
 from finance.domain.transaction import Transaction
 
 
-@dataclass
+@dataclass(frozen=True)
 class MonthResult:
     month: int
-    transactions: List[Transaction]
-    categories: Dict[BudgetCategory, List[str]]
+    incomes: float
+    expenses: float
+    result: float
+    income_details: Dict[str, float]
+    expense_details: Dict[str, float]
+    category_details: Dict[BudgetCategory, float]
+    year: Optional[int] = None
 
     @property
-    def income_categories(self) -> List[str]:
-        return self.categories[BudgetCategory.Income]
+    def period(self) -> str:
+        return str(self.month) if self.year is None else f'{self.month}/{self.year}'
 
-    @property
-    def income_transactions(self) -> List[Transaction]:
-        return [transaction for transaction in self.transactions if transaction.category in self.income_categories]
+    @classmethod
+    def from_transactions(cls, month: int, transactions: List[Transaction], categories: Dict[BudgetCategory, List[str]]) -> Self:
+        totals: Dict[str, float] = {}
+        for transaction in transactions:
+            totals[transaction.category] = totals.get(transaction.category, 0.0) + transaction.amount
+        return cls.from_totals(month, totals, categories)
 
-    @property
-    def income_details(self) -> Dict[str, float]:
-        return {name: sum([transaction.amount for transaction in self.get_transactions_by_name(name)]) for name in self.income_categories}
+    @classmethod
+    def from_totals(cls, month: int, totals: Dict[str, float], categories: Dict[BudgetCategory, List[str]], year: Optional[int] = None) -> Self:
+        income_categories = categories[BudgetCategory.Income]
+        expense_categories = categories[BudgetCategory.Needs] + categories[BudgetCategory.Wants] + categories[BudgetCategory.Savings]
+        incomes = sum(totals.get(name, 0.0) for name in set(income_categories))
+        expenses = sum(totals.get(name, 0.0) for name in set(expense_categories))
+        category_details = {category: sum(totals.get(name, 0.0) for name in set(categories[category])) for category in BudgetCategory if category != BudgetCategory.Empty}
+        return cls(
+            month=month,
+            incomes=incomes,
+            expenses=expenses,
+            result=incomes + expenses,
+            income_details={name: totals.get(name, 0.0) for name in income_categories},
+            expense_details={name: totals.get(name, 0.0) for name in expense_categories},
+            category_details=category_details,
+            year=year,
+        )
 
-    @property
-    def incomes(self) -> float:
-        return sum([transaction.amount for transaction in self.income_transactions])
-    
-    @property
-    def expense_categories(self) -> List[str]:
-        return self.categories[BudgetCategory.Needs] + self.categories[BudgetCategory.Wants] + self.categories[BudgetCategory.Savings]
-    
-    @property
-    def expense_transactions(self) -> List[Transaction]:
-        return [transaction for transaction in self.transactions if transaction.category in self.expense_categories]
 
-    @property
-    def expense_details(self) -> Dict[str, float]:
-        return {name: sum([transaction.amount for transaction in self.get_transactions_by_name(name)]) for name in self.expense_categories}
-    
-    @property
-    def expenses(self) -> float:
-        return sum([transaction.amount for transaction in self.expense_transactions])
-    
-    @property
-    def result(self) -> float:
-        return self.incomes + self.expenses
-    
-    @property
-    def category_details(self) -> Dict[BudgetCategory, float]:
-        return {category: sum([transaction.amount for transaction in self.get_transactions_by_category(category)]) for category in BudgetCategory if category != BudgetCategory.Empty}
+@dataclass(frozen=True)
+class CategoryMonthTotals:
+    totals: Dict[str, Dict[int, float]]
 
-    def get_transactions_by_name(self, name: str) -> List[Transaction]:
-        return [transaction for transaction in self.transactions if transaction.category == name]
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> Self:
+        totals: Dict[str, Dict[int, float]] = {}
+        for transaction in transactions:
+            months = totals.setdefault(transaction.category, {})
+            months[transaction.month] = months.get(transaction.month, 0.0) + transaction.amount
+        return cls(totals)
 
-    def get_transactions_by_category(self, category: BudgetCategory):
-        return [transaction for transaction in self.transactions if transaction.category in self.categories[category]]
+    def get_monthly_totals(self, category: str) -> Dict[int, float]:
+        return self.totals.get(category, {})
 
 
-@dataclass
+@dataclass(frozen=True)
 class CategoryReport:
     category: str
     months: int
     budget: float
-    transactions: List[Transaction]
+    monthly_used: Dict[int, float]
+
+    @classmethod
+    def from_transactions(cls, category: str, months: int, budget: float, transactions: Iterable[Transaction]) -> Self:
+        monthly_totals = CategoryMonthTotals.from_transactions(transactions).get_monthly_totals(category)
+        return cls(category, months, budget, monthly_totals)
 
     @property
     def budget_per_month(self) -> float:
@@ -71,7 +80,7 @@ class CategoryReport:
     
     @property
     def used(self) -> float:
-        return sum([transaction.amount for transaction in self.transactions])
+        return sum(self.monthly_used.values())
     
     @property
     def used_average(self) -> float:
@@ -90,8 +99,8 @@ class CategoryReport:
         return {month: (self.get_used_per_month(month), self.get_result_per_month(month)) for month in range(1, self.months+1)}
 
     def get_used_per_month(self, month: int) -> float:
-        return sum([transaction.amount for transaction in self.transactions if transaction.month == month])
+        return self.monthly_used.get(month, 0.0)
 
     def get_result_per_month(self, month: int) -> float:
         used_per_month = self.get_used_per_month(month)
-        return self.budget_per_month + used_per_month if used_per_month <= 0 else used_per_month - self.budget_per_month
\ No newline at end of file
+        return self.budget_per_month + used_per_month if used_per_month <= 0 else used_per_month - self.budget_per_month
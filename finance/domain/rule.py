@@ -0,0 +1,175 @@
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+import re
+from typing import Any, Dict, List, Optional, Self, Tuple
+
+from finance.domain.exception import RuleInvalidException
+from finance.domain.transaction import Transaction
+
+
+literal_pattern = re.compile(r'(?:[^.^$*+?{}\[\]\\|()]|\\\W)*')
+escape_pattern = re.compile(r'\\(.)')
+
+
+class RuleField(Enum):
+    Source = 'source'
+    Notes = 'notes'
+
+
+@dataclass(slots=True)
+class CategorizationRule:
+    field: RuleField
+    pattern: str
+    category: str
+    tag: str = ''
+    ignore: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> Self:
+        return cls(
+            field=RuleField(data['field']),
+            pattern=data['pattern'],
+            category=data['category'],
+            tag=data['tag'],
+            ignore=True if data['ignore'] == 'True' else False,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'field': self.field.value,
+            'pattern': self.pattern,
+            'category': self.category,
+            'tag': self.tag,
+            'ignore': self.ignore,
+        }
+
+
+class LiteralAutomaton:
+
+    def __init__(self) -> None:
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.failures: List[int] = [0]
+        self.outputs: List[Optional[int]] = [None]
+
+    def add(self, literal: str, value: int) -> None:
+        state = 0
+        for char in literal:
+            following = self.transitions[state].get(char)
+            if following is None:
+                following = len(self.transitions)
+                self.transitions[state][char] = following
+                self.transitions.append({})
+                self.failures.append(0)
+                self.outputs.append(None)
+            state = following
+        if self.outputs[state] is None or value < self.outputs[state]:
+            self.outputs[state] = value
+
+    def build(self) -> None:
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self.transitions[state].items():
+                failure = self.failures[state]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[following] = self.transitions[failure].get(char, 0)
+                inherited = self.outputs[self.failures[following]]
+                if inherited is not None and (self.outputs[following] is None or inherited < self.outputs[following]):
+                    self.outputs[following] = inherited
+                queue.append(following)
+
+    def search(self, text: str) -> Optional[int]:
+        transitions, failures, outputs = self.transitions, self.failures, self.outputs
+        best = outputs[0]
+        state = 0
+        for char in text:
+            while state and char not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(char, 0)
+            output = outputs[state]
+            if output is not None and (best is None or output < best):
+                best = output
+        return best
+
+
+class RuleMatcher:
+
+    def __init__(self, rules: List[CategorizationRule], field: RuleField) -> None:
+        self.literals = LiteralAutomaton()
+        self.patterns: List[Tuple[int, re.Pattern]] = []
+        for index, rule in enumerate(rules):
+            if rule.field is not field:
+                continue
+            if literal_pattern.fullmatch(rule.pattern):
+                self.literals.add(escape_pattern.sub(r'\1', rule.pattern).lower(), index)
+            else:
+                self.patterns.append((index, re.compile(rule.pattern, re.IGNORECASE | re.DOTALL)))
+        self.literals.build()
+
+    def match(self, text: str) -> Optional[int]:
+        best = self.literals.search(text.lower())
+        for index, pattern in self.patterns:
+            if best is not None and index > best:
+                break
+            if pattern.search(text):
+                return index
+        return best
+
+
+class RuleSet:
+
+    def __init__(self) -> None:
+        self._rules: List[CategorizationRule] = []
+        self._compile([])
+
+    @property
+    def rules(self) -> List[CategorizationRule]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: List[CategorizationRule]) -> None:
+        for rule in rules:
+            self.validate(rule)
+        self._compile(list(rules))
+
+    def add_rule(self, rule: CategorizationRule) -> CategorizationRule:
+        self.validate(rule)
+        self._compile([*self._rules, rule])
+        return rule
+
+    def list_rules(self) -> List[CategorizationRule]:
+        return list(self._rules)
+
+    def validate(self, rule: CategorizationRule) -> None:
+        try:
+            re.compile(rule.pattern, re.IGNORECASE | re.DOTALL)
+        except re.error as e:
+            raise RuleInvalidException(f'Failed to add rule. The pattern "{rule.pattern}" is not a valid regular expression: {str(e)}')
+
+    def match(self, source: str, notes: str) -> Optional[CategorizationRule]:
+        if source in self._sources:
+            source_match = self._sources[source]
+        else:
+            source_match = self._sources[source] = self._source_matcher.match(source)
+        notes_match = self._notes_matcher.match(notes)
+        matches = [index for index in (source_match, notes_match) if index is not None]
+        return self._rules[min(matches)] if matches else None
+
+    def categorize(self, transaction: Transaction) -> bool:
+        if transaction.category:
+            return False
+        rule = self.match(transaction.source, transaction.notes)
+        if rule is None:
+            return False
+        transaction.category = rule.category
+        transaction.tag = rule.tag
+        transaction.ignore = rule.ignore
+        return True
+
+    def _compile(self, rules: List[CategorizationRule]) -> None:
+        self._rules = rules
+        self._source_matcher = RuleMatcher(rules, RuleField.Source)
+        self._notes_matcher = RuleMatcher(rules, RuleField.Notes)
+        self._sources = {}
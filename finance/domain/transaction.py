@@ -1,11 +1,31 @@
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, Dict, List, Self
+from functools import lru_cache
+from operator import itemgetter
+from math import log2
+import re
+from sys import intern
+from typing import AbstractSet, Any, Callable, Dict, Hashable, Iterable, List, Optional, Self, Sequence, Set, Tuple
 
+from finance.domain.aggregate import AggregateCube, CubeKey
 from finance.domain.exception import TransactionExistsException, TransactionNotFoundException, TransactionUpdateException
 
 
-@dataclass
+@lru_cache(maxsize=1 << 14)
+def parse_day(text: str) -> date:
+    return date.fromisoformat(text)
+
+
+def get_period_year(day: date, month: int) -> int:
+    if month - day.month > 6:
+        return day.year - 1
+    if day.month - month > 6:
+        return day.year + 1
+    return day.year
+
+
+@dataclass(slots=True)
 class Transaction:
     reference: str
     day: date
@@ -22,17 +42,35 @@ class Transaction:
     def from_dict(cls, data: Dict[str, str]) -> Self:
         return cls(
             reference=data['reference'],
-            day=date.fromisoformat(data['day']),
-            source=data['source'],
+            day=parse_day(data['day']),
+            source=intern(data['source']),
             amount=float(data['amount']),
             notes=data['notes'],
-            category=data['category'],
+            category=intern(data['category']),
             month=int(data['month']),
-            tag=data['tag'],
+            tag=intern(data['tag']),
             comments=data['comments'],
             ignore=True if data['ignore'] == 'True' else False,
         )
 
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence[str]]) -> List[Self]:
+        return [
+            cls(reference, parse_day(day), intern(source), float(amount), notes, intern(category), int(month), intern(tag), comments, ignore == 'True')
+            for reference, day, source, amount, notes, category, month, tag, comments, ignore in rows
+        ]
+
+    @staticmethod
+    def to_rows(transactions: Iterable['Transaction']) -> List[Tuple[str, ...]]:
+        return [
+            (item.reference, item.day.isoformat(), item.source, str(item.amount), item.notes, item.category, str(item.month), item.tag, item.comments, str(item.ignore))
+            for item in transactions
+        ]
+
+    @property
+    def year(self) -> int:
+        return get_period_year(self.day, self.month)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             'reference': self.reference,
@@ -53,22 +91,363 @@ class Transaction:
         return difference
 
 
+signature_pattern = re.compile(r'[^\W\d_]+')
+
+
+def get_signature(transaction: Transaction) -> Tuple[str, str]:
+    return (' '.join(signature_pattern.findall(transaction.source.lower())), ' '.join(signature_pattern.findall(transaction.notes.lower())))
+
+
+class TransactionIndex:
+
+    def __init__(self, key: Callable[[Transaction], Hashable]) -> None:
+        self.key = key
+        self.buckets: Dict[Hashable, Dict[str, None]] = {}
+        self.keys: Dict[str, Hashable] = {}
+
+    def add(self, transaction: Transaction) -> None:
+        self.insert(transaction, self.key(transaction))
+
+    def insert(self, transaction: Transaction, key: Hashable) -> None:
+        self.keys[transaction.reference] = key
+        self.buckets.setdefault(key, {})[transaction.reference] = None
+
+    def remove(self, reference: str) -> None:
+        key = self.keys.pop(reference)
+        bucket = self.buckets[key]
+        del bucket[reference]
+        if not bucket:
+            del self.buckets[key]
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for transaction in transactions:
+            self.add(transaction)
+
+    def get(self, key: Hashable) -> List[str]:
+        return list(self.buckets.get(key, ()))
+
+    def clear(self) -> None:
+        self.buckets.clear()
+        self.keys.clear()
+
+
+class AggregateIndex:
+
+    def __init__(self) -> None:
+        self.cube = AggregateCube()
+        self.keys: Dict[str, Tuple[CubeKey, float]] = {}
+
+    @staticmethod
+    def key(transaction: Transaction) -> CubeKey:
+        return (transaction.year, transaction.month, transaction.category, transaction.tag, transaction.ignore)
+
+    def add(self, transaction: Transaction) -> None:
+        self.insert(transaction, self.key(transaction))
+
+    def insert(self, transaction: Transaction, key: CubeKey) -> None:
+        self.keys[transaction.reference] = (key, transaction.amount)
+        self.cube.add(key, transaction.amount)
+
+    def remove(self, reference: str) -> None:
+        key, amount = self.keys.pop(reference)
+        self.cube.subtract(key, amount)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for transaction in transactions:
+            self.add(transaction)
+
+    def clear(self) -> None:
+        self.cube.clear()
+        self.keys.clear()
+
+
+class DayIndex:
+
+    def __init__(self) -> None:
+        self.entries: List[Tuple[date, str]] = []
+        self.days: Dict[str, date] = {}
+
+    def add(self, transaction: Transaction) -> None:
+        self.days[transaction.reference] = transaction.day
+        insort(self.entries, (transaction.day, transaction.reference))
+
+    def remove(self, reference: str) -> None:
+        entry = (self.days.pop(reference), reference)
+        del self.entries[bisect_left(self.entries, entry)]
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for transaction in transactions:
+            self.days[transaction.reference] = transaction.day
+            self.entries.append((transaction.day, transaction.reference))
+        self.entries.sort()
+
+    def get(self, start: date, end: date) -> List[str]:
+        first = bisect_left(self.entries, start, key=itemgetter(0))
+        last = bisect_right(self.entries, end, lo=first, key=itemgetter(0))
+        return [reference for _, reference in self.entries[first:last]]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.days.clear()
+
+
+class TextIndex:
+    pattern = re.compile(r'\w+')
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[str, None]] = {}
+        self.tokens: Dict[str, Set[str]] = {}
+        self.pending: Dict[str, Transaction] = {}
+        self.vocabulary: List[str] = []
+        self.vocabulary_sorted = True
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        return cls.pattern.findall(text.lower())
+
+    def add(self, transaction: Transaction) -> None:
+        if self.pending:
+            self.pending[transaction.reference] = transaction
+        else:
+            self.insert(transaction)
+
+    def remove(self, reference: str) -> None:
+        if self.pending.pop(reference, None) is not None:
+            return
+        for token in self.tokens.pop(reference):
+            references = self.postings[token]
+            del references[reference]
+            if not references:
+                del self.postings[token]
+                self.vocabulary_sorted = False
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for transaction in transactions:
+            self.pending[transaction.reference] = transaction
+
+    def insert(self, transaction: Transaction) -> None:
+        tokens = set(self.tokenize(f'{transaction.notes} {transaction.source} {transaction.comments}'))
+        self.tokens[transaction.reference] = tokens
+        for token in tokens:
+            references = self.postings.get(token)
+            if references is None:
+                self.postings[token] = {transaction.reference: None}
+                self.vocabulary_sorted = False
+            else:
+                references[transaction.reference] = None
+
+    def index(self) -> None:
+        for transaction in self.pending.values():
+            self.insert(transaction)
+        self.pending.clear()
+
+    def get(self, token: str, prefix: bool = False) -> AbstractSet[str]:
+        if not prefix:
+            return self.postings.get(token, {}).keys()
+        if not self.vocabulary_sorted:
+            self.vocabulary = sorted(self.postings)
+            self.vocabulary_sorted = True
+        first = bisect_left(self.vocabulary, token)
+        last = bisect_left(self.vocabulary, token + '\U0010ffff', lo=first)
+        return set().union(*(self.postings[word] for word in self.vocabulary[first:last]))
+
+    @classmethod
+    def parse(cls, query: str) -> List[Tuple[str, bool]]:
+        terms = []
+        for term in query.split():
+            tokens = cls.tokenize(term)
+            terms.extend((token, False) for token in tokens[:-1])
+            if tokens:
+                terms.append((tokens[-1], term.endswith('*')))
+        return terms
+
+    def search(self, query: str) -> Set[str]:
+        self.index()
+        terms = self.parse(query)
+        if not terms:
+            return set()
+        smallest, *matches = sorted((self.get(token, prefix) for token, prefix in terms), key=len)
+        return {reference for reference in smallest if all(reference in references for references in matches)}
+
+    def clear(self) -> None:
+        self.postings.clear()
+        self.tokens.clear()
+        self.pending.clear()
+        self.vocabulary.clear()
+        self.vocabulary_sorted = True
+
+
+class CategorySuggester:
+
+    def __init__(self) -> None:
+        self.categories: Dict[str, int] = {}
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.totals: Dict[str, int] = {}
+        self.vocabulary: Dict[str, int] = {}
+        self.features: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self.pending: Dict[str, Transaction] = {}
+
+    @staticmethod
+    def tokenize(transaction: Transaction) -> Tuple[str, ...]:
+        tokens = {token for token in TextIndex.tokenize(f'{transaction.notes} {transaction.source}') if not token.isdigit()}
+        sign = '-' if transaction.amount < 0 else '+'
+        tokens.add(f'amount:{sign}{int(log2(abs(transaction.amount) + 1))}')
+        return tuple(tokens)
+
+    def add(self, transaction: Transaction) -> None:
+        if self.pending:
+            self.pending[transaction.reference] = transaction
+        else:
+            self.insert(transaction)
+
+    def remove(self, reference: str) -> None:
+        if self.pending.pop(reference, None) is not None:
+            return
+        features = self.features.pop(reference, None)
+        if features is not None:
+            self.learn(*features, -1)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for transaction in transactions:
+            self.pending[transaction.reference] = transaction
+
+    def insert(self, transaction: Transaction) -> None:
+        if not transaction.category:
+            return
+        tokens = self.tokenize(transaction)
+        self.features[transaction.reference] = (transaction.category, tokens)
+        self.learn(transaction.category, tokens, 1)
+
+    def train(self) -> None:
+        for transaction in self.pending.values():
+            self.insert(transaction)
+        self.pending.clear()
+
+    def learn(self, category: str, tokens: Tuple[str, ...], weight: int) -> None:
+        counts = self.counts.setdefault(category, {})
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + weight
+            self.vocabulary[token] = self.vocabulary.get(token, 0) + weight
+            if not counts[token]:
+                del counts[token]
+            if not self.vocabulary[token]:
+                del self.vocabulary[token]
+        self.totals[category] = self.totals.get(category, 0) + weight * len(tokens)
+        self.categories[category] = self.categories.get(category, 0) + weight
+        if not self.categories[category]:
+            del self.categories[category], self.counts[category], self.totals[category]
+
+    def suggest(self, transaction: Transaction, count: int = 3) -> List[Tuple[str, float]]:
+        self.train()
+        if not self.categories:
+            return []
+        tokens = [token for token in self.tokenize(transaction) if token in self.vocabulary]
+        size = len(self.vocabulary)
+        documents = sum(self.categories.values())
+        scores = {}
+        for category, documents_in_category in self.categories.items():
+            counts = self.counts[category]
+            denominator = self.totals[category] + size
+            score = log2(documents_in_category / documents)
+            for token in tokens:
+                score += log2((counts.get(token, 0) + 1) / denominator)
+            scores[category] = score
+        best = max(scores.values())
+        weights = {category: 2 ** (score - best) for category, score in scores.items()}
+        total = sum(weights.values())
+        ranking = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:count]
+        return [(category, weight / total) for category, weight in ranking]
+
+    def clear(self) -> None:
+        self.categories.clear()
+        self.counts.clear()
+        self.totals.clear()
+        self.vocabulary.clear()
+        self.features.clear()
+        self.pending.clear()
+
+
 class History:
 
     def __init__(self) -> None:
-        self.items: Dict[str, Transaction] = {}
-		
+        self._items: Dict[str, Transaction] = {}
+        self._month_index = TransactionIndex(lambda item: (item.year, item.month))
+        self._category_index = TransactionIndex(lambda item: item.category)
+        self._unreviewed_index = TransactionIndex(lambda item: not item.category)
+        self._aggregate_index = AggregateIndex()
+        self._day_index = DayIndex()
+        self._text_index = TextIndex()
+        self._suggester = CategorySuggester()
+        self._indexes: List[TransactionIndex | AggregateIndex | DayIndex | TextIndex | CategorySuggester] = [self._month_index, self._category_index, self._unreviewed_index, self._aggregate_index, self._day_index, self._text_index, self._suggester]
+        self._keyed_indexes: List[TransactionIndex | AggregateIndex] = [self._month_index, self._category_index, self._unreviewed_index, self._aggregate_index]
+        self._changes: Dict[str, bool] = {}
+        self.checkpoint: Optional[str] = None
+        self.partial = False
+
+    @property
+    def aggregates(self) -> AggregateCube:
+        return self._aggregate_index.cube
+
+    @property
+    def items(self) -> Dict[str, Transaction]:
+        return self._items
+
+    @items.setter
+    def items(self, items: Dict[str, Transaction]) -> None:
+        self._items = items
+        for index in self._indexes:
+            index.clear()
+            index.extend(items.values())
+        self._changes.clear()
+        self.checkpoint = None
+        self.partial = False
+
     def has_transaction(self, reference: str) -> bool:
         return reference in self.items
 
     def add_transaction(self, transaction: Transaction) -> Transaction:
         if self.has_transaction(transaction.reference):
-            raise TransactionExistsException(f'Failed to add transaction. Transaction with reference "{transaction.reference}" already exists')
+            raise TransactionExistsException(transaction.reference)
         
+        return self._insert_transaction(transaction)
+
+    def add_transactions(self, transactions: Iterable[Transaction]) -> Tuple[List[Transaction], List[Transaction]]:
+        transactions = list(transactions)
+        existing = self.items.keys() & {transaction.reference for transaction in transactions}
+        imported, duplicated = [], []
+        for transaction in transactions:
+            if transaction.reference in existing:
+                duplicated.append(transaction)
+            else:
+                existing.add(transaction.reference)
+                imported.append(transaction)
+        self._insert_transactions(imported)
+        return imported, duplicated
+
+    def _insert_transactions(self, transactions: List[Transaction]) -> None:
+        for transaction in transactions:
+            self.items[transaction.reference] = transaction
+            self._changes[transaction.reference] = True
+        for index in self._indexes:
+            index.extend(transactions)
+
+    def _insert_transaction(self, transaction: Transaction) -> Transaction:
         self.items[transaction.reference] = transaction
-        return self.items[transaction.reference]
+        self._add_to_indexes(transaction)
+        self._changes[transaction.reference] = True
+        return transaction
     
     def update_transaction(self, transaction: Transaction) -> Transaction:
+        self._check_update(transaction)
+        return self._replace_transaction(transaction)
+
+    def update_transactions(self, transactions: Iterable[Transaction]) -> List[Transaction]:
+        transactions = list(transactions)
+        for transaction in transactions:
+            self._check_update(transaction)
+        return [self._replace_transaction(transaction) for transaction in transactions]
+
+    def _check_update(self, transaction: Transaction) -> None:
         if not self.has_transaction(transaction.reference):
             raise TransactionNotFoundException(f'Failed to update transaction. Transaction with reference "{transaction.reference}" does not exist')
 
@@ -76,14 +455,25 @@ class History:
         if transaction != current_transaction:
             fields = transaction.get_different_fields(current_transaction)
             raise TransactionUpdateException(f'Failed to update transaction. The following immutable fields were going to be changed: {' '.join(fields)}')
-        
+
+    def _replace_transaction(self, transaction: Transaction) -> Transaction:
+        keys = {index: index.key(transaction) for index in self._keyed_indexes}
+        self._remove_from_indexes(transaction.reference)
         self.items[transaction.reference] = transaction
-        return self.items[transaction.reference]
-    
+        for index in self._indexes:
+            if index in keys:
+                index.insert(transaction, keys[index])
+            else:
+                index.add(transaction)
+        self._changes[transaction.reference] = True
+        return transaction
+
     def delete_transaction(self, reference: str) -> Transaction:
         if not self.has_transaction(reference):
             raise TransactionNotFoundException(f'Failed to delete transaction. Transaction with reference "{reference}" does not exist')
 
+        self._remove_from_indexes(reference)
+        self._changes[reference] = False
         transaction = self.items.pop(reference)
         return transaction
     
@@ -95,13 +485,52 @@ class History:
         return transaction
     
     def get_unreviewed_transactions(self) -> List[Transaction]:
-        return list(filter(lambda item: not item.category, self.items.values()))
+        return [self.items[reference] for reference in self._unreviewed_index.get(True)]
+
+    def get_unreviewed_clusters(self) -> List[List[Transaction]]:
+        clusters: Dict[Tuple[str, str], List[Transaction]] = {}
+        for transaction in self.get_unreviewed_transactions():
+            clusters.setdefault(get_signature(transaction), []).append(transaction)
+        return sorted(clusters.values(), key=len, reverse=True)
 
     def get_transactions_by_category(self, category: str) -> List[Transaction]:
-        return list(filter(lambda item: item.category == category, self.items.values()))
+        return [self.items[reference] for reference in self._category_index.get(category)]
+
+    def get_transactions_by_month(self, month: int, year: Optional[int] = None) -> List[Transaction]:
+        if year is not None:
+            return [self.items[reference] for reference in self._month_index.get((year, month))]
+        periods = sorted(period for period in self._month_index.buckets if period[1] == month)
+        return [self.items[reference] for period in periods for reference in self._month_index.get(period)]
+
+    def get_periods(self) -> List[Tuple[int, int]]:
+        return sorted(self._month_index.buckets)
+
+    def get_transactions_between(self, start: date, end: date) -> List[Transaction]:
+        return [self.items[reference] for reference in self._day_index.get(start, end)]
 
-    def get_transactions_by_month(self, month: int) -> List[Transaction]:
-        return list(filter(lambda item: item.month == month, self.items.values()))
+    def search_transactions(self, query: str) -> List[Transaction]:
+        transactions = [self.items[reference] for reference in self._text_index.search(query)]
+        return sorted(transactions, key=lambda transaction: (transaction.day, transaction.reference))
+
+    def suggest_categories(self, transaction: Transaction, count: int = 3) -> List[Tuple[str, float]]:
+        return self._suggester.suggest(transaction, count)
 
     def list_transactions(self) -> List[Transaction]:
         return list(self.items.values())
+
+    def get_changes(self) -> Tuple[List[Transaction], List[str]]:
+        upserted = [self.get_transaction(reference) for reference, exists in self._changes.items() if exists]
+        deleted = [reference for reference, exists in self._changes.items() if not exists]
+        return upserted, deleted
+
+    def mark_saved(self, checkpoint: str) -> None:
+        self._changes.clear()
+        self.checkpoint = checkpoint
+
+    def _add_to_indexes(self, transaction: Transaction) -> None:
+        for index in self._indexes:
+            index.add(transaction)
+
+    def _remove_from_indexes(self, reference: str) -> None:
+        for index in self._indexes:
+            index.remove(reference)
@@ -1,3 +1,5 @@
+from datetime import date
+from typing import Dict, Optional
 from uuid import UUID
 
 from finance.application.dto import InteractorResultDto
@@ -65,42 +67,92 @@ class CmdHistoryController(HistoryControllerInterface):
             if delete == 'Y':
                 self.delete_transaction(transaction.reference)
             else:
-                category = self.reader.get_input('Category: ')
-                month = self.reader.get_input('Month: ')
-                tag = self.reader.get_input('Tag: ')
-                comments = self.reader.get_input('Comments: ')
-                
-                fields = {}
-                if category:
-                    fields['category'] = category
-                if month:
-                    fields['month'] = month
-                if tag:
-                    fields['tag'] = tag
-                if comments:
-                    fields['comments'] = comments
-
-                self.update_transaction(transaction.reference, **fields)
-
-        self.history_use_cases.review_use_case.execute()
+                self.update_transaction(transaction.reference, **self.read_review_fields(transaction.reference))
+
+    def review_clusters(self) -> None:
+        clusters = self.history_use_cases.review_clusters_use_case.execute()
+        total = len(clusters)
+
+        for index, cluster in enumerate(clusters):
+            operation = f'Review Cluster {index+1}/{total}'
+            review = InteractorResultDto(success=True, operation=operation, data=[transaction.to_dict() for transaction in cluster])
+            self.presenter.present_history(review)
+
+            action = ''
+            while action not in ['C', 'D', 'S']:
+                action = self.reader.get_input('Categorize, Delete or Skip (C/D/S)? ')
+
+            references = [transaction.reference for transaction in cluster]
+            if action == 'D':
+                for reference in references:
+                    self.delete_transaction(reference)
+            elif action == 'C':
+                self.history_use_cases.bulk_update_use_case.execute(references, **self.read_review_fields(references[0]))
+
+    def read_review_fields(self, reference: str) -> Dict[str, str]:
+        suggestions = self.history_use_cases.suggest_use_case.execute(reference)
+        if suggestions:
+            category = self.reader.get_input(f'Category (1-{len(suggestions)} accepts a suggestion): ')
+            if category.isdigit() and 1 <= int(category) <= len(suggestions):
+                category = suggestions[int(category) - 1]
+        else:
+            category = self.reader.get_input('Category: ')
+        month = self.reader.get_input('Month: ')
+        tag = self.reader.get_input('Tag: ')
+        comments = self.reader.get_input('Comments: ')
+
+        fields = {}
+        if category:
+            fields['category'] = category
+        if month:
+            fields['month'] = month
+        if tag:
+            fields['tag'] = tag
+        if comments:
+            fields['comments'] = comments
+        return fields
 
     def update_transaction(self, reference: str, **kwargs) -> None:
         self.history_use_cases.update_use_case.execute(reference, **kwargs)
 
+    def update_transactions_where(self, where: str, **kwargs) -> None:
+        self.history_use_cases.bulk_update_use_case.execute(where=where, **kwargs)
+
     def ignore_transaction(self, reference: str, ignore: bool) -> None:
         self.history_use_cases.ignore_use_case.execute(reference, ignore)
 
     def delete_transaction(self, reference: str) -> None:
         self.history_use_cases.delete_use_case.execute(reference)
 
-    def list_transactions(self, month: int) -> None:
-        self.history_use_cases.list_use_case.execute(month)
+    def list_transactions(self, month: int, year: Optional[int] = None) -> None:
+        self.history_use_cases.list_use_case.execute(month, year)
+
+    def list_transactions_between(self, start: date, end: date) -> None:
+        self.history_use_cases.list_between_use_case.execute(start, end)
+
+    def search_transactions(self, query: str) -> None:
+        self.history_use_cases.search_use_case.execute(query)
+
+    def query_transactions(self, query: str) -> None:
+        self.history_use_cases.query_use_case.execute(query)
+
+    def add_rule(self, field: str, pattern: str, category: str, tag: str = '', ignore: bool = False) -> None:
+        self.history_use_cases.add_rule_use_case.execute(field, pattern, category, tag, ignore)
+
+    def list_rules(self) -> None:
+        self.history_use_cases.list_rules_use_case.execute()
+
+    def save_rules(self, project_name: str) -> None:
+        self.history_use_cases.save_rules_use_case.execute(project_name)
+
+    def load_rules(self, project_name: str) -> None:
+        self.history_use_cases.load_rules_use_case.execute(project_name)
 
     def save_budget(self, project_name: str) -> None:
         self.history_use_cases.save_use_case.execute(project_name)
         
-    def load_budget(self, project_name: str) -> None:
-        self.history_use_cases.load_use_case.execute(project_name)
+    def load_budget(self, project_name: str, month: Optional[int] = None, category: Optional[str] = None, year: Optional[int] = None) -> None:
+        self.history_use_cases.load_use_case.execute(project_name, month=month, category=category, year=year)
 
 
 class CmdReportController(ReportControllerInterface):
@@ -108,11 +160,11 @@ class CmdReportController(ReportControllerInterface):
     def __init__(self, report_use_case_facade: ReportUseCaseFacade):
         self.report_use_case_facade = report_use_case_facade
 
-    def get_report_by_category(self, category: str, months: int) -> None:
+    def get_report_by_category(self, category: str, months: int, year: Optional[int] = None) -> None:
         if category == 'all':
-            self.report_use_case_facade.all_category_report.execute(months)
+            self.report_use_case_facade.all_category_report.execute(months, year)
         else:
-            self.report_use_case_facade.category_report.execute(category, months)
+            self.report_use_case_facade.category_report.execute(category, months, year)
 
-    def get_report_by_month(self, month: int) -> None:
-        self.report_use_case_facade.month_report.execute(month)
+    def get_report_by_month(self, month: int, year: Optional[int] = None) -> None:
+        self.report_use_case_facade.month_report.execute(month, year)
@@ -1,15 +1,22 @@
-from typing import Protocol
+from dataclasses import fields, replace
+from typing import Optional, Protocol, Tuple, TypeVar
 
+from finance.domain.rule import RuleSet
 from finance.domain.transaction import History
 from finance.domain.budget import Budget
-from finance.application.interface import BudgetRepositoryInterface, HistoryRepositoryInterface
+from finance.application.interface import BudgetRepositoryInterface, HistoryRepositoryInterface, RuleRepositoryInterface
 from finance.interface.facade import BudgetUseCaseFacadeFactory, HistoryUseCaseFacadeFactory, ReportUseCaseFacadeFactory
 from finance.interface.controller import BudgetControllerInterface, HistoryControllerInterface, ReportControllerInterface
 from finance.infrastructure.presenter import CmdBudgetPresenter, CmdHistoryPresenter, CmdReportPresenter
 from finance.infrastructure.view import CmdBudgetView, CmdHistoryView, CmdReportView
 from finance.infrastructure.controller import CmdBudgetController, CmdHistoryController, CmdReportController
-from finance.infrastructure.importer import ErsteBankCsvTransactionImporter
+from finance.infrastructure.importer import ErsteBankCsvTransactionImporter, ParallelTransactionImporter
+from finance.infrastructure.instrumentation import Instrumentation
 from finance.infrastructure.reader import CmdInputReader
+from finance.infrastructure.repository import CsvBudgetRepository, CsvHistoryRepository, CsvRuleRepository, SqliteBudgetRepository, SqliteHistoryRepository
+
+T = TypeVar('T')
+BACKENDS = ('csv', 'sqlite')
 
 
 class AbstractComponentFactory(Protocol):
@@ -26,33 +33,54 @@ class AbstractComponentFactory(Protocol):
 
 class CmdComponentFactory(AbstractComponentFactory):
 
-    def __init__(self) -> None:
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, workers: int = 1) -> None:
+        self.instrumentation = instrumentation
+        self.workers = workers
         self._budget_controller: BudgetControllerInterface = None
         self._history_controller: HistoryControllerInterface = None
         self._report_controller: ReportControllerInterface = None
 
+    def get_repositories(self, backend: str = 'csv') -> Tuple[BudgetRepositoryInterface, HistoryRepositoryInterface]:
+        if backend == 'csv':
+            return CsvBudgetRepository(), CsvHistoryRepository(workers=self.workers)
+        if backend == 'sqlite':
+            return SqliteBudgetRepository(), SqliteHistoryRepository()
+        raise ValueError(f'Unknown backend: {backend}')
+
     def get_budget_controller(self, budget: Budget, repository: BudgetRepositoryInterface) -> BudgetControllerInterface:
         if not self._budget_controller:
-            view = CmdBudgetView()
-            presenter = CmdBudgetPresenter(view)
-            facade = BudgetUseCaseFacadeFactory.create_facade(budget, repository, presenter)
+            view = self.instrument(CmdBudgetView())
+            presenter = self.instrument(CmdBudgetPresenter(view))
+            facade = self.instrument_facade(BudgetUseCaseFacadeFactory.create_facade(budget, repository, presenter))
             self._budget_controller = CmdBudgetController(facade)
         return self._budget_controller
 
-    def get_history_controller(self, history: History, repository: HistoryRepositoryInterface) -> HistoryControllerInterface:
+    def get_history_controller(self, history: History, repository: HistoryRepositoryInterface, rules: Optional[RuleSet] = None, rule_repository: Optional[RuleRepositoryInterface] = None) -> HistoryControllerInterface:
         if not self._history_controller:
-            importer = ErsteBankCsvTransactionImporter()
+            rules = rules if rules is not None else RuleSet()
+            rule_repository = rule_repository or CsvRuleRepository()
+            importer = ParallelTransactionImporter(ErsteBankCsvTransactionImporter(workers=self.workers), worker_importer=ErsteBankCsvTransactionImporter())
             reader = CmdInputReader()
-            view = CmdHistoryView()
-            presenter = CmdHistoryPresenter(view)
-            facade = HistoryUseCaseFacadeFactory.create_facade(history, importer, repository, presenter)
+            view = self.instrument(CmdHistoryView())
+            presenter = self.instrument(CmdHistoryPresenter(view))
+            facade = self.instrument_facade(HistoryUseCaseFacadeFactory.create_facade(history, importer, repository, presenter, rules, rule_repository))
             self._history_controller = CmdHistoryController(facade, reader, presenter)
         return self._history_controller
 
     def get_report_controller(self, history: History, budget: Budget) -> ReportControllerInterface:
         if not self._report_controller:
-            view = CmdReportView()
-            presenter = CmdReportPresenter(view)
-            facade = ReportUseCaseFacadeFactory.create_facade(history, budget, presenter)
+            view = self.instrument(CmdReportView())
+            presenter = self.instrument(CmdReportPresenter(view))
+            facade = self.instrument_facade(ReportUseCaseFacadeFactory.create_facade(history, budget, presenter))
             self._report_controller = CmdReportController(facade)
         return self._report_controller
+
+    def instrument(self, component: T) -> T:
+        if not self.instrumentation:
+            return component
+        return self.instrumentation.instrument(component)
+
+    def instrument_facade(self, facade: T) -> T:
+        if not self.instrumentation:
+            return facade
+        return replace(facade, **{field.name: self.instrument(getattr(facade, field.name)) for field in fields(facade)})
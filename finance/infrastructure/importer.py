@@ -1,40 +1,93 @@
+from concurrent.futures import ProcessPoolExecutor
 import csv
-from datetime import datetime
-from typing import List
+from functools import partial
+import glob
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from finance.application.dto import TransactionDto
 from finance.application.interface import TransactionImporterInterface
+from finance.infrastructure.parsing import normalize_amount, parse_statement_day
+from finance.infrastructure.split import map_ranges, read_csv_range
+
+
+def parse_statement_row(row: List[str]) -> Tuple[str, ...]:
+    reference = row[9]
+    day, month = parse_statement_day(row[0])
+    source = row[1]
+    amount = normalize_amount(row[6])
+    notes = row[8]
+    category = ''
+    comments = ''
+    tag = ''
+    ignore = False
+    return (
+        reference,
+        day,
+        source,
+        amount,
+        notes,
+        category,
+        month,
+        tag,
+        comments,
+        str(ignore)
+    )
+
+
+def parse_statement_range(filename: str, start: int, end: int) -> List[Tuple[str, ...]]:
+    return [parse_statement_row(row) for row in read_csv_range(filename, start, end, delimiter=';')]
 
 
 class ErsteBankCsvTransactionImporter(TransactionImporterInterface):
 
-    def import_transactions(self, filename: str) -> List[TransactionDto]:
-        transactions = []
+    def __init__(self, workers: int = 1, split_size: int = 16 * 1024 * 1024) -> None:
+        self.workers = workers
+        self.split_size = split_size
+
+    def import_transactions(self, filename: str) -> Iterator[TransactionDto]:
+        if self.workers > 1 and os.path.getsize(filename) >= self.split_size:
+            with open(filename, 'rb') as csv_file:
+                header = len(csv_file.readline())
+            for rows in map_ranges(parse_statement_range, filename, self.workers, header):
+                for row in rows:
+                    yield TransactionDto(*row)
+            return
+
         with open(filename, 'r') as csv_file:
             csv_file.readline()
             csv_reader = csv.reader(csv_file, delimiter=';')
             for row in csv_reader:
-                reference = row[9]
-                day = datetime.strptime(row[0], '%d.%m.%Y').date()
-                source = row[1]
-                amount = row[6].replace(',', '')
-                notes = row[8]
-                category = ''
-                month = day.month
-                comments = ''
-                tag = ''
-                ignore = False
-                item = TransactionDto(
-                    reference,
-                    day.isoformat(),
-                    source,
-                    amount,
-                    notes,
-                    category,
-                    str(month),
-                    tag,
-                    comments,
-                    str(ignore)
-                )
-                transactions.append(item)
-        return transactions
+                yield TransactionDto(*parse_statement_row(row))
+
+
+def read_statement(importer: TransactionImporterInterface, filename: str) -> List[Tuple[str, ...]]:
+    return [tuple(transaction.to_dict().values()) for transaction in importer.import_transactions(filename)]
+
+
+class ParallelTransactionImporter(TransactionImporterInterface):
+
+    def __init__(self, importer: TransactionImporterInterface, max_workers: Optional[int] = None, worker_importer: Optional[TransactionImporterInterface] = None) -> None:
+        self.importer = importer
+        self.max_workers = max_workers
+        self.worker_importer = worker_importer or importer
+
+    def get_filenames(self, pattern: str) -> List[str]:
+        if os.path.isdir(pattern):
+            return sorted(glob.glob(os.path.join(pattern, '*.csv')))
+        if glob.has_magic(pattern):
+            return sorted(filename for filename in glob.glob(pattern) if os.path.isfile(filename))
+        return [pattern]
+
+    def import_transactions(self, filename: str) -> Iterable[TransactionDto]:
+        filenames = self.get_filenames(filename)
+        if not filenames:
+            raise FileNotFoundError(f'No statements found in "{filename}"')
+        if len(filenames) == 1:
+            return self.importer.import_transactions(filenames[0])
+
+        workers = min(len(filenames), self.max_workers or os.cpu_count() or 1)
+        if workers == 1:
+            return [transaction for name in filenames for transaction in self.importer.import_transactions(name)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return [TransactionDto._make(row) for rows in executor.map(partial(read_statement, self.worker_importer), filenames) for row in rows]
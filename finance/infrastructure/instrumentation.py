@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from functools import wraps
+import inspect
+import time
+from typing import Any, Callable, Dict, TypeVar
+
+from finance.application.dto import InteractorResultDto
+
+T = TypeVar('T')
+
+
+@dataclass
+class OperationStats:
+    calls: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+
+    @property
+    def average(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+def count_rows(value: Any) -> int:
+    if isinstance(value, InteractorResultDto):
+        return count_rows(value.data)
+    if isinstance(value, (list, tuple)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(item) for item in value.values() if isinstance(item, list))
+    return 0
+
+
+class Instrumentation:
+
+    def __init__(self) -> None:
+        self.stats: Dict[str, OperationStats] = {}
+
+    def wrap(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        stats = self.stats.setdefault(name, OperationStats())
+
+        @wraps(method)
+        def instrumented(*args, **kwargs) -> Any:
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                stats.seconds += time.perf_counter() - start
+                stats.calls += 1
+            stats.rows += count_rows(result) or sum(count_rows(argument) for argument in args)
+            return result
+
+        return instrumented
+
+    def instrument(self, component: T) -> T:
+        return InstrumentedComponent(component, self)
+
+    def get_stats(self) -> Dict[str, OperationStats]:
+        return {name: stats for name, stats in self.stats.items() if stats.calls}
+
+    def reset(self) -> None:
+        for stats in self.stats.values():
+            stats.calls, stats.seconds, stats.rows = 0, 0.0, 0
+
+
+class InstrumentedComponent:
+
+    def __init__(self, component: Any, instrumentation: Instrumentation) -> None:
+        self.__dict__['_component'] = component
+        self.__dict__['_instrumentation'] = instrumentation
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._component, name)
+        if name.startswith('_') or not inspect.ismethod(value):
+            return value
+        method = self._instrumentation.wrap(f'{type(self._component).__name__}.{name}', value)
+        self.__dict__[name] = method
+        return method
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._component, name, value)
@@ -0,0 +1,22 @@
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Tuple
+
+
+def parse_dotted_day(text: str) -> date:
+    if len(text) == 10 and text[2] == '.' and text[5] == '.':
+        return date(int(text[6:]), int(text[3:5]), int(text[:2]))
+    return datetime.strptime(text, '%d.%m.%Y').date()
+
+
+@lru_cache(maxsize=1 << 14)
+def parse_statement_day(text: str) -> Tuple[str, str]:
+    day = parse_dotted_day(text)
+    return day.isoformat(), str(day.month)
+
+
+def normalize_amount(text: str, thousands: str = ',', decimal: str = '.') -> str:
+    amount = text.strip().replace('\xa0', '').replace(' ', '').replace(thousands, '')
+    if decimal != '.':
+        amount = amount.replace(decimal, '.')
+    return amount
@@ -1,7 +1,7 @@
 from finance.domain.report import CategoryReport, MonthResult
 from finance.application.dto import InteractorResultDto
 from finance.application.interface import BudgetPresenterInterface, HistoryPresenterInterface, ReportPresenterInterface
-from finance.interface.view import BudgetViewInterface, BudgetItemViewModel, BudgetErrorViewModel, CategoryReportViewModel, HistoryErrorViewModel, HistoryViewInterface, MonthResultViewModel, ReportViewInterface, TableViewModel, TransactionViewModel
+from finance.interface.view import BudgetViewInterface, BudgetItemViewModel, BudgetErrorViewModel, CategoryReportViewModel, HistoryErrorViewModel, HistoryViewInterface, MonthResultViewModel, ReportViewInterface, RuleViewModel, TableViewModel, TransactionViewModel
 
 
 class CmdBudgetPresenter(BudgetPresenterInterface):
@@ -66,7 +66,7 @@ class CmdHistoryPresenter(HistoryPresenterInterface):
 
         duplicated = result.data['duplicated']
         if duplicated:
-            error = HistoryErrorViewModel(f'{result.operation} warning: {len(duplicated)} transactions duplicated', '\n\t'.join(duplicated))
+            error = HistoryErrorViewModel(f'{result.operation} warning: {len(duplicated)} transactions duplicated', '\n\t'.join(f'Transaction with reference "{reference}" already exists' for reference in duplicated))
             self.view.show_failure(error)
 
     def present_review_transactions(self, result: InteractorResultDto) -> None:
@@ -81,7 +81,50 @@ class CmdHistoryPresenter(HistoryPresenterInterface):
         self.view.show_item(f'{result.operation} succeeded', item)
 
     def present_history(self, result: InteractorResultDto) -> None:
-        ...
+        if not result.success:
+            self.present_failure(result)
+            return
+
+        transactions = [TransactionViewModel.from_dict(item, 45) for item in result.data]
+        if transactions:
+            self.view.show_list(f'{result.operation} succeeded: {len(transactions)} transactions', transactions)
+        else:
+            result.error = 'No transactions were found'
+            self.present_failure(result)
+
+    def present_rules(self, result: InteractorResultDto) -> None:
+        if not result.success:
+            self.present_failure(result)
+            return
+
+        rules = [RuleViewModel.from_dict(item) for item in result.data]
+        if rules:
+            self.view.show_list(f'{result.operation} succeeded', rules)
+        else:
+            result.error = 'There are no rules'
+            self.present_failure(result)
+
+    def present_suggestions(self, result: InteractorResultDto) -> None:
+        if not result.success:
+            self.present_failure(result)
+            return
+
+        if result.data:
+            suggestions = '  '.join(f'{index}) {item['category']} ({item['probability']:.0%})' for index, item in enumerate(result.data, 1))
+            self.view.show_message(f'Suggestions: {suggestions}')
+
+    def present_query(self, result: InteractorResultDto) -> None:
+        if not result.success:
+            self.present_failure(result)
+            return
+
+        rows = [['' if value is None else str(value) for value in row] for row in result.data['rows']]
+        if rows:
+            table = TableViewModel.from_dict({'fields': result.data['fields'], 'rows': rows})
+            self.view.show_table(f'{result.operation} succeeded: {len(rows)} rows ({result.data['plan']})', table)
+        else:
+            result.error = f'No transactions matched ({result.data['plan']})'
+            self.present_failure(result)
 
     def present_success(self, result: InteractorResultDto) -> None:
         message = HistoryErrorViewModel(f'{result.operation} succeeded', result.data)
@@ -102,14 +145,14 @@ class CmdReportPresenter(ReportPresenterInterface):
         income_details = {name: self.currency_format(amount) for name, amount in sorted(report.income_details.items(), key=lambda item: item[1], reverse=True)}
         expense_details = {name: self.currency_format(amount) for name, amount in sorted(report.expense_details.items(), key=lambda item: item[1])}
         category_details = {name: self.currency_format(amount) for name, amount in report.category_details.items()}
-        data = MonthResultViewModel(str(report.month),
+        data = MonthResultViewModel(report.period,
                                     self.currency_format(report.incomes),
                                     self.currency_format(report.expenses),
                                     self.currency_format(report.result),
                                     income_details,
                                     expense_details,
                                     category_details)
-        self.view.show_month_result(f'{result.operation}: {report.month}', data)
+        self.view.show_month_result(f'{result.operation}: {report.period}', data)
 
     def present_category_report(self, result: InteractorResultDto) -> None:
         report: CategoryReport = result.data
@@ -1,41 +1,262 @@
 import csv
-from typing import List
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from finance.application.dto import BudgetItemDto, TransactionDto
-from finance.application.interface import BudgetRepositoryInterface, HistoryRepositoryInterface
+from finance.application.dto import BudgetItemDto, CategorizationRuleDto, TransactionDto
+from finance.application.interface import BudgetRepositoryInterface, HistoryRepositoryInterface, RuleRepositoryInterface
+from finance.domain.transaction import get_period_year, parse_day
+from finance.infrastructure.snapshot import get_offset, read_snapshot, write_snapshot
+from finance.infrastructure.split import map_ranges, read_csv_range
 
 
 class CsvBudgetRepository(BudgetRepositoryInterface):
 
+    def __init__(self, snapshots: bool = True) -> None:
+        self.snapshots = snapshots
+
     def save_budget(self, filename: str, budget: List[BudgetItemDto]) -> None:
         with open(filename, 'w', newline='') as csv_file:
             csv_write = csv.writer(csv_file)
             for item in budget:
                 csv_write.writerow(list(item.to_dict().values()))
+        if self.snapshots:
+            write_snapshot(filename, [filename], [list(item.to_dict().values()) for item in budget], len(BudgetItemDto.__dataclass_fields__))
 
     def load_budget(self, filename: str) -> List[BudgetItemDto]:
+        if self.snapshots:
+            snapshot = read_snapshot(filename, [filename], lambda row: BudgetItemDto(*row))
+            if snapshot is not None:
+                return snapshot[0]
+
         budget = []
         with open(filename, 'r') as csv_file:
             csv_reader = csv.reader(csv_file)
             for row in csv_reader:
                 item = BudgetItemDto(*row)
                 budget.append(item)
+        if self.snapshots:
+            write_snapshot(filename, [filename], [list(item.to_dict().values()) for item in budget], len(BudgetItemDto.__dataclass_fields__))
         return budget
 
 
-class CsvHistoryRepository(HistoryRepositoryInterface):
+class CsvRuleRepository(RuleRepositoryInterface):
 
-    def save_history(self, filename: str, history: List[TransactionDto]) -> None:
+    def save_rules(self, filename: str, rules: List[CategorizationRuleDto]) -> None:
         with open(filename, 'w', newline='') as csv_file:
             csv_write = csv.writer(csv_file)
-            for item in history:
-                csv_write.writerow(item.to_dict().values())
+            for item in rules:
+                csv_write.writerow(list(item.to_dict().values()))
 
-    def load_history(self, filename: str) -> List[TransactionDto]:
-        history = []
+    def load_rules(self, filename: str) -> List[CategorizationRuleDto]:
+        rules = []
         with open(filename, 'r') as csv_file:
             csv_reader = csv.reader(csv_file)
             for row in csv_reader:
-                item = TransactionDto(*row)
-                history.append(item)
-        return history
+                item = CategorizationRuleDto(*row)
+                rules.append(item)
+        return rules
+
+
+class CsvHistoryRepository(HistoryRepositoryInterface):
+
+    def __init__(self, compaction_ratio: float = 1.0, workers: int = 1, split_size: int = 16 * 1024 * 1024, snapshots: bool = True) -> None:
+        self.compaction_ratio = compaction_ratio
+        self.workers = workers
+        self.split_size = split_size
+        self.snapshots = snapshots
+
+    def get_journal(self, filename: str) -> str:
+        return filename + '.journal'
+
+    def save_history(self, filename: str, history: List[TransactionDto]) -> None:
+        with open(filename, 'w', newline='') as csv_file:
+            csv_write = csv.writer(csv_file)
+            csv_write.writerows(history)
+        if os.path.exists(self.get_journal(filename)):
+            os.remove(self.get_journal(filename))
+        if self.snapshots:
+            write_snapshot(filename, [filename], history, len(TransactionDto._fields), self.get_journal(filename))
+
+    def save_history_changes(self, filename: str, upserted: List[TransactionDto], deleted: List[str]) -> None:
+        with open(self.get_journal(filename), 'a', newline='') as journal_file:
+            journal_write = csv.writer(journal_file)
+            for item in upserted:
+                journal_write.writerow(['U', *item])
+            for reference in deleted:
+                journal_write.writerow(['D', reference])
+
+        base_size = os.path.getsize(filename) if os.path.exists(filename) else 0
+        if os.path.getsize(self.get_journal(filename)) > self.compaction_ratio * base_size:
+            self.save_history(filename, self.read_history(filename, cache=False))
+
+    def load_history(self, filename: str, month: Optional[int] = None, category: Optional[str] = None, year: Optional[int] = None) -> List[TransactionDto]:
+        items = self.read_history(filename)
+        if month is not None:
+            items = [item for item in items if item.month == str(month)]
+        if category is not None:
+            items = [item for item in items if item.category == category]
+        if year is not None:
+            items = [item for item in items if get_period_year(parse_day(item.day), int(item.month)) == year]
+        return items
+
+    def read_history(self, filename: str, cache: bool = True) -> List[TransactionDto]:
+        journal = self.get_journal(filename)
+        if self.snapshots:
+            snapshot = read_snapshot(filename, [filename], TransactionDto._make, journal)
+            if snapshot is not None:
+                items, offset = snapshot
+                if offset == get_offset(journal):
+                    return items
+                history = {item.reference: item for item in items}
+                self.replay_journal(journal, history, offset)
+                return list(history.values())
+
+        history: Dict[str, TransactionDto] = {}
+        if os.path.exists(filename) or not os.path.exists(journal):
+            history = {row[0]: TransactionDto._make(row) for row in self.read_rows(filename)}
+        if os.path.exists(journal):
+            self.replay_journal(journal, history)
+
+        items = list(history.values())
+        if self.snapshots and cache:
+            write_snapshot(filename, [filename], items, len(TransactionDto._fields), journal)
+        return items
+
+    def replay_journal(self, journal: str, history: Dict[str, TransactionDto], offset: int = 0) -> None:
+        for operation, *row in read_csv_range(journal, offset, os.path.getsize(journal)):
+            if operation == 'U':
+                history[row[0]] = TransactionDto._make(row)
+            else:
+                history.pop(row[0], None)
+
+    def read_rows(self, filename: str) -> Iterator[List[str]]:
+        if self.workers > 1 and os.path.getsize(filename) >= self.split_size:
+            for rows in map_ranges(read_csv_range, filename, self.workers):
+                yield from rows
+            return
+
+        with open(filename, 'r') as csv_file:
+            yield from csv.reader(csv_file)
+
+
+class SqliteRepository:
+    table: str
+    key: str
+    columns: List[str]
+    schema: List[str]
+
+    def __init__(self) -> None:
+        self.saved: Dict[str, Dict[str, Tuple]] = {}
+
+    def get_database(self, filename: str) -> str:
+        return os.path.splitext(filename)[0] + '.sqlite'
+
+    def connect(self, filename: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.get_database(filename))
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(self.schema[0])
+        self.migrate(connection)
+        for statement in self.schema[1:]:
+            connection.execute(statement)
+        return connection
+
+    def migrate(self, connection: sqlite3.Connection) -> None:
+        pass
+
+    def save_rows(self, filename: str, rows: List[Tuple]) -> None:
+        saved = self.saved.setdefault(filename, {})
+        current = {row[0]: row for row in rows}
+        changed = [row for key, row in current.items() if saved.get(key) != row]
+        deleted = [key for key in saved if key not in current]
+        self.write_rows(filename, changed, deleted)
+        self.saved[filename] = current
+
+    def save_changes(self, filename: str, upserted: List[Tuple], deleted: List[str]) -> None:
+        self.write_rows(filename, upserted, deleted)
+        saved = self.saved.setdefault(filename, {})
+        saved.update((row[0], row) for row in upserted)
+        for key in deleted:
+            saved.pop(key, None)
+
+    def write_rows(self, filename: str, upserted: List[Tuple], deleted: List[str]) -> None:
+        placeholders = ', '.join('?' for _ in self.columns)
+        connection = self.connect(filename)
+        try:
+            with connection:
+                connection.executemany(f'INSERT OR REPLACE INTO {self.table} ({', '.join(self.columns)}) VALUES ({placeholders})', upserted)
+                connection.executemany(f'DELETE FROM {self.table} WHERE {self.key} = ?', [(key,) for key in deleted])
+        finally:
+            connection.close()
+
+    def load_rows(self, filename: str, where: Dict[str, object]) -> List[Tuple]:
+        if not os.path.exists(self.get_database(filename)):
+            raise FileNotFoundError(f'No such database: \'{self.get_database(filename)}\'')
+
+        query = f'SELECT {', '.join(self.columns)} FROM {self.table}'
+        if where:
+            query += ' WHERE ' + ' AND '.join(f'{column} = ?' for column in where)
+        connection = self.connect(filename)
+        try:
+            rows = connection.execute(query, list(where.values())).fetchall()
+        finally:
+            connection.close()
+        self.saved[filename] = {row[0]: row for row in rows}
+        return rows
+
+
+class SqliteBudgetRepository(SqliteRepository, BudgetRepositoryInterface):
+    table = 'budget'
+    key = 'identifier'
+    columns = ['identifier', 'name', 'amount', 'category', 'note']
+    schema = [
+        'CREATE TABLE IF NOT EXISTS budget (identifier TEXT PRIMARY KEY, name TEXT, amount TEXT, category TEXT, note TEXT)',
+        'CREATE INDEX IF NOT EXISTS budget_category ON budget (category)',
+    ]
+
+    def save_budget(self, filename: str, budget: List[BudgetItemDto]) -> None:
+        self.save_rows(filename, [tuple(item.to_dict().values()) for item in budget])
+
+    def load_budget(self, filename: str) -> List[BudgetItemDto]:
+        return [BudgetItemDto(*row) for row in self.load_rows(filename, {})]
+
+
+class SqliteHistoryRepository(SqliteRepository, HistoryRepositoryInterface):
+    table = 'history'
+    key = 'reference'
+    columns = ['reference', 'day', 'source', 'amount', 'notes', 'category', 'month', 'tag', 'comments', 'ignore', 'year']
+    schema = [
+        'CREATE TABLE IF NOT EXISTS history (reference TEXT PRIMARY KEY, day TEXT, source TEXT, amount TEXT, notes TEXT, category TEXT, month INTEGER, tag TEXT, comments TEXT, ignore TEXT, year INTEGER)',
+        'CREATE INDEX IF NOT EXISTS history_period ON history (year, month)',
+        'CREATE INDEX IF NOT EXISTS history_category ON history (category)',
+        'CREATE INDEX IF NOT EXISTS history_day ON history (day)',
+    ]
+
+    def save_history(self, filename: str, history: List[TransactionDto]) -> None:
+        self.save_rows(filename, [self.to_row(item) for item in history])
+
+    def save_history_changes(self, filename: str, upserted: List[TransactionDto], deleted: List[str]) -> None:
+        self.save_changes(filename, [self.to_row(item) for item in upserted], deleted)
+
+    def load_history(self, filename: str, month: Optional[int] = None, category: Optional[str] = None, year: Optional[int] = None) -> List[TransactionDto]:
+        where = {}
+        if month is not None:
+            where['month'] = month
+        if category is not None:
+            where['category'] = category
+        if year is not None:
+            where['year'] = year
+        return [TransactionDto(*row[:6], str(row[6]), *row[7:10]) for row in self.load_rows(filename, where)]
+
+    def migrate(self, connection: sqlite3.Connection) -> None:
+        columns = {row[1] for row in connection.execute('PRAGMA table_info(history)')}
+        if 'year' in columns:
+            return
+        with connection:
+            connection.execute('ALTER TABLE history ADD COLUMN year INTEGER')
+            rows = connection.execute('SELECT reference, day, month FROM history').fetchall()
+            connection.executemany('UPDATE history SET year = ? WHERE reference = ?', [(get_period_year(parse_day(day), int(month)), reference) for reference, day, month in rows])
+
+    def to_row(self, item: TransactionDto) -> Tuple:
+        month = int(item.month)
+        return (*item[:6], month, *item[7:], get_period_year(parse_day(item.day), month))
@@ -0,0 +1,108 @@
+from array import array
+import gc
+from operator import itemgetter
+import os
+import struct
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+MAGIC = b'FINSNAP2'
+HEADER = struct.Struct('<8sII')
+SOURCE = struct.Struct('<?qq')
+LENGTH = struct.Struct('<I')
+OFFSET = struct.Struct('<q')
+SEPARATOR = '\0'
+
+
+def get_snapshot(filename: str) -> str:
+    return os.path.splitext(filename)[0] + '.snapshot'
+
+
+def get_signature(sources: Sequence[str]) -> bytes:
+    signature = b''
+    for source in sources:
+        try:
+            stat = os.stat(source)
+        except FileNotFoundError:
+            signature += SOURCE.pack(False, 0, 0)
+        else:
+            signature += SOURCE.pack(True, stat.st_size, stat.st_mtime_ns)
+    return signature
+
+
+def get_offset(journal: Optional[str]) -> int:
+    if journal is None or not os.path.exists(journal):
+        return 0
+    return os.path.getsize(journal)
+
+
+def write_snapshot(filename: str, sources: Sequence[str], rows: Sequence[Sequence[str]], columns: int, journal: Optional[str] = None) -> None:
+    snapshot = get_snapshot(filename)
+    parts = [HEADER.pack(MAGIC, columns, len(rows)), get_signature(sources), OFFSET.pack(get_offset(journal))]
+    for index in range(columns):
+        column = list(map(itemgetter(index), rows))
+        table = dict.fromkeys(column)
+        text = SEPARATOR.join(table)
+        if text.count(SEPARATOR) != max(len(table) - 1, 0):
+            if os.path.exists(snapshot):
+                os.remove(snapshot)
+            return
+        encoded = text.encode()
+        parts += [LENGTH.pack(len(encoded)), encoded]
+        if len(table) < len(rows):
+            codes = {value: code for code, value in enumerate(table)}
+            parts.append(array('I', map(codes.__getitem__, column)).tobytes())
+
+    try:
+        with open(snapshot + '.tmp', 'wb') as file:
+            file.writelines(parts)
+        os.replace(snapshot + '.tmp', snapshot)
+    except OSError:
+        pass
+
+
+def read_snapshot(filename: str, sources: Sequence[str], make: Callable[[Tuple[str, ...]], T], journal: Optional[str] = None) -> Optional[Tuple[List[T], int]]:
+    try:
+        with open(get_snapshot(filename), 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+
+    try:
+        magic, columns, count = HEADER.unpack_from(data)
+        signature = get_signature(sources)
+        offset = HEADER.size + len(signature)
+        if magic != MAGIC or data[HEADER.size:offset] != signature:
+            return None
+        (journal_offset,) = OFFSET.unpack_from(data, offset)
+        offset += OFFSET.size
+        if journal_offset > get_offset(journal):
+            return None
+        values: List[Iterable[str]] = []
+        for _ in range(columns):
+            (length,) = LENGTH.unpack_from(data, offset)
+            offset += LENGTH.size
+            table = data[offset:offset + length].decode().split(SEPARATOR)
+            offset += length
+            if len(table) == count:
+                values.append(table)
+                continue
+            codes = array('I', data[offset:offset + count * 4])
+            offset += count * 4
+            if len(codes) != count:
+                return None
+            values.append(map(table.__getitem__, codes))
+    except (struct.error, UnicodeDecodeError, ValueError):
+        return None
+    if offset != len(data):
+        return None
+
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return list(map(make, zip(*values))), journal_offset
+    except IndexError:
+        return None
+    finally:
+        if enabled:
+            gc.enable()
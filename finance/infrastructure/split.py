@@ -0,0 +1,59 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import io
+from itertools import repeat
+import locale
+import mmap
+import os
+from typing import Callable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar('T')
+BLOCK_SIZE = 1 << 20
+
+
+def count_quotes(buffer: mmap.mmap, start: int, end: int) -> int:
+    return sum(buffer[offset:min(offset + BLOCK_SIZE, end)].count(b'"') for offset in range(start, end, BLOCK_SIZE))
+
+
+def find_record_ranges(filename: str, parts: int, start: int = 0) -> List[Tuple[int, int]]:
+    size = os.path.getsize(filename)
+    if size <= start:
+        return []
+    if parts <= 1:
+        return [(start, size)]
+
+    boundaries = [start]
+    with open(filename, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        position, quotes = start, 0
+        for part in range(1, parts):
+            target = max(start + (size - start) * part // parts, position)
+            quotes += count_quotes(buffer, position, target)
+            position = target
+            while position < size:
+                newline = buffer.find(b'\n', position)
+                end = size if newline == -1 else newline + 1
+                quotes += count_quotes(buffer, position, end)
+                position = end
+                if quotes % 2 == 0:
+                    break
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def read_csv_range(filename: str, start: int, end: int, delimiter: str = ',') -> List[List[str]]:
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode(locale.getpreferredencoding(False))
+    return list(csv.reader(io.StringIO(text, newline=''), delimiter=delimiter))
+
+
+def map_ranges(function: Callable[[str, int, int], List[T]], filename: str, workers: int, start: int = 0) -> Iterator[List[T]]:
+    ranges = find_record_ranges(filename, workers * 4, start)
+    if not ranges:
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(function, repeat(filename), *zip(*ranges))
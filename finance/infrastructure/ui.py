@@ -1,8 +1,13 @@
+from datetime import date
 import os
+import shlex
 from uuid import UUID
 import cmd
+from typing import Optional
 
 from finance.interface.controller import BudgetControllerInterface, HistoryControllerInterface, ReportControllerInterface
+from finance.infrastructure.instrumentation import Instrumentation
+from finance.infrastructure.view import CmdStatsView
 
 
 class BudgetCmd(cmd.Cmd):
@@ -198,7 +203,7 @@ class HistoryCmd(cmd.Cmd):
         self.history_controller = history_controller
 
     def do_import(self, args: str) -> None:
-        """import <filename>: Imports the transactions in the file"""
+        """import <filename|directory|glob>: Imports the transactions in the file, in every CSV file of the directory or in every file matching the pattern"""
         parameters = args.split()
         if len(parameters) < 1:
             self.do_help('import')
@@ -279,6 +284,36 @@ class HistoryCmd(cmd.Cmd):
         fields = {'comments': comments}
         self.history_controller.update_transaction(reference, **fields)
 
+    def do_update_where(self, args: str) -> None:
+        """update_where <filter> set <field>=<value> ...: Updates (category, month, tag, comments, ignore) of every transaction matching the filter, e.g. update_where source~billa and month=8 set category=groceries"""
+        lexer = shlex.shlex(args, posix=True)
+        lexer.whitespace_split = True
+        where, words, position = None, [], 0
+        try:
+            for word in lexer:
+                end = lexer.instream.tell()
+                if where is None and args[position:end].strip() == 'set':
+                    where = args[:position]
+                elif where is not None:
+                    words.append(word)
+                position = end
+        except ValueError as e:
+            print(f'The changes should be <field>=<value>. {str(e)}')
+            return
+        if where is None or not where.strip() or not words:
+            self.do_help('update_where')
+            return
+
+        fields = {}
+        for word in words:
+            field, equals, value = word.partition('=')
+            if not equals:
+                print(f'The changes should be <field>=<value>: \'{word}\'')
+                return
+            fields[field] = value
+
+        self.history_controller.update_transactions_where(where.strip(), **fields)
+
     def do_ignore(self, args: str) -> None:
         """ignore <reference> <True/False>: Ignores or includes in the budget the transaction with given reference"""
         parameters = args.split()
@@ -298,7 +333,7 @@ class HistoryCmd(cmd.Cmd):
         self.history_controller.ignore_transaction(reference, ignore)
 
     def do_list(self, args: str) -> None:
-        """list <month>: Lists all transactions in the given month  """
+        """list <month> [year]: Lists all transactions in the given month, of every year unless one is given"""
         parameters = args.split()
         if len(parameters) < 1:
             self.do_help('list')
@@ -309,8 +344,95 @@ class HistoryCmd(cmd.Cmd):
         except ValueError as e:
             print(f'The month should be a number. {str(e)}')
             return
+
+        year = None
+        if len(parameters) > 1:
+            try:
+                year = int(parameters[1])
+            except ValueError as e:
+                print(f'The year should be a number. {str(e)}')
+                return
         
-        self.history_controller.list_transactions(month)
+        self.history_controller.list_transactions(month, year)
+
+    def do_range(self, args: str) -> None:
+        """range <from> <to>: Lists all transactions booked between the given days (YYYY-MM-DD), both included"""
+        parameters = args.split()
+        if len(parameters) < 2:
+            self.do_help('range')
+            return
+
+        try:
+            start, end = date.fromisoformat(parameters[0]), date.fromisoformat(parameters[1])
+        except ValueError as e:
+            print(f'The days should be dates in the format YYYY-MM-DD. {str(e)}')
+            return
+
+        self.history_controller.list_transactions_between(start, end)
+
+    def do_search(self, args: str) -> None:
+        """search <terms>: Lists the transactions whose notes, source or comments contain all terms; end a term with * to match it as a prefix"""
+        if not args.strip():
+            self.do_help('search')
+            return
+
+        self.history_controller.search_transactions(args.strip())
+
+    def do_query(self, args: str) -> None:
+        """query [where <filter>] [group by <field>] [count|sum|avg|min|max <field> ...] [order by <column> [asc|desc]] [limit <n>]: Queries the transactions, e.g. query where category=groceries and month in 1..3 group by tag sum amount order by sum desc"""
+        if not args.strip():
+            self.do_help('query')
+            return
+
+        self.history_controller.query_transactions(args.strip())
+
+    def do_add_rule(self, args: str) -> None:
+        """add_rule <source/notes> <pattern> <category> [tag] [True/False]: Adds a rule that categorizes the imported transactions whose source or notes match the pattern"""
+        try:
+            parameters = shlex.split(args)
+        except ValueError as e:
+            print(f'Failed to parse rule. {str(e)}')
+            return
+        if len(parameters) < 3:
+            self.do_help('add_rule')
+            return
+
+        field, pattern, category = parameters[:3]
+        tag = parameters[3] if len(parameters) > 3 else ''
+        ignore = False
+        if len(parameters) > 4:
+            if parameters[4].lower() == 'true':
+                ignore = True
+            elif parameters[4].lower() != 'false':
+                print(f'Ignore paramater should be True or False: \'{parameters[4]}\'')
+                return
+
+        self.history_controller.add_rule(field, pattern, category, tag, ignore)
+
+    def do_list_rules(self, _: str) -> None:
+        """list_rules: Lists the categorization rules in priority order"""
+        self.history_controller.list_rules()
+
+    def do_save_rules(self, args: str) -> None:
+        """save_rules <name>: Saves the categorization rules with the given project name"""
+        parameters = args.split()
+        if len(parameters) < 1:
+            self.do_help('save_rules')
+            return
+
+        project_name = parameters[0]
+        os.makedirs(project_name, exist_ok=True)
+        self.history_controller.save_rules(project_name)
+
+    def do_load_rules(self, args: str) -> None:
+        """load_rules <name>: Loads the categorization rules with the given project name"""
+        parameters = args.split()
+        if len(parameters) < 1:
+            self.do_help('load_rules')
+            return
+
+        project_name = parameters[0]
+        self.history_controller.load_rules(project_name)
 
     def do_delete(self, args: str) -> None:
         """delete <reference>: Deletes the transaction with given reference"""
@@ -322,9 +444,12 @@ class HistoryCmd(cmd.Cmd):
         reference = parameters[0]
         self.history_controller.delete_transaction(reference)
 
-    def do_review(self, _: str) -> None:
-        """review: Reviews the uncategorized transactions"""
-        self.history_controller.review_transactions()
+    def do_review(self, args: str) -> None:
+        """review [batch]: Reviews the uncategorized transactions, one by one or in batches of similar transactions"""
+        if args.strip() == 'batch':
+            self.history_controller.review_clusters()
+        else:
+            self.history_controller.review_transactions()
 
     def do_save(self, args: str) -> None:
         """save <name>: Saves the history with the given project name"""
@@ -338,14 +463,28 @@ class HistoryCmd(cmd.Cmd):
         self.history_controller.save_budget(project_name)
 
     def do_load(self, args: str) -> None:
-        """load <name>: Loads the history with the given project name"""
+        """load <name> [month=<month>] [year=<year>] [category=<category>]: Loads the history with the given project name, only the transactions of the given period and category if any (the SQLite backend reads only those, the CSV backend filters the whole history)"""
         parameters = args.split()
         if len(parameters) < 1:
             self.do_help('load')
             return
 
         project_name = parameters[0]
-        self.history_controller.load_budget(project_name)
+        filters = {}
+        for parameter in parameters[1:]:
+            field, equals, value = parameter.partition('=')
+            if not equals or field not in ('month', 'year', 'category'):
+                print(f'The filters should be month=<month>, year=<year> or category=<category>: \'{parameter}\'')
+                return
+            if field == 'category':
+                filters[field] = value
+                continue
+            try:
+                filters[field] = int(value)
+            except ValueError as e:
+                print(f'The {field} should be a number. {str(e)}')
+                return
+        self.history_controller.load_budget(project_name, **filters)
     
     def do_quit(self, _: str) -> bool:
         """quit: Quits the program"""
@@ -360,18 +499,24 @@ class ReportCmd(cmd.Cmd):
         self.report_controller = report_controller
 
     def do_report_category(self, args: str) -> None:
-        """report_category <category> <months>: Reports the category for the number of months"""
+        """report_category <category> <months> [year]: Reports the category for the number of months, of every year unless one is given"""
         parameters = args.split()
         if len(parameters) < 2:
             self.do_help('report_category')
             return
         
         category = parameters[0]
-        months = int(parameters[1])
-        self.report_controller.get_report_by_category(category, months)
+        try:
+            months = int(parameters[1])
+            year = int(parameters[2]) if len(parameters) > 2 else None
+        except ValueError as e:
+            self.do_help('report_category')
+            return
+
+        self.report_controller.get_report_by_category(category, months, year)
 
     def do_report_month(self, args: str) -> None:
-        """report_month <month>: Reports the month"""
+        """report_month <month> [year]: Reports the month, of every year unless one is given"""
         parameters = args.split()
         if len(parameters) < 1:
             self.do_help('report_month')
@@ -379,21 +524,24 @@ class ReportCmd(cmd.Cmd):
         
         try:
             month = int(parameters[0])
+            year = int(parameters[1]) if len(parameters) > 1 else None
         except ValueError as e:
             self.do_help('report_month')
             return
         
-        self.report_controller.get_report_by_month(month)
+        self.report_controller.get_report_by_month(month, year)
         
 
 class FinanceCmd(cmd.Cmd):
     prompt = 'finance> '
 
-    def __init__(self, budget_controller: BudgetControllerInterface, history_controller: HistoryControllerInterface, report_controller: ReportControllerInterface):
+    def __init__(self, budget_controller: BudgetControllerInterface, history_controller: HistoryControllerInterface, report_controller: ReportControllerInterface, instrumentation: Optional[Instrumentation] = None):
         super().__init__()
         self.budget_cmd = BudgetCmd(budget_controller)
         self.history_cmd = HistoryCmd(history_controller)
         self.report_cmd = ReportCmd(report_controller)
+        self.instrumentation = instrumentation
+        self.stats_view = CmdStatsView()
 
     def do_budget(self, _) -> None:
         """enter budget prompt"""
@@ -407,6 +555,18 @@ class FinanceCmd(cmd.Cmd):
         """enter report prompt"""
         self.report_cmd.cmdloop()
 
+    def do_stats(self, args: str) -> None:
+        """stats [reset]: Shows the time, calls and rows recorded for each use case, presenter and view call"""
+        if not self.instrumentation:
+            print('Instrumentation is disabled. Start the program with --stats to enable it')
+            return
+
+        if args.strip() == 'reset':
+            self.instrumentation.reset()
+            return
+
+        self.stats_view.show_stats(self.instrumentation.get_stats())
+
     def do_import_transactions(self, args: str) -> None:
         """import_transactions <filename>: Imports the transactions in the file"""
         parameters = args.split()
@@ -481,7 +641,7 @@ class FinanceCmd(cmd.Cmd):
         self.history_cmd.do_save(project_name)
 
     def do_load(self, args: str) -> None:
-        """load <name>: Loads the finance with the given project name"""
+        """load <name> [month=<month>] [year=<year>] [category=<category>]: Loads the finance with the given project name, only the transactions of the given period and category if any"""
         parameters = args.split()
         if len(parameters) < 1:
             self.do_help('load')
@@ -489,7 +649,7 @@ class FinanceCmd(cmd.Cmd):
 
         project_name = parameters[0]
         self.budget_cmd.do_load(project_name)
-        self.history_cmd.do_load(project_name)
+        self.history_cmd.do_load(args)
 
     def do_quit(self, _: str) -> bool:
         """quit: Quits the program"""
@@ -1,6 +1,8 @@
 from prettytable import PrettyTable
 from typing import Dict, List
 
+from finance.infrastructure.instrumentation import OperationStats
+
 from finance.interface.view import BudgetErrorViewModel, BudgetItemViewModel, BudgetViewInterface, CategoryReportViewModel, HistoryErrorViewModel, HistoryViewInterface, MonthResultViewModel, ReportViewInterface, TableViewModel, TransactionViewModel
 
 
@@ -56,6 +58,15 @@ class CmdHistoryView(HistoryViewInterface):
     def show_message(self, message: str) -> None:
         print(f'{message}')
         print()
+
+    def show_table(self, command: str, data: TableViewModel) -> None:
+        print(f'{command}')
+        table = PrettyTable(max_table_width=300)
+        table.field_names = data.fields
+        for row in data.rows:
+            table.add_row(row)
+        print(table)
+        print()
     
     def show_failure(self, error: HistoryErrorViewModel) -> None:
         print(f'{error.command}')
@@ -105,3 +116,13 @@ class CmdReportView(ReportViewInterface):
             month_table.add_row([month, amount, result])
         print(month_table)
         print()
+
+
+class CmdStatsView:
+
+    def show_stats(self, stats: Dict[str, OperationStats]) -> None:
+        table = PrettyTable(['Operation', 'Calls', 'Total (s)', 'Average (ms)', 'Rows'])
+        for name, operation in sorted(stats.items(), key=lambda item: item[1].seconds, reverse=True):
+            table.add_row([name, operation.calls, f'{operation.seconds:.4f}', f'{operation.average * 1000:.3f}', operation.rows])
+        print(table)
+        print()
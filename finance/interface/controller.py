@@ -1,4 +1,5 @@
-from typing import Protocol
+from datetime import date
+from typing import Optional, Protocol
 from uuid import UUID
 
 
@@ -49,29 +50,56 @@ class HistoryControllerInterface(Protocol):
     def review_transactions(self) -> None:
         ...
 
+    def review_clusters(self) -> None:
+        ...
+
     def update_transaction(self, reference: str, **kwargs) -> None:
         ...
 
+    def update_transactions_where(self, where: str, **kwargs) -> None:
+        ...
+
     def ignore_transaction(self, reference: str, ignore: bool) -> None:
         ...
 
     def delete_transaction(self, reference: str) -> None:
         ...
         
-    def list_transactions(self, month: int) -> None:
+    def list_transactions(self, month: int, year: Optional[int] = None) -> None:
+        ...
+
+    def list_transactions_between(self, start: date, end: date) -> None:
+        ...
+
+    def search_transactions(self, query: str) -> None:
+        ...
+
+    def query_transactions(self, query: str) -> None:
+        ...
+
+    def add_rule(self, field: str, pattern: str, category: str, tag: str = '', ignore: bool = False) -> None:
+        ...
+
+    def list_rules(self) -> None:
+        ...
+
+    def save_rules(self, project_name: str) -> None:
+        ...
+
+    def load_rules(self, project_name: str) -> None:
         ...
 
     def save_budget(self, project_name: str) -> None:
         ...
         
-    def load_budget(self, project_name: str) -> None:
+    def load_budget(self, project_name: str, month: Optional[int] = None, category: Optional[str] = None, year: Optional[int] = None) -> None:
         ...
 
 
 class ReportControllerInterface(Protocol):
 
-    def get_report_by_category(self, category: str) -> None:
+    def get_report_by_category(self, category: str, months: int, year: Optional[int] = None) -> None:
         ...
 
-    def get_report_by_month(self, month: int) -> None:
+    def get_report_by_month(self, month: int, year: Optional[int] = None) -> None:
         ...
@@ -1,9 +1,11 @@
 from dataclasses import dataclass
-from typing import Self
+from typing import Optional, Self
 
-from finance.application.interface import BudgetPresenterInterface, BudgetRepositoryInterface, HistoryPresenterInterface, HistoryRepositoryInterface, ReportPresenterInterface, TransactionImporterInterface
+from finance.application.interface import BudgetPresenterInterface, BudgetRepositoryInterface, HistoryPresenterInterface, HistoryRepositoryInterface, ReportPresenterInterface, RuleRepositoryInterface, TransactionImporterInterface
 from finance.application.report_interactor import AllCategoryReportUseCase, CategoryReportUseCase, MonthResultUseCase
-from finance.application.transaction_interactor import DeleteTransactionUseCase, IgnoreTransactionUseCase, ImportTransactionsUseCase, ListTransactionsUseCase, LoadHistoryUseCase, ReviewTransactionsUseCase, SaveHistoryUseCase, UpdateTransactionUseCase
+from finance.application.rule_interactor import AddRuleUseCase, ListRulesUseCase, LoadRulesUseCase, SaveRulesUseCase
+from finance.application.transaction_interactor import BulkUpdateTransactionsUseCase, DeleteTransactionUseCase, IgnoreTransactionUseCase, ImportTransactionsUseCase, ListTransactionsBetweenUseCase, ListTransactionsUseCase, LoadHistoryUseCase, QueryTransactionsUseCase, ReviewClustersUseCase, ReviewTransactionsUseCase, SaveHistoryUseCase, SearchTransactionsUseCase, SuggestCategoriesUseCase, UpdateTransactionUseCase
+from finance.domain.rule import RuleSet
 from finance.domain.transaction import History
 from finance.domain.budget import Budget
 from finance.application.budget_interactor import (
@@ -57,20 +59,41 @@ class HistoryUseCaseFacade:
     list_use_case: ListTransactionsUseCase
     save_use_case: SaveHistoryUseCase
     load_use_case: LoadHistoryUseCase
+    list_between_use_case: ListTransactionsBetweenUseCase
+    search_use_case: SearchTransactionsUseCase
+    add_rule_use_case: AddRuleUseCase
+    list_rules_use_case: ListRulesUseCase
+    save_rules_use_case: SaveRulesUseCase
+    load_rules_use_case: LoadRulesUseCase
+    suggest_use_case: SuggestCategoriesUseCase
+    review_clusters_use_case: ReviewClustersUseCase
+    bulk_update_use_case: BulkUpdateTransactionsUseCase
+    query_use_case: QueryTransactionsUseCase
 
 
 class HistoryUseCaseFacadeFactory:
 
     @classmethod
-    def create_facade(cls, history: History, importer: TransactionImporterInterface, repository: HistoryRepositoryInterface, presenter: HistoryPresenterInterface) -> HistoryUseCaseFacade:
-        return HistoryUseCaseFacade(ImportTransactionsUseCase(history, importer, presenter),
+    def create_facade(cls, history: History, importer: TransactionImporterInterface, repository: HistoryRepositoryInterface, presenter: HistoryPresenterInterface, rules: Optional[RuleSet] = None, rule_repository: Optional[RuleRepositoryInterface] = None) -> HistoryUseCaseFacade:
+        rules = rules if rules is not None else RuleSet()
+        return HistoryUseCaseFacade(ImportTransactionsUseCase(history, importer, presenter, rules=rules),
                                     ReviewTransactionsUseCase(history, presenter),
                                     UpdateTransactionUseCase(history, presenter),
                                     IgnoreTransactionUseCase(history, presenter),
                                     DeleteTransactionUseCase(history, presenter),
                                     ListTransactionsUseCase(history, presenter),
                                     SaveHistoryUseCase(history, repository, presenter),
-                                    LoadHistoryUseCase(history, repository, presenter))
+                                    LoadHistoryUseCase(history, repository, presenter),
+                                    ListTransactionsBetweenUseCase(history, presenter),
+                                    SearchTransactionsUseCase(history, presenter),
+                                    AddRuleUseCase(rules, presenter),
+                                    ListRulesUseCase(rules, presenter),
+                                    SaveRulesUseCase(rules, rule_repository, presenter),
+                                    LoadRulesUseCase(rules, rule_repository, presenter),
+                                    SuggestCategoriesUseCase(history, presenter),
+                                    ReviewClustersUseCase(history, presenter),
+                                    BulkUpdateTransactionsUseCase(history, presenter),
+                                    QueryTransactionsUseCase(history, presenter))
 
 
 @dataclass
@@ -84,8 +107,7 @@ class ReportUseCaseFacadeFactory:
 
     @classmethod
     def create_facade(cls, history: History, budget: Budget, presenter: ReportPresenterInterface) -> ReportUseCaseFacade:
-        category_report = CategoryReportUseCase(budget, history, presenter)
-        return ReportUseCaseFacade(category_report,
-                                   AllCategoryReportUseCase(budget, category_report),
+        return ReportUseCaseFacade(CategoryReportUseCase(budget, history, presenter),
+                                   AllCategoryReportUseCase(budget, history, presenter),
                                    MonthResultUseCase(budget, history, presenter))
     
\ No newline at end of file
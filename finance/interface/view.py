@@ -107,6 +107,34 @@ class TransactionViewModel:
         }
     
 
+@dataclass
+class RuleViewModel:
+    field: str
+    pattern: str
+    category: str
+    tag: str
+    ignore: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Self:
+        return cls(
+            field=data['field'],
+            pattern=data['pattern'],
+            category=data['category'],
+            tag=data['tag'],
+            ignore=str(data['ignore']),
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            'field': self.field,
+            'pattern': self.pattern,
+            'category': self.category,
+            'tag': self.tag,
+            'ignore': self.ignore,
+        }
+
+
 @dataclass
 class HistoryErrorViewModel:
     command: str
@@ -123,6 +151,9 @@ class HistoryViewInterface(Protocol):
 
     def show_message(self, message: str) -> None:
         ...
+
+    def show_table(self, command: str, data: TableViewModel) -> None:
+        ...
     
     def show_failure(self, error: HistoryErrorViewModel) -> None:
         ...
@@ -1,23 +1,32 @@
+import argparse
 import sys
 sys.path.append('/Users/matheus/projects/finance')
 
+from finance.domain.columnar import ColumnarHistory
 from finance.domain.finance import Finance
 from finance.domain.transaction import History
 from finance.domain.budget import Budget
-from finance.infrastructure.factory import CmdComponentFactory
+from finance.infrastructure.factory import BACKENDS, CmdComponentFactory
+from finance.infrastructure.instrumentation import Instrumentation
 from finance.infrastructure.ui import FinanceCmd
-from finance.infrastructure.repository import CsvBudgetRepository, CsvHistoryRepository
 
 
 if __name__ == '__main__':
-    finance = Finance(Budget(), History())
-    budget_repository = CsvBudgetRepository()
-    history_repository = CsvHistoryRepository()
-    factory = CmdComponentFactory()
+    parser = argparse.ArgumentParser(prog='python -m finance.main')
+    parser.add_argument('--backend', choices=BACKENDS, default='csv', help='storage used for the budget and the history; only sqlite reads just the requested period on filtered loads')
+    parser.add_argument('--columnar', action='store_true', help='keep the history in column arrays to reduce memory')
+    parser.add_argument('--workers', type=int, default=1, help='processes that parse one large statement or history file in byte ranges')
+    parser.add_argument('--stats', action='store_true', help='record call statistics of the components')
+    args = parser.parse_args()
+
+    finance = Finance(Budget(), ColumnarHistory() if args.columnar else History())
+    instrumentation = Instrumentation() if args.stats else None
+    factory = CmdComponentFactory(instrumentation, args.workers)
+    budget_repository, history_repository = factory.get_repositories(args.backend)
     budget_controller = factory.get_budget_controller(finance.budget, budget_repository)
-    history_controller = factory.get_history_controller(finance.history, history_repository)
+    history_controller = factory.get_history_controller(finance.history, history_repository, finance.rules)
     report_controller = factory.get_report_controller(finance.history, finance.budget)
 
     # Create and run the CLI
-    cli = FinanceCmd(budget_controller, history_controller, report_controller)
+    cli = FinanceCmd(budget_controller, history_controller, report_controller, instrumentation)
     cli.cmdloop()
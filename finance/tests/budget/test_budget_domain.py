@@ -22,6 +22,11 @@ class TestBudgetItem(unittest.TestCase):
         self.assertEqual(budget_item.category, category)
         self.assertEqual(budget_item.note, note)
 
+    def test_budget_item_is_slotted(self) -> None:
+        budget_item = BudgetItem(identifier=uuid4(), name='name', amount=100.0, category=BudgetCategory.Needs, note='note')
+
+        self.assertFalse(hasattr(budget_item, '__dict__'))
+
     def test_budget_item_different_fields_is_not_equal(self):
         identifier1 = uuid4()
         identifier2 = uuid4()
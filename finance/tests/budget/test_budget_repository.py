@@ -1,14 +1,16 @@
+import os
+from tempfile import TemporaryDirectory
 import unittest
 from unittest.mock import MagicMock, call, mock_open, patch
 
 from finance.application.dto import BudgetItemDto
-from finance.infrastructure.repository import CsvBudgetRepository
+from finance.infrastructure.repository import CsvBudgetRepository, SqliteBudgetRepository
 
 
 class TestCsvBudgetRepository(unittest.TestCase):
 
     def setUp(self) -> None:
-        self.repository = CsvBudgetRepository()
+        self.repository = CsvBudgetRepository(snapshots=False)
 
     @patch("builtins.open", new_callable=mock_open)
     @patch("csv.writer")
@@ -49,6 +51,56 @@ class TestCsvBudgetRepository(unittest.TestCase):
         self.assertEqual(items[1].category, 'category2')
         self.assertEqual(items[1].note, 'note2')
 
+    def test_save_and_load_budget_with_snapshot(self) -> None:
+        item1 = BudgetItemDto('identifier1', 'name1', '1.00', 'category1', 'note1')
+        item2 = BudgetItemDto('identifier2', 'name2', '2.00', 'category2', 'note2')
+        with TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'budget.csv')
+            repository = CsvBudgetRepository()
+
+            repository.save_budget(filename, [item1, item2])
+            self.assertTrue(os.path.exists(os.path.join(directory, 'budget.snapshot')))
+            self.assertEqual([item1, item2], repository.load_budget(filename))
+
+            with open(filename, 'a') as csv_file:
+                csv_file.write('identifier3,name3,3.00,category3,note3\n')
+            self.assertEqual(['identifier1', 'identifier2', 'identifier3'], [item.identifier for item in repository.load_budget(filename)])
+            self.assertEqual(3, len(repository.load_budget(filename)))
+
+
+class TestSqliteBudgetRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'budget.csv')
+        self.repository = SqliteBudgetRepository()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_save_and_load_budget(self) -> None:
+        item1 = BudgetItemDto('identifier1', 'name1', '1.00', 'category1', 'note1')
+        item2 = BudgetItemDto('identifier2', 'name2', '2.00', 'category2', 'note2')
+
+        self.repository.save_budget(self.filename, [item1, item2])
+        items = SqliteBudgetRepository().load_budget(self.filename)
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'budget.sqlite')))
+        self.assertEqual([item1, item2], items)
+
+    def test_save_budget_removes_deleted_items(self) -> None:
+        item1 = BudgetItemDto('identifier1', 'name1', '1.00', 'category1', 'note1')
+        item2 = BudgetItemDto('identifier2', 'name2', '2.00', 'category2', 'note2')
+        self.repository.save_budget(self.filename, [item1, item2])
+
+        self.repository.save_budget(self.filename, [item2])
+
+        self.assertEqual([item2], self.repository.load_budget(self.filename))
+
+    def test_load_missing_budget_raises_exception(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            self.repository.load_budget(self.filename)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+from dataclasses import FrozenInstanceError
+from datetime import date
+import unittest
+
+from finance.domain.budget import BudgetCategory
+from finance.domain.report import CategoryMonthTotals, CategoryReport, MonthResult
+from finance.domain.transaction import Transaction
+
+
+class TestMonthResult(unittest.TestCase):
+
+    def setUp(self):
+        self.categories = {
+            BudgetCategory.Empty: [],
+            BudgetCategory.Income: ['salary', 'bonus'],
+            BudgetCategory.Needs: ['rent', 'groceries'],
+            BudgetCategory.Wants: ['eatingout'],
+            BudgetCategory.Savings: ['etf'],
+        }
+        self.transactions = [
+            Transaction('ref1', date(2024, 8, 1), 'source1', 3000.0, 'notes1', 'salary', 8, '', '', False),
+            Transaction('ref2', date(2024, 8, 2), 'source2', -1000.0, 'notes2', 'rent', 8, '', '', False),
+            Transaction('ref3', date(2024, 8, 3), 'source3', -50.25, 'notes3', 'groceries', 8, 'lidl', '', False),
+            Transaction('ref4', date(2024, 8, 4), 'source4', -20.75, 'notes4', 'groceries', 8, 'hofer', '', False),
+            Transaction('ref5', date(2024, 8, 5), 'source5', -30.0, 'notes5', 'eatingout', 8, '', '', False),
+            Transaction('ref6', date(2024, 8, 6), 'source6', -500.0, 'notes6', 'etf', 8, '', '', False),
+            Transaction('ref7', date(2024, 8, 7), 'source7', -99.0, 'notes7', 'unknown', 8, '', '', False),
+        ]
+
+    def test_from_transactions(self):
+        report = MonthResult.from_transactions(8, self.transactions, self.categories)
+
+        self.assertEqual(8, report.month)
+        self.assertEqual(3000.0, report.incomes)
+        self.assertEqual(-1601.0, report.expenses)
+        self.assertEqual(1399.0, report.result)
+        self.assertEqual({'salary': 3000.0, 'bonus': 0.0}, report.income_details)
+        self.assertEqual({'rent': -1000.0, 'groceries': -71.0, 'eatingout': -30.0, 'etf': -500.0}, report.expense_details)
+        self.assertEqual({
+            BudgetCategory.Income: 3000.0,
+            BudgetCategory.Needs: -1071.0,
+            BudgetCategory.Wants: -30.0,
+            BudgetCategory.Savings: -500.0,
+        }, report.category_details)
+
+    def test_from_transactions_no_transactions(self):
+        report = MonthResult.from_transactions(8, [], self.categories)
+
+        self.assertEqual(0.0, report.incomes)
+        self.assertEqual(0.0, report.expenses)
+        self.assertEqual(0.0, report.result)
+        self.assertEqual({'salary': 0.0, 'bonus': 0.0}, report.income_details)
+
+    def test_month_result_is_frozen(self):
+        report = MonthResult.from_transactions(8, self.transactions, self.categories)
+
+        with self.assertRaises(FrozenInstanceError):
+            report.incomes = 0.0
+
+
+class TestCategoryReport(unittest.TestCase):
+
+    def setUp(self):
+        self.transactions = [
+            Transaction('ref1', date(2024, 1, 3), 'source1', -50.0, 'notes1', 'groceries', 1, '', '', False),
+            Transaction('ref2', date(2024, 1, 9), 'source2', -25.0, 'notes2', 'groceries', 1, '', '', False),
+            Transaction('ref3', date(2024, 2, 3), 'source3', -120.0, 'notes3', 'groceries', 2, '', '', False),
+            Transaction('ref4', date(2024, 2, 4), 'source4', -900.0, 'notes4', 'rent', 2, '', '', False),
+            Transaction('ref5', date(2024, 3, 4), 'source5', 10.0, 'notes5', 'groceries', 3, '', '', False),
+        ]
+
+    def test_category_month_totals(self):
+        totals = CategoryMonthTotals.from_transactions(self.transactions)
+
+        self.assertEqual({1: -75.0, 2: -120.0, 3: 10.0}, totals.get_monthly_totals('groceries'))
+        self.assertEqual({2: -900.0}, totals.get_monthly_totals('rent'))
+        self.assertEqual({}, totals.get_monthly_totals('etf'))
+
+    def test_from_transactions(self):
+        report = CategoryReport.from_transactions('groceries', 2, 1200.0, self.transactions)
+
+        self.assertEqual(100.0, report.budget_per_month)
+        self.assertEqual(-185.0, report.used)
+        self.assertEqual(-92.5, report.used_average)
+        self.assertEqual(1015.0, report.leftover)
+        self.assertEqual(101.5, report.leftover_average)
+        self.assertEqual({1: (-75.0, 25.0), 2: (-120.0, -20.0)}, report.monthly_distribution)
+
+    def test_get_used_per_month_without_transactions(self):
+        report = CategoryReport.from_transactions('groceries', 12, 1200.0, self.transactions)
+
+        self.assertEqual(0.0, report.get_used_per_month(4))
+        self.assertEqual(100.0, report.get_result_per_month(4))
+        self.assertEqual(0, report.leftover_average)
+
+
+if __name__ == '__main__':
+    unittest.main()
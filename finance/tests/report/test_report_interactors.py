@@ -0,0 +1,85 @@
+from datetime import date
+import unittest
+from unittest.mock import Mock
+from uuid import uuid4
+
+from finance.application.interface import ReportPresenterInterface
+from finance.application.report_interactor import AllCategoryReportUseCase, CategoryReportUseCase, MonthResultUseCase
+from finance.domain.budget import Budget, BudgetCategory, BudgetItem
+from finance.domain.transaction import History, Transaction
+
+
+class TestReportUseCases(unittest.TestCase):
+
+    def setUp(self):
+        self.budget = Budget()
+        self.budget.add_budget_item(BudgetItem(uuid4(), 'salary', 36000.0, BudgetCategory.Income, ''))
+        self.budget.add_budget_item(BudgetItem(uuid4(), 'groceries', 1200.0, BudgetCategory.Needs, ''))
+        self.budget.add_budget_item(BudgetItem(uuid4(), 'eatingout', 600.0, BudgetCategory.Wants, ''))
+        self.history = History()
+        self.history.add_transaction(Transaction('ref1', date(2024, 1, 1), 'source1', 3000.0, 'notes1', 'salary', 1, '', '', False))
+        self.history.add_transaction(Transaction('ref2', date(2024, 1, 3), 'source2', -50.0, 'notes2', 'groceries', 1, '', '', False))
+        self.history.add_transaction(Transaction('ref3', date(2024, 2, 3), 'source3', -70.0, 'notes3', 'groceries', 2, '', '', False))
+        self.history.add_transaction(Transaction('ref4', date(2024, 2, 5), 'source4', -30.0, 'notes4', 'eatingout', 2, '', '', False))
+        self.history.add_transaction(Transaction('ref5', date(2024, 2, 6), 'source5', -5.0, 'notes5', '', 2, '', '', False))
+        self.mock_presenter = Mock(spec=ReportPresenterInterface)
+
+    def test_month_result_use_case(self):
+        use_case = MonthResultUseCase(self.budget, self.history, self.mock_presenter)
+
+        use_case.execute(2)
+
+        report = self.mock_presenter.present_month_result.call_args.args[0].data
+        self.assertEqual(2, report.month)
+        self.assertEqual(0.0, report.incomes)
+        self.assertEqual(-100.0, report.expenses)
+        self.assertEqual({'groceries': -70.0, 'eatingout': -30.0}, report.expense_details)
+
+    def test_month_result_of_year_use_case(self):
+        self.history.add_transaction(Transaction('ref6', date(2023, 2, 3), 'source6', -200.0, 'notes6', 'groceries', 2, '', '', False))
+        use_case = MonthResultUseCase(self.budget, self.history, self.mock_presenter)
+
+        use_case.execute(2, 2024)
+        use_case.execute(2)
+
+        year_report, all_years_report = [args.args[0].data for args in self.mock_presenter.present_month_result.call_args_list]
+        self.assertEqual('2/2024', year_report.period)
+        self.assertEqual(-100.0, year_report.expenses)
+        self.assertEqual('2', all_years_report.period)
+        self.assertEqual(-300.0, all_years_report.expenses)
+
+    def test_category_report_of_year_use_case(self):
+        self.history.add_transaction(Transaction('ref6', date(2023, 2, 3), 'source6', -200.0, 'notes6', 'groceries', 2, '', '', False))
+        use_case = CategoryReportUseCase(self.budget, self.history, self.mock_presenter)
+
+        use_case.execute('groceries', 2, 2023)
+
+        report = self.mock_presenter.present_category_report.call_args.args[0].data
+        self.assertEqual({2: -200.0}, report.monthly_used)
+
+    def test_category_report_use_case(self):
+        use_case = CategoryReportUseCase(self.budget, self.history, self.mock_presenter)
+
+        use_case.execute('groceries', 2)
+
+        report = self.mock_presenter.present_category_report.call_args.args[0].data
+        self.assertEqual('groceries', report.category)
+        self.assertEqual(1200.0, report.budget)
+        self.assertEqual(-120.0, report.used)
+        self.assertEqual({1: -50.0, 2: -70.0}, report.monthly_used)
+
+    def test_all_category_report_matches_category_reports(self):
+        single_presenter = Mock(spec=ReportPresenterInterface)
+        single_use_case = CategoryReportUseCase(self.budget, self.history, single_presenter)
+        use_case = AllCategoryReportUseCase(self.budget, self.history, self.mock_presenter)
+
+        use_case.execute(12)
+        for item in self.budget.list_budget_items():
+            single_use_case.execute(item.name, 12)
+
+        self.assertEqual(3, self.mock_presenter.present_category_report.call_count)
+        self.assertEqual(single_presenter.present_category_report.call_args_list, self.mock_presenter.present_category_report.call_args_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
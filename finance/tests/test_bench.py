@@ -0,0 +1,38 @@
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from finance.bench.generator import ErsteStatementGenerator
+from finance.infrastructure.importer import ErsteBankCsvTransactionImporter
+from finance.infrastructure.repository import CsvBudgetRepository, CsvHistoryRepository
+
+
+class TestErsteStatementGenerator(unittest.TestCase):
+
+    def test_generate_rows_is_deterministic(self):
+        self.assertEqual(list(ErsteStatementGenerator(50).generate_rows()), list(ErsteStatementGenerator(50).generate_rows()))
+        self.assertNotEqual(list(ErsteStatementGenerator(50).generate_rows()), list(ErsteStatementGenerator(50, seed=7).generate_rows()))
+
+    def test_write_statement_is_importable(self):
+        with TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'statement.csv')
+            ErsteStatementGenerator(100).write_statement(filename)
+
+            transactions = list(ErsteBankCsvTransactionImporter().import_transactions(filename))
+
+        self.assertEqual(100, len(transactions))
+        self.assertEqual(100, len({transaction.reference for transaction in transactions}))
+
+    def test_write_project_is_loadable(self):
+        with TemporaryDirectory() as directory:
+            ErsteStatementGenerator(100).write_project(directory)
+
+            budget = CsvBudgetRepository().load_budget(os.path.join(directory, 'budget.csv'))
+            history = CsvHistoryRepository().load_history(os.path.join(directory, 'history.csv'))
+
+        self.assertEqual(9, len(budget))
+        self.assertEqual(100, len(history))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from finance.infrastructure.factory import CmdComponentFactory
+from finance.infrastructure.repository import CsvBudgetRepository, CsvHistoryRepository, SqliteBudgetRepository, SqliteHistoryRepository
+
+
+class TestCmdComponentFactory(unittest.TestCase):
+
+    def test_csv_repositories(self):
+        budget_repository, history_repository = CmdComponentFactory().get_repositories('csv')
+
+        self.assertIsInstance(budget_repository, CsvBudgetRepository)
+        self.assertIsInstance(history_repository, CsvHistoryRepository)
+
+    def test_csv_repositories_split_files_only_with_workers(self):
+        _, history_repository = CmdComponentFactory().get_repositories('csv')
+        _, parallel_history_repository = CmdComponentFactory(workers=4).get_repositories('csv')
+
+        self.assertEqual(1, history_repository.workers)
+        self.assertEqual(4, parallel_history_repository.workers)
+
+    def test_sqlite_repositories(self):
+        budget_repository, history_repository = CmdComponentFactory().get_repositories('sqlite')
+
+        self.assertIsInstance(budget_repository, SqliteBudgetRepository)
+        self.assertIsInstance(history_repository, SqliteHistoryRepository)
+
+    def test_unknown_backend_raises_exception(self):
+        with self.assertRaises(ValueError):
+            CmdComponentFactory().get_repositories('parquet')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+from io import StringIO
+import unittest
+from unittest.mock import Mock, patch
+
+from finance.application.dto import InteractorResultDto
+from finance.domain.budget import Budget
+from finance.domain.transaction import History
+from finance.infrastructure.factory import CmdComponentFactory
+from finance.infrastructure.instrumentation import Instrumentation, InstrumentedComponent
+from finance.infrastructure.ui import FinanceCmd
+from finance.interface.controller import BudgetControllerInterface, HistoryControllerInterface, ReportControllerInterface
+
+
+class Component:
+
+    def __init__(self) -> None:
+        self.value = 1
+
+    def execute(self, rows):
+        return rows
+
+    def fail(self):
+        raise ValueError('failed')
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+        self.component = self.instrumentation.instrument(Component())
+
+    def test_records_calls_and_rows(self):
+        self.component.execute([1, 2, 3])
+        self.component.execute(InteractorResultDto(True, 'operation', data={'imported': [1, 2], 'duplicated': [3]}))
+
+        stats = self.instrumentation.get_stats()['Component.execute']
+        self.assertEqual(2, stats.calls)
+        self.assertEqual(6, stats.rows)
+        self.assertGreater(stats.seconds, 0.0)
+
+    def test_records_failed_calls(self):
+        with self.assertRaises(ValueError):
+            self.component.fail()
+
+        self.assertEqual(1, self.instrumentation.get_stats()['Component.fail'].calls)
+
+    def test_attributes_pass_through(self):
+        self.component.value = 2
+
+        self.assertEqual(2, self.component.value)
+        self.assertEqual(2, self.component._component.value)
+
+    def test_reset(self):
+        self.component.execute([1])
+
+        self.instrumentation.reset()
+
+        self.assertEqual({}, self.instrumentation.get_stats())
+
+
+class TestCmdComponentFactoryInstrumentation(unittest.TestCase):
+
+    def test_disabled_components_are_not_wrapped(self):
+        controller = CmdComponentFactory().get_report_controller(History(), Budget())
+
+        self.assertNotIsInstance(controller.report_use_case_facade.month_report, InstrumentedComponent)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_enabled_components_are_recorded(self, _):
+        instrumentation = Instrumentation()
+        controller = CmdComponentFactory(instrumentation).get_report_controller(History(), Budget())
+
+        controller.get_report_by_month(8)
+
+        stats = instrumentation.get_stats()
+        self.assertEqual(1, stats['MonthResultUseCase.execute'].calls)
+        self.assertEqual(1, stats['CmdReportPresenter.present_month_result'].calls)
+        self.assertEqual(1, stats['CmdReportView.show_month_result'].calls)
+
+
+class TestFinanceCmdStats(unittest.TestCase):
+
+    def create_cmd(self, instrumentation):
+        return FinanceCmd(Mock(spec=BudgetControllerInterface), Mock(spec=HistoryControllerInterface), Mock(spec=ReportControllerInterface), instrumentation)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_stats_disabled(self, mock_stdout):
+        self.create_cmd(None).do_stats('')
+
+        self.assertIn('Instrumentation is disabled', mock_stdout.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_stats(self, mock_stdout):
+        instrumentation = Instrumentation()
+        instrumentation.instrument(Component()).execute([1, 2])
+
+        self.create_cmd(instrumentation).do_stats('')
+
+        self.assertIn('Component.execute', mock_stdout.getvalue())
+
+    def test_stats_reset(self):
+        instrumentation = Instrumentation()
+        instrumentation.instrument(Component()).execute([1, 2])
+
+        self.create_cmd(instrumentation).do_stats('reset')
+
+        self.assertEqual({}, instrumentation.get_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
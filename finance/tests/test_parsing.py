@@ -0,0 +1,44 @@
+from datetime import date
+import unittest
+
+from finance.domain.transaction import parse_day
+from finance.infrastructure.parsing import normalize_amount, parse_dotted_day, parse_statement_day
+
+
+class TestDayParsing(unittest.TestCase):
+
+    def test_parse_dotted_day(self):
+        self.assertEqual(date(2023, 2, 1), parse_dotted_day('01.02.2023'))
+        self.assertEqual(date(2023, 2, 1), parse_dotted_day('1.2.2023'))
+
+    def test_parse_dotted_day_rejects_invalid_day(self):
+        for text in ['31.02.2023', '2023-02-01', '01.02.20x3', '']:
+            with self.assertRaises(ValueError, msg=text):
+                parse_dotted_day(text)
+
+    def test_parse_statement_day_is_cached(self):
+        parse_statement_day.cache_clear()
+
+        self.assertEqual(('2023-12-24', '12'), parse_statement_day('24.12.2023'))
+        self.assertEqual(('2023-12-24', '12'), parse_statement_day('24.12.2023'))
+        self.assertEqual(1, parse_statement_day.cache_info().hits)
+
+    def test_parse_day_shares_dates(self):
+        self.assertEqual(date(2023, 12, 24), parse_day('2023-12-24'))
+        self.assertIs(parse_day('2023-12-24'), parse_day('2023-12-24'))
+
+
+class TestAmountNormalization(unittest.TestCase):
+
+    def test_normalize_amount(self):
+        self.assertEqual('1234.56', normalize_amount('1,234.56'))
+        self.assertEqual('-1234567.00', normalize_amount(' -1,234,567.00 '))
+        self.assertEqual('1234.56', normalize_amount('1\xa0234.56'))
+
+    def test_normalize_amount_with_decimal_comma(self):
+        self.assertEqual('1234.56', normalize_amount('1.234,56', thousands='.', decimal=','))
+        self.assertEqual('-0.5', normalize_amount('-0,5', thousands='.', decimal=','))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from finance.infrastructure.snapshot import get_snapshot, read_snapshot, write_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'history.csv')
+        self.journal = self.filename + '.journal'
+        self.rows = [(f'ref{index}', '2024-08-10', 'source', f'-{index}.5', f'notes "{index}"\nwith ünïcode', 'groceries' if index % 2 else '', '8') for index in range(100)]
+        with open(self.filename, 'w') as csv_file:
+            csv_file.write('content')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        write_snapshot(self.filename, [self.filename, self.journal], self.rows, 7)
+
+        self.assertEqual(os.path.join(self.directory.name, 'history.snapshot'), get_snapshot(self.filename))
+        self.assertEqual((self.rows, 0), read_snapshot(self.filename, [self.filename, self.journal], tuple))
+
+    def test_round_trip_empty(self):
+        write_snapshot(self.filename, [self.filename], [], 7)
+
+        self.assertEqual(([], 0), read_snapshot(self.filename, [self.filename], tuple))
+
+    def test_journal_offset(self):
+        with open(self.journal, 'w') as journal_file:
+            journal_file.write('D,ref1\n')
+        write_snapshot(self.filename, [self.filename], self.rows, 7, self.journal)
+
+        self.assertEqual((self.rows, 7), read_snapshot(self.filename, [self.filename], tuple, self.journal))
+        with open(self.journal, 'a') as journal_file:
+            journal_file.write('D,ref2\n')
+        self.assertEqual((self.rows, 7), read_snapshot(self.filename, [self.filename], tuple, self.journal))
+        os.remove(self.journal)
+        self.assertIsNone(read_snapshot(self.filename, [self.filename], tuple, self.journal))
+
+    def test_missing_snapshot(self):
+        self.assertIsNone(read_snapshot(self.filename, [self.filename], tuple))
+
+    def test_changed_source_invalidates_snapshot(self):
+        write_snapshot(self.filename, [self.filename, self.journal], self.rows, 7)
+        stat = os.stat(self.filename)
+
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertIsNone(read_snapshot(self.filename, [self.filename, self.journal], tuple))
+
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        with open(self.journal, 'w') as journal_file:
+            journal_file.write('D,ref1\n')
+        self.assertIsNone(read_snapshot(self.filename, [self.filename, self.journal], tuple))
+
+        os.remove(self.journal)
+        self.assertIsNotNone(read_snapshot(self.filename, [self.filename, self.journal], tuple))
+
+    def test_corrupt_snapshot(self):
+        write_snapshot(self.filename, [self.filename], self.rows, 7)
+        with open(get_snapshot(self.filename), 'rb') as file:
+            data = file.read()
+
+        for corrupt in [b'', data[:10], data[:-1], data + b'\0', b'X' + data[1:]]:
+            with open(get_snapshot(self.filename), 'wb') as file:
+                file.write(corrupt)
+            self.assertIsNone(read_snapshot(self.filename, [self.filename], tuple), corrupt[:20])
+
+    def test_values_with_separator_are_not_snapshotted(self):
+        write_snapshot(self.filename, [self.filename], self.rows, 7)
+
+        write_snapshot(self.filename, [self.filename], [('ref1', 'notes\0')], 2)
+
+        self.assertFalse(os.path.exists(get_snapshot(self.filename)))
+        self.assertIsNone(read_snapshot(self.filename, [self.filename], tuple))
+
+
+if __name__ == '__main__':
+    unittest.main()
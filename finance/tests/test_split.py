@@ -0,0 +1,43 @@
+import csv
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from finance.infrastructure.split import find_record_ranges, read_csv_range
+
+
+class TestRecordRanges(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'history.csv')
+        self.rows = [[f'ref{index}', f'notes "{index}"\nwith a line break' if index % 3 == 0 else f'notes {index}', f'{index}.50'] for index in range(200)]
+        with open(self.filename, 'w', newline='') as csv_file:
+            csv.writer(csv_file).writerows(self.rows)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_ranges_cover_file_at_record_boundaries(self):
+        for parts in [1, 2, 3, 7, 50, 1000]:
+            ranges = find_record_ranges(self.filename, parts)
+
+            self.assertEqual(0, ranges[0][0])
+            self.assertEqual(os.path.getsize(self.filename), ranges[-1][1])
+            self.assertTrue(all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:])))
+            self.assertEqual(self.rows, [row for start, end in ranges for row in read_csv_range(self.filename, start, end)], parts)
+
+    def test_ranges_skip_header(self):
+        header = len('ref0,')
+        ranges = find_record_ranges(self.filename, 4, start=header)
+
+        self.assertEqual(header, ranges[0][0])
+
+    def test_ranges_of_empty_file(self):
+        open(self.filename, 'w').close()
+
+        self.assertEqual([], find_record_ranges(self.filename, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
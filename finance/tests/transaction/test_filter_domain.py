@@ -0,0 +1,37 @@
+from datetime import date
+import unittest
+
+from finance.domain.exception import FilterInvalidException
+from finance.domain.filter import TransactionFilter
+from finance.domain.transaction import Transaction
+
+
+class TestTransactionFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.transaction = Transaction('ref1', date(2024, 8, 10), 'BILLA DANKT', -30.15, 'POS 1234 BILLA 0450', 'groceries', 8, 'lidl', '', False)
+
+    def test_matches_conditions(self):
+        self.assertTrue(TransactionFilter.parse('source~billa and month=8')(self.transaction))
+        self.assertTrue(TransactionFilter.parse('amount<-10 and day>=2024-08-01 and ignore=false')(self.transaction))
+        self.assertTrue(TransactionFilter.parse('notes~"pos 1234" and category!=eatingout')(self.transaction))
+        self.assertFalse(TransactionFilter.parse('source~billa and year=2023')(self.transaction))
+
+    def test_matches_in_conditions(self):
+        self.assertTrue(TransactionFilter.parse('month in 7..9 and day in 2024-08-01..2024-08-31')(self.transaction))
+        self.assertTrue(TransactionFilter.parse('category in groceries,eatingout')(self.transaction))
+        self.assertFalse(TransactionFilter.parse('month in 1,2,3')(self.transaction))
+
+    def test_matches_text(self):
+        self.assertTrue(TransactionFilter.parse('text~"billa 1234"')(self.transaction))
+        self.assertTrue(TransactionFilter.parse('text~dank*')(self.transaction))
+        self.assertFalse(TransactionFilter.parse('text~dank')(self.transaction))
+
+    def test_parse_invalid_filter(self):
+        for text in ['', 'source~billa and', 'source~billa or month=8', 'amount', 'sauce=billa', 'month=august', 'amount~10', 'notes~"pos', 'text=billa', 'month in 1..x', 'month in']:
+            with self.assertRaises(FilterInvalidException, msg=text):
+                TransactionFilter.parse(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+from datetime import date
+import unittest
+
+from finance.domain.columnar import ColumnarHistory
+from finance.domain.exception import QueryInvalidException
+from finance.domain.filter import TransactionFilter
+from finance.domain.query import Query
+from finance.domain.transaction import History, Transaction
+
+
+class TestQuery(unittest.TestCase):
+
+    def create_history(self) -> History:
+        return History()
+
+    def setUp(self):
+        self.history = self.create_history()
+        self.history.add_transaction(Transaction('ref1', date(2024, 1, 5), 'BILLA DANKT', -10.0, 'POS 1234 BILLA', 'food', 1, 'billa', '', False))
+        self.history.add_transaction(Transaction('ref2', date(2024, 2, 5), 'SPAR DANKT', -20.0, 'POS 1234 SPAR', 'food', 2, 'spar', '', False))
+        self.history.add_transaction(Transaction('ref3', date(2024, 3, 5), 'BILLA DANKT', -5.5, 'POS 5678 BILLA', 'food', 3, 'billa', '', False))
+        self.history.add_transaction(Transaction('ref4', date(2024, 4, 5), 'OMV', -50.0, 'POS 5678 OMV', 'car', 4, '', '', False))
+        self.history.add_transaction(Transaction('ref5', date(2023, 4, 5), 'BILLA DANKT', -7.0, 'POS 9012 BILLA', 'food', 4, 'billa', '', False))
+
+    def execute(self, text: str):
+        return Query.parse(text).execute(self.history)
+
+    def test_group_by_with_aggregate_and_order(self):
+        result = self.execute('where category=food and month in 1..3 group by tag sum amount order by sum desc')
+
+        self.assertEqual('category index food', result.plan)
+        self.assertEqual(['tag', 'sum(amount)'], result.fields)
+        self.assertEqual([['billa', -15.5], ['spar', -20.0]], result.rows)
+
+    def test_planner_uses_indexes(self):
+        self.assertEqual('reference lookup ref2', self.execute('where reference=ref2 and category=food').plan)
+        self.assertEqual('text index "billa"', self.execute('where text~billa and category=food').plan)
+        self.assertEqual('month index 2024-04', self.execute('where month=4 and year=2024').plan)
+        self.assertEqual('day index 2024-02-01..2024-03-31', self.execute('where day>=2024-02-01 and day<2024-04-01').plan)
+        self.assertEqual('month index 1,2', self.execute('where month in 1..2').plan)
+        self.assertEqual('full scan', self.execute('where amount<-10').plan)
+
+    def test_planner_result_matches_full_scan(self):
+        for conditions in ['month=4 and year=2024', 'day>2024-01-05 and day<=2024-03-05', 'month in 4,1', 'text~"pos 5678"', 'category=food and source~spar']:
+            matches = TransactionFilter.parse(conditions)
+            scanned = sorted(transaction.reference for transaction in self.history.list_transactions() if matches(transaction))
+
+            planned = self.execute(f'where {conditions} order by reference')
+
+            self.assertNotEqual('full scan', planned.plan)
+            self.assertEqual(scanned, [row[0] for row in planned.rows], conditions)
+
+    def test_text_condition_without_terms_matches_like_filter(self):
+        for conditions in ['text~""', 'text~"*"', 'text~" - "']:
+            matches = TransactionFilter.parse(conditions)
+            scanned = sorted(transaction.reference for transaction in self.history.list_transactions() if matches(transaction))
+
+            planned = self.execute(f'where {conditions} order by reference')
+
+            self.assertEqual('full scan', planned.plan)
+            self.assertEqual(scanned, [row[0] for row in planned.rows], conditions)
+            self.assertEqual(5, len(planned.rows))
+
+    def test_sum_and_avg_of_numeric_fields(self):
+        result = self.execute('where category=food sum month avg year')
+
+        self.assertEqual([[10, 2023.75]], result.rows)
+
+    def test_list_transactions(self):
+        result = self.execute('where source~billa order by day desc limit 2')
+
+        self.assertEqual(['reference', 'day', 'source', 'amount', 'notes', 'category', 'month', 'tag', 'comments', 'ignore'], result.fields)
+        self.assertEqual(['ref3', 'ref1'], [row[0] for row in result.rows])
+
+    def test_aggregates_without_group(self):
+        result = self.execute('where text~billa count sum amount avg amount min amount max day')
+
+        self.assertEqual(['count', 'sum(amount)', 'avg(amount)', 'min(amount)', 'max(day)'], result.fields)
+        self.assertEqual([[3, -22.5, -7.5, -10.0, date(2024, 3, 5)]], result.rows)
+
+    def test_group_by_counts_by_default(self):
+        result = self.execute('group by year')
+
+        self.assertEqual([[2023, 1], [2024, 4]], result.rows)
+
+    def test_invalid_query(self):
+        for text in ['where', 'where amount', 'group category', 'group by', 'sum', 'sum text', 'sum category', 'avg source', 'sum day', 'order by amount up', 'limit ten', 'select amount', 'where month=1 where month=2']:
+            with self.assertRaises(QueryInvalidException, msg=text):
+                self.execute(text)
+
+    def test_order_by_unknown_column(self):
+        with self.assertRaises(QueryInvalidException):
+            self.execute('group by tag order by amount')
+
+
+class TestColumnarQuery(TestQuery):
+
+    def create_history(self) -> History:
+        return ColumnarHistory()
+
+
+if __name__ == '__main__':
+    unittest.main()
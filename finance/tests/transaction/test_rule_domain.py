@@ -0,0 +1,96 @@
+from datetime import date
+import unittest
+
+from finance.domain.exception import RuleInvalidException
+from finance.domain.rule import CategorizationRule, RuleField, RuleSet
+from finance.domain.transaction import Transaction
+
+
+class TestRuleSet(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = RuleSet()
+        self.rules.add_rule(CategorizationRule(RuleField.Source, 'billa|spar', 'groceries'))
+        self.rules.add_rule(CategorizationRule(RuleField.Notes, r'netflix\.com', 'subscriptions', 'streaming'))
+        self.rules.add_rule(CategorizationRule(RuleField.Source, 'amazon', 'shopping'))
+
+    def test_match_is_case_insensitive(self):
+        self.assertEqual('groceries', self.rules.match('BILLA DANKT', '').category)
+        self.assertEqual('shopping', self.rules.match('Amazon EU SARL', '').category)
+
+    def test_match_uses_rule_field(self):
+        self.assertIsNone(self.rules.match('NETFLIX.COM', 'POS 1234 Billa'))
+        self.assertEqual('subscriptions', self.rules.match('', 'POS 1234 NETFLIX.COM').category)
+
+    def test_match_prefers_first_rule(self):
+        self.assertEqual('groceries', self.rules.match('AMAZON BILLA', '').category)
+        self.assertEqual('subscriptions', self.rules.match('AMAZON', 'NETFLIX.COM').category)
+
+    def test_match_without_rules(self):
+        self.assertIsNone(RuleSet().match('BILLA', 'notes'))
+
+    def test_categorize_transaction(self):
+        transaction = Transaction('ref1', date(2024, 8, 10), 'SOURCE', -12.99, 'POS 1234 NETFLIX.COM', '', 8, '', '', False)
+
+        self.assertTrue(self.rules.categorize(transaction))
+
+        self.assertEqual('subscriptions', transaction.category)
+        self.assertEqual('streaming', transaction.tag)
+
+    def test_categorize_keeps_existing_category(self):
+        transaction = Transaction('ref1', date(2024, 8, 10), 'BILLA', -12.99, 'notes', 'eatingout', 8, '', '', False)
+
+        self.assertFalse(self.rules.categorize(transaction))
+
+        self.assertEqual('eatingout', transaction.category)
+
+    def test_add_rule_with_invalid_pattern(self):
+        with self.assertRaises(RuleInvalidException):
+            self.rules.add_rule(CategorizationRule(RuleField.Source, 'billa(', 'groceries'))
+
+        self.assertEqual(3, len(self.rules.list_rules()))
+
+    def test_add_rule_with_groups_and_flags(self):
+        for pattern in ['(?i)merkur', r'(?P<shop>hofer)', r'(o)\1', r'(a)(b)\2', r'(a)(?(1)b)']:
+            self.rules.add_rule(CategorizationRule(RuleField.Source, pattern, pattern))
+
+        self.assertEqual('(?i)merkur', self.rules.match('MERKUR', '').category)
+        self.assertEqual('(?P<shop>hofer)', self.rules.match('HOFER', '').category)
+        self.assertEqual(r'(o)\1', self.rules.match('FOOD', '').category)
+        self.assertEqual(r'(a)(b)\2', self.rules.match('ABB', '').category)
+        self.assertEqual(r'(a)(?(1)b)', self.rules.match('AB', '').category)
+
+    def test_match_prefers_first_rule_across_literals_and_patterns(self):
+        rules = RuleSet()
+        rules.rules = [
+            CategorizationRule(RuleField.Notes, 'wien energie', 'utilities'),
+            CategorizationRule(RuleField.Notes, r'pos \d+ billa', 'groceries'),
+            CategorizationRule(RuleField.Notes, 'billa', 'shopping'),
+            CategorizationRule(RuleField.Notes, r'a1\ telekom', 'phone'),
+            CategorizationRule(RuleField.Notes, 'nergie', 'energy'),
+        ]
+
+        self.assertEqual('groceries', rules.match('', 'POS 1234 BILLA WIEN').category)
+        self.assertEqual('shopping', rules.match('', 'BILLA DANKT').category)
+        self.assertEqual('utilities', rules.match('', 'POS 1234 BILLA WIEN ENERGIE').category)
+        self.assertEqual('phone', rules.match('', 'A1 Telekom Austria').category)
+        self.assertEqual('energy', rules.match('', 'ENERGIE STEIERMARK').category)
+        self.assertIsNone(rules.match('', 'wien'))
+
+    def test_set_rules_with_invalid_pattern_keeps_rules(self):
+        with self.assertRaises(RuleInvalidException):
+            self.rules.rules = [CategorizationRule(RuleField.Source, 'omv', 'car'), CategorizationRule(RuleField.Notes, 'spar(', 'groceries')]
+
+        self.assertEqual(3, len(self.rules.list_rules()))
+        self.assertIsNone(self.rules.match('OMV', ''))
+
+    def test_add_rule_invalidates_matches(self):
+        self.assertIsNone(self.rules.match('OMV', ''))
+
+        self.rules.add_rule(CategorizationRule(RuleField.Source, 'omv', 'car'))
+
+        self.assertEqual('car', self.rules.match('OMV', '').category)
+
+
+if __name__ == '__main__':
+    unittest.main()
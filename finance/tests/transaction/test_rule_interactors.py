@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import Mock
+
+from finance.application.dto import CategorizationRuleDto, InteractorResultDto, TransactionDto
+from finance.application.interface import HistoryPresenterInterface, RuleRepositoryInterface, TransactionImporterInterface
+from finance.application.rule_interactor import AddRuleUseCase, ListRulesUseCase, LoadRulesUseCase, SaveRulesUseCase
+from finance.application.transaction_interactor import ImportTransactionsUseCase
+from finance.domain.rule import CategorizationRule, RuleField, RuleSet
+from finance.domain.transaction import History
+
+
+class TestRuleUseCases(unittest.TestCase):
+
+    def setUp(self):
+        self.rules = RuleSet()
+        self.mock_presenter = Mock(spec=HistoryPresenterInterface)
+        self.mock_repository = Mock(spec=RuleRepositoryInterface)
+
+    def test_add_rule_use_case(self):
+        use_case = AddRuleUseCase(self.rules, self.mock_presenter)
+
+        use_case.execute('source', 'billa', 'groceries')
+
+        rule = CategorizationRule(RuleField.Source, 'billa', 'groceries')
+        self.assertEqual([rule], self.rules.list_rules())
+        result = InteractorResultDto(success=True, operation='Add Rule', data=[rule.to_dict()])
+        self.mock_presenter.present_rules.assert_called_once_with(result)
+
+    def test_add_rule_with_invalid_field_returns_error(self):
+        use_case = AddRuleUseCase(self.rules, self.mock_presenter)
+
+        use_case.execute('amount', 'billa', 'groceries')
+
+        self.assertEqual([], self.rules.list_rules())
+        result = self.mock_presenter.present_rules.call_args.args[0]
+        self.assertFalse(result.success)
+
+    def test_add_rule_with_invalid_pattern_returns_error(self):
+        use_case = AddRuleUseCase(self.rules, self.mock_presenter)
+
+        use_case.execute('notes', '[billa', 'groceries')
+
+        self.assertEqual([], self.rules.list_rules())
+        result = self.mock_presenter.present_rules.call_args.args[0]
+        self.assertFalse(result.success)
+
+    def test_add_rule_with_inline_flag(self):
+        use_case = AddRuleUseCase(self.rules, self.mock_presenter)
+
+        use_case.execute('source', '(?s)spar', 'groceries')
+        use_case.execute('source', 'billa', 'groceries')
+
+        self.assertEqual(['(?s)spar', 'billa'], [rule.pattern for rule in self.rules.list_rules()])
+        self.assertEqual([True, True], [call.args[0].success for call in self.mock_presenter.present_rules.call_args_list])
+
+    def test_list_rules_use_case(self):
+        rule = self.rules.add_rule(CategorizationRule(RuleField.Notes, 'netflix', 'subscriptions', 'streaming'))
+        use_case = ListRulesUseCase(self.rules, self.mock_presenter)
+
+        use_case.execute()
+
+        result = InteractorResultDto(success=True, operation='List Rules', data=[rule.to_dict()])
+        self.mock_presenter.present_rules.assert_called_once_with(result)
+
+    def test_save_rules_use_case(self):
+        self.rules.add_rule(CategorizationRule(RuleField.Source, 'billa', 'groceries', '', True))
+        use_case = SaveRulesUseCase(self.rules, self.mock_repository, self.mock_presenter)
+
+        use_case.execute('project')
+
+        self.mock_repository.save_rules.assert_called_once_with('project/rules.csv', [CategorizationRuleDto('source', 'billa', 'groceries', '', 'True')])
+
+    def test_load_rules_use_case(self):
+        self.mock_repository.load_rules.return_value = [CategorizationRuleDto('source', 'billa', 'groceries', '', 'True')]
+        use_case = LoadRulesUseCase(self.rules, self.mock_repository, self.mock_presenter)
+
+        use_case.execute('project')
+
+        self.mock_repository.load_rules.assert_called_once_with('project/rules.csv')
+        self.assertEqual([CategorizationRule(RuleField.Source, 'billa', 'groceries', '', True)], self.rules.list_rules())
+
+    def test_load_rules_non_existing_file_returns_error(self):
+        self.mock_repository.load_rules.side_effect = FileNotFoundError('No such file')
+        use_case = LoadRulesUseCase(self.rules, self.mock_repository, self.mock_presenter)
+
+        use_case.execute('project')
+
+        self.mock_presenter.present_failure.assert_called_once()
+
+    def test_import_transactions_applies_rules(self):
+        history = History()
+        mock_importer = Mock(spec=TransactionImporterInterface)
+        mock_importer.import_transactions.return_value = [
+            TransactionDto('ref1', '2024-08-10', 'BILLA DANKT', '-10.33', 'POS 1234', '', '8', '', '', 'False'),
+            TransactionDto('ref2', '2024-08-11', 'BILLA DANKT', '-5.10', 'POS 5678', 'eatingout', '8', '', '', 'False'),
+            TransactionDto('ref3', '2024-08-12', 'OMV', '-50.00', 'POS 9012', '', '8', '', '', 'False'),
+        ]
+        self.rules.add_rule(CategorizationRule(RuleField.Source, 'billa', 'groceries', 'supermarket'))
+        use_case = ImportTransactionsUseCase(history, mock_importer, self.mock_presenter, rules=self.rules)
+
+        use_case.execute('filename')
+
+        self.assertEqual('groceries', history.get_transaction('ref1').category)
+        self.assertEqual('supermarket', history.get_transaction('ref1').tag)
+        self.assertEqual('eatingout', history.get_transaction('ref2').category)
+        self.assertEqual('', history.get_transaction('ref3').category)
+
+    def test_import_transactions_categorizes_only_new_transactions(self):
+        history = History()
+        mock_importer = Mock(spec=TransactionImporterInterface)
+        mock_importer.import_transactions.return_value = [TransactionDto('ref1', '2024-08-10', 'BILLA DANKT', '-10.33', 'POS 1234', '', '8', '', '', 'False')] * 2
+        mock_rules = Mock(wraps=self.rules)
+        use_case = ImportTransactionsUseCase(history, mock_importer, self.mock_presenter, rules=mock_rules)
+
+        use_case.execute('filename')
+        use_case.execute('filename')
+
+        self.assertEqual(1, mock_rules.categorize.call_count)
+        self.assertEqual(1, len(history.items))
+
+
+if __name__ == '__main__':
+    unittest.main()
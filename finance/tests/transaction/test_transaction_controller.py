@@ -1,9 +1,12 @@
+from datetime import date
 import unittest
 from unittest.mock import Mock
 from uuid import uuid4
 
+from finance.application.dto import TransactionDto
 from finance.application.interface import HistoryPresenterInterface, InputReaderInterface
-from finance.application.transaction_interactor import IgnoreTransactionUseCase, ImportTransactionsUseCase, ListTransactionsUseCase, UpdateTransactionUseCase
+from finance.application.rule_interactor import AddRuleUseCase, ListRulesUseCase, LoadRulesUseCase, SaveRulesUseCase
+from finance.application.transaction_interactor import BulkUpdateTransactionsUseCase, DeleteTransactionUseCase, IgnoreTransactionUseCase, ImportTransactionsUseCase, ListTransactionsBetweenUseCase, ListTransactionsUseCase, LoadHistoryUseCase, QueryTransactionsUseCase, ReviewClustersUseCase, ReviewTransactionsUseCase, SearchTransactionsUseCase, SuggestCategoriesUseCase, UpdateTransactionUseCase
 from finance.infrastructure.controller import CmdHistoryController
 from finance.interface.facade import HistoryUseCaseFacade
 
@@ -15,6 +18,19 @@ class TestCmdBudgetController(unittest.TestCase):
         self.mock_facade.update_use_case = Mock(spec=UpdateTransactionUseCase)
         self.mock_facade.ignore_use_case = Mock(spec=IgnoreTransactionUseCase)
         self.mock_facade.list_use_case = Mock(spec=ListTransactionsUseCase)
+        self.mock_facade.list_between_use_case = Mock(spec=ListTransactionsBetweenUseCase)
+        self.mock_facade.search_use_case = Mock(spec=SearchTransactionsUseCase)
+        self.mock_facade.add_rule_use_case = Mock(spec=AddRuleUseCase)
+        self.mock_facade.list_rules_use_case = Mock(spec=ListRulesUseCase)
+        self.mock_facade.save_rules_use_case = Mock(spec=SaveRulesUseCase)
+        self.mock_facade.load_rules_use_case = Mock(spec=LoadRulesUseCase)
+        self.mock_facade.review_use_case = Mock(spec=ReviewTransactionsUseCase)
+        self.mock_facade.suggest_use_case = Mock(spec=SuggestCategoriesUseCase)
+        self.mock_facade.delete_use_case = Mock(spec=DeleteTransactionUseCase)
+        self.mock_facade.review_clusters_use_case = Mock(spec=ReviewClustersUseCase)
+        self.mock_facade.bulk_update_use_case = Mock(spec=BulkUpdateTransactionsUseCase)
+        self.mock_facade.query_use_case = Mock(spec=QueryTransactionsUseCase)
+        self.mock_facade.load_use_case = Mock(spec=LoadHistoryUseCase)
         self.mock_reader = Mock(spec=InputReaderInterface)
         self.mock_presenter = Mock(spec=HistoryPresenterInterface)
         self.controller = CmdHistoryController(self.mock_facade, self.mock_reader, self.mock_presenter)
@@ -84,7 +100,92 @@ class TestCmdBudgetController(unittest.TestCase):
 
         self.controller.list_transactions(month)
 
-        self.mock_facade.list_use_case.execute.assert_called_once_with(month)
+        self.mock_facade.list_use_case.execute.assert_called_once_with(month, None)
+
+    def test_list_transaction_of_year(self):
+        self.controller.list_transactions(8, 2024)
+
+        self.mock_facade.list_use_case.execute.assert_called_once_with(8, 2024)
+
+    def test_list_transactions_between(self):
+        start, end = date(2024, 8, 1), date(2024, 8, 31)
+
+        self.controller.list_transactions_between(start, end)
+
+        self.mock_facade.list_between_use_case.execute.assert_called_once_with(start, end)
+
+    def test_search_transactions(self):
+        self.controller.search_transactions('amazon gift')
+
+        self.mock_facade.search_use_case.execute.assert_called_once_with('amazon gift')
+
+    def test_add_rule(self):
+        self.controller.add_rule('source', 'billa', 'groceries', 'supermarket', False)
+
+        self.mock_facade.add_rule_use_case.execute.assert_called_once_with('source', 'billa', 'groceries', 'supermarket', False)
+
+    def test_list_rules(self):
+        self.controller.list_rules()
+
+        self.mock_facade.list_rules_use_case.execute.assert_called_once_with()
+
+    def test_save_and_load_rules(self):
+        self.controller.save_rules('project')
+        self.controller.load_rules('project')
+
+        self.mock_facade.save_rules_use_case.execute.assert_called_once_with('project')
+        self.mock_facade.load_rules_use_case.execute.assert_called_once_with('project')
+
+    def test_load_period(self):
+        self.controller.load_budget('project', month=8, year=2024)
+
+        self.mock_facade.load_use_case.execute.assert_called_once_with('project', month=8, category=None, year=2024)
+
+    def test_review_transactions_accepts_suggestion(self):
+        transaction = TransactionDto('ref1', '2024-08-10', 'BILLA DANKT', '-10.33', 'POS 1234 BILLA', '', '8', '', '', 'False')
+        self.mock_facade.review_use_case.execute.return_value = [transaction]
+        self.mock_facade.suggest_use_case.execute.return_value = ['groceries', 'eatingout']
+        self.mock_reader.get_input.side_effect = ['N', '2', '', '', '']
+
+        self.controller.review_transactions()
+
+        self.mock_facade.suggest_use_case.execute.assert_called_once_with('ref1')
+        self.mock_facade.update_use_case.execute.assert_called_once_with('ref1', category='eatingout')
+
+    def test_review_transactions_without_suggestions(self):
+        transaction = TransactionDto('ref1', '2024-08-10', 'BILLA DANKT', '-10.33', 'POS 1234 BILLA', '', '8', '', '', 'False')
+        self.mock_facade.review_use_case.execute.return_value = [transaction]
+        self.mock_facade.suggest_use_case.execute.return_value = []
+        self.mock_reader.get_input.side_effect = ['N', '2', '', '', '']
+
+        self.controller.review_transactions()
+
+        self.mock_facade.update_use_case.execute.assert_called_once_with('ref1', category='2')
+
+    def test_review_clusters(self):
+        billa1 = TransactionDto('ref1', '2024-08-10', 'BILLA DANKT', '-10.33', 'POS 1234 BILLA', '', '8', '', '', 'False')
+        billa2 = TransactionDto('ref2', '2024-08-11', 'BILLA DANKT', '-5.10', 'POS 5678 BILLA', '', '8', '', '', 'False')
+        omv = TransactionDto('ref3', '2024-08-12', 'OMV', '-60.00', 'POS 9012 OMV', '', '8', '', '', 'False')
+        spam = TransactionDto('ref4', '2024-08-13', 'SPAM', '-1.00', 'SPAM', '', '8', '', '', 'False')
+        self.mock_facade.review_clusters_use_case.execute.return_value = [[billa1, billa2], [omv], [spam]]
+        self.mock_facade.suggest_use_case.execute.return_value = ['groceries']
+        self.mock_reader.get_input.side_effect = ['C', '1', '', 'billa', '', 'X', 'S', 'D']
+
+        self.controller.review_clusters()
+
+        self.assertEqual(3, self.mock_presenter.present_history.call_count)
+        self.mock_facade.bulk_update_use_case.execute.assert_called_once_with(['ref1', 'ref2'], category='groceries', tag='billa')
+        self.mock_facade.delete_use_case.execute.assert_called_once_with('ref4')
+
+    def test_update_transactions_where(self):
+        self.controller.update_transactions_where('source~billa', category='groceries')
+
+        self.mock_facade.bulk_update_use_case.execute.assert_called_once_with(where='source~billa', category='groceries')
+
+    def test_query_transactions(self):
+        self.controller.query_transactions('group by category')
+
+        self.mock_facade.query_use_case.execute.assert_called_once_with('group by category')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,471 @@
+from datetime import date
+import unittest
+
+from finance.domain.columnar import ColumnarHistory
+from finance.domain.exception import TransactionExistsException, TransactionNotFoundException, TransactionUpdateException
+from finance.domain.transaction import History, Transaction
+
+
+class TestTransaction(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {'reference': 'ref1', 'day': '2024-08-10', 'source': 'source1', 'amount': '-10.5', 'notes': 'notes', 'category': 'groceries', 'month': '8', 'tag': 'lidl', 'comments': '', 'ignore': 'False'}
+
+    def test_transaction_is_slotted(self):
+        transaction = Transaction.from_dict(self.data)
+
+        self.assertFalse(hasattr(transaction, '__dict__'))
+        with self.assertRaises(AttributeError):
+            transaction.unknown = 'value'
+
+    def test_equality_ignores_mutable_fields(self):
+        transaction = Transaction.from_dict(self.data)
+        updated = Transaction.from_dict(self.data | {'category': 'rent', 'month': '9', 'tag': '', 'comments': 'moved', 'ignore': 'True'})
+
+        self.assertEqual(transaction, updated)
+        self.assertNotEqual(transaction, Transaction.from_dict(self.data | {'amount': '-11.5'}))
+
+    def test_from_dict_interns_repeated_strings(self):
+        first = Transaction.from_dict({key: ''.join(value) for key, value in self.data.items()})
+        second = Transaction.from_dict({key: ''.join(list(value)) for key, value in self.data.items()})
+
+        self.assertIs(first.source, second.source)
+        self.assertIs(first.category, second.category)
+        self.assertIs(first.tag, second.tag)
+
+    def test_from_dict_keeps_free_text_comments(self):
+        data = self.data | {'comments': 'paid back by anna'}
+        first = Transaction.from_dict({key: ''.join(list(value)) for key, value in data.items()})
+        second = Transaction.from_dict({key: ''.join(list(value)) for key, value in data.items()})
+
+        self.assertEqual(first.comments, second.comments)
+        self.assertIsNot(first.comments, second.comments)
+        self.assertIsNot(Transaction.from_rows([tuple(first.comments if key == 'comments' else value for key, value in data.items())])[0].comments, second.comments)
+
+    def test_from_rows_matches_from_dict(self):
+        rows = [tuple(self.data.values()), tuple((self.data | {'reference': 'ref2', 'ignore': 'True'}).values())]
+
+        transactions = Transaction.from_rows(rows)
+
+        self.assertEqual([Transaction.from_dict(dict(zip(self.data, row))) for row in rows], transactions)
+        self.assertEqual([False, True], [transaction.ignore for transaction in transactions])
+        self.assertIs(transactions[0].category, transactions[1].category)
+
+    def test_to_rows_round_trip(self):
+        transaction = Transaction.from_dict(self.data)
+
+        rows = Transaction.to_rows([transaction])
+
+        self.assertEqual([tuple(self.data.values())], rows)
+        self.assertEqual([transaction], Transaction.from_rows(rows))
+        self.assertEqual([transaction.to_dict() | {'amount': '-10.5', 'month': '8', 'ignore': 'False'}], [dict(zip(self.data, row)) for row in rows])
+
+
+class TestHistory(unittest.TestCase):
+
+    def create_history(self) -> History:
+        return History()
+
+    def setUp(self):
+        self.history = self.create_history()
+        self.transaction1 = Transaction('ref1', date(2024, 8, 10), 'source1', 1400.84, 'nothing to add1', 'vacation', 8, 'gift', 'testing1', False)
+        self.transaction2 = Transaction('ref2', date(2024, 8, 1), 'source2', -10.33, 'nothing to add2', 'groceries', 8, 'lidl', 'testing2', False)
+        self.transaction3 = Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', '', 8, '', '', False)
+        self.transaction4 = Transaction('ref4', date(2024, 9, 2), 'source4', -132.47, 'nothing to add4', 'groceries', 9, 'oegk', 'testing4', True)
+        self.transaction5 = Transaction('ref5', date(2024, 9, 15), 'source5', -5.23, 'nothing to add5', '', 9, '', '', False)
+
+    def add_transactions(self) -> None:
+        for transaction in [self.transaction1, self.transaction2, self.transaction3, self.transaction4, self.transaction5]:
+            self.history.add_transaction(transaction)
+
+    def test_add_transaction(self):
+        item = self.history.add_transaction(self.transaction1)
+
+        self.assertEqual(item, self.transaction1)
+        self.assertEqual(len(self.history.items), 1)
+        self.assertIn(self.transaction1.reference, self.history.items)
+        self.assertTrue(self.history.has_transaction(self.transaction1.reference))
+
+    def test_add_existing_transaction_raises_exception(self):
+        self.history.add_transaction(self.transaction1)
+
+        with self.assertRaises(TransactionExistsException) as context:
+            self.history.add_transaction(self.transaction1)
+
+        self.assertEqual('ref1', context.exception.reference)
+        self.assertEqual('Failed to add transaction. Transaction with reference "ref1" already exists', str(context.exception))
+
+    def test_add_transactions(self):
+        self.history.add_transaction(self.transaction1)
+
+        imported, duplicated = self.history.add_transactions([self.transaction1, self.transaction2, self.transaction3, self.transaction2])
+
+        self.assertEqual(['ref2', 'ref3'], [transaction.reference for transaction in imported])
+        self.assertEqual(['ref1', 'ref2'], [transaction.reference for transaction in duplicated])
+        self.assertEqual(3, len(self.history.items))
+        self.assertEqual(['ref3'], [transaction.reference for transaction in self.history.get_unreviewed_transactions()])
+        self.assertEqual(1, self.history.aggregates.cells[(2024, 8, '', '', False)].count)
+
+    def test_add_transactions_newest_first(self):
+        self.history.add_transaction(self.transaction2)
+
+        imported, _ = self.history.add_transactions([self.transaction5, self.transaction4, self.transaction3, self.transaction1])
+
+        self.assertEqual(4, len(imported))
+        self.assertEqual(['ref2', 'ref1', 'ref3', 'ref4', 'ref5'], [item.reference for item in self.history.get_transactions_between(date(2024, 8, 1), date(2024, 9, 30))])
+        self.assertEqual(['ref5', 'ref4'], [item.reference for item in self.history.get_transactions_by_month(9, 2024)])
+        self.assertEqual(['ref3'], [item.reference for item in self.history.search_transactions('add3')])
+        self.assertEqual(['ref2', 'ref4'], [item.reference for item in self.history.get_transactions_by_category('groceries')])
+
+    def test_update_transaction(self):
+        self.history.add_transaction(self.transaction3)
+        updated = Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', 'groceries', 7, 'hofer', 'comments', True)
+
+        item = self.history.update_transaction(updated)
+
+        self.assertEqual('groceries', item.category)
+        self.assertEqual(7, self.history.get_transaction('ref3').month)
+        self.assertEqual(len(self.history.items), 1)
+
+    def test_update_immutable_fields_raises_exception(self):
+        self.history.add_transaction(self.transaction1)
+        updated = Transaction('ref1', date(2024, 8, 11), 'source1', 1400.84, 'nothing to add1', 'vacation', 8, 'gift', 'testing1', False)
+
+        with self.assertRaises(TransactionUpdateException):
+            self.history.update_transaction(updated)
+
+    def test_update_non_existing_transaction_raises_exception(self):
+        with self.assertRaises(TransactionNotFoundException):
+            self.history.update_transaction(self.transaction1)
+
+    def test_delete_transaction(self):
+        self.history.add_transaction(self.transaction1)
+
+        item = self.history.delete_transaction(self.transaction1.reference)
+
+        self.assertEqual(item, self.transaction1)
+        self.assertEqual(len(self.history.items), 0)
+        self.assertNotIn(self.transaction1.reference, self.history.items)
+
+    def test_delete_non_existing_transaction_raises_exception(self):
+        with self.assertRaises(TransactionNotFoundException):
+            self.history.delete_transaction('ref1')
+
+    def test_get_transaction(self):
+        self.history.add_transaction(self.transaction1)
+
+        item = self.history.get_transaction(self.transaction1.reference)
+
+        self.assertEqual(item.to_dict(), self.transaction1.to_dict())
+
+    def test_get_non_existing_transaction_raises_exception(self):
+        with self.assertRaises(TransactionNotFoundException):
+            self.history.get_transaction('ref1')
+
+    def test_get_unreviewed_transactions(self):
+        self.add_transactions()
+
+        items = self.history.get_unreviewed_transactions()
+
+        self.assertEqual([self.transaction3, self.transaction5], items)
+
+    def test_get_transactions_by_category(self):
+        self.add_transactions()
+
+        items = self.history.get_transactions_by_category('groceries')
+
+        self.assertEqual([self.transaction2, self.transaction4], items)
+        self.assertEqual([], self.history.get_transactions_by_category('rent'))
+
+    def test_get_transactions_by_month(self):
+        self.add_transactions()
+
+        items = self.history.get_transactions_by_month(8)
+
+        self.assertEqual([self.transaction1, self.transaction2, self.transaction3], items)
+        self.assertEqual([], self.history.get_transactions_by_month(1))
+
+    def test_get_transactions_by_month_of_year(self):
+        self.add_transactions()
+        transaction6 = Transaction('ref6', date(2025, 8, 3), 'source6', -1.0, 'nothing to add6', 'groceries', 8, '', '', False)
+        self.history.add_transaction(transaction6)
+
+        self.assertEqual([self.transaction1, self.transaction2, self.transaction3], self.history.get_transactions_by_month(8, 2024))
+        self.assertEqual([transaction6], self.history.get_transactions_by_month(8, 2025))
+        self.assertEqual([self.transaction1, self.transaction2, self.transaction3, transaction6], self.history.get_transactions_by_month(8))
+        self.assertEqual([(2024, 8), (2024, 9), (2025, 8)], self.history.get_periods())
+
+    def test_month_across_new_year_belongs_to_period_year(self):
+        salary = Transaction('ref6', date(2023, 12, 29), 'source6', 3000.0, 'nothing to add6', 'salary', 1, '', '', False)
+        self.history.add_transaction(salary)
+
+        self.assertEqual(2024, salary.year)
+        self.assertEqual([salary], self.history.get_transactions_by_month(1, 2024))
+        self.assertEqual({'salary': 3000.0}, self.history.aggregates.get_category_totals(1, 2024))
+        self.assertEqual({}, self.history.aggregates.get_category_totals(1, 2023))
+
+    def test_search_transactions(self):
+        self.add_transactions()
+        transaction6 = Transaction('ref6', date(2024, 9, 3), 'AMAZON EU SARL', -30.0, 'POS 1234 Amazon.de Marketplace', '', 9, '', 'birthday gift', False)
+        transaction7 = Transaction('ref7', date(2024, 8, 3), 'Amazon Prime', -8.99, 'subscription', '', 8, '', '', False)
+        self.history.add_transaction(transaction6)
+        self.history.add_transaction(transaction7)
+
+        self.assertEqual([transaction7, transaction6], self.history.search_transactions('amazon'))
+        self.assertEqual([transaction6], self.history.search_transactions('AMAZON gift'))
+        self.assertEqual([transaction6], self.history.search_transactions('amazon.de'))
+        self.assertEqual([transaction7, transaction6], self.history.search_transactions('ama*'))
+        self.assertEqual([self.transaction2, self.transaction1, self.transaction3, self.transaction4, self.transaction5], self.history.search_transactions('noth* add*'))
+        self.assertEqual([], self.history.search_transactions('amazon rent'))
+        self.assertEqual([], self.history.search_transactions(''))
+
+    def test_search_transactions_after_changes(self):
+        self.add_transactions()
+        self.history.update_transaction(Transaction('ref1', date(2024, 8, 10), 'source1', 1400.84, 'nothing to add1', 'vacation', 8, 'gift', 'flight to lisbon', False))
+        self.history.delete_transaction('ref2')
+
+        self.assertEqual(['ref1'], [item.reference for item in self.history.search_transactions('lisb*')])
+        self.assertEqual([], self.history.search_transactions('testing1'))
+        self.assertEqual([], self.history.search_transactions('source2'))
+        self.assertEqual(['ref4'], [item.reference for item in self.history.search_transactions('testing*')])
+
+    def test_list_transactions(self):
+        self.add_transactions()
+
+        items = self.history.list_transactions()
+
+        self.assertEqual([self.transaction1, self.transaction2, self.transaction3, self.transaction4, self.transaction5], items)
+
+    def test_get_transactions_between(self):
+        self.add_transactions()
+
+        items = self.history.get_transactions_between(date(2024, 8, 10), date(2024, 9, 2))
+
+        self.assertEqual(['ref1', 'ref3', 'ref4'], [item.reference for item in items])
+        self.assertEqual([], self.history.get_transactions_between(date(2024, 10, 1), date(2024, 12, 31)))
+        self.assertEqual([], self.history.get_transactions_between(date(2024, 9, 2), date(2024, 8, 10)))
+
+    def test_get_transactions_between_after_changes(self):
+        self.add_transactions()
+        self.history.delete_transaction('ref3')
+        self.history.update_transaction(Transaction('ref1', date(2024, 8, 10), 'source1', 1400.84, 'nothing to add1', 'salary', 9, '', '', False))
+        self.history.add_transaction(Transaction('ref6', date(2024, 8, 5), 'source6', -1.0, 'nothing to add6', '', 8, '', '', False))
+
+        items = self.history.get_transactions_between(date(2024, 8, 1), date(2024, 8, 31))
+
+        self.assertEqual(['ref2', 'ref6', 'ref1'], [item.reference for item in items])
+        self.assertEqual('salary', items[2].category)
+
+    def test_set_items_builds_day_index(self):
+        self.history.items = {transaction.reference: transaction for transaction in [self.transaction5, self.transaction3, self.transaction1]}
+
+        self.assertEqual(['ref1', 'ref3', 'ref5'], [item.reference for item in self.history.get_transactions_between(date(2024, 1, 1), date(2024, 12, 31))])
+
+    def test_update_transaction_moves_between_indexes(self):
+        self.add_transactions()
+        updated = Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', 'groceries', 9, 'hofer', '', False)
+
+        self.history.update_transaction(updated)
+
+        self.assertEqual(['ref5'], [item.reference for item in self.history.get_unreviewed_transactions()])
+        self.assertEqual(['ref2', 'ref4', 'ref3'], [item.reference for item in self.history.get_transactions_by_category('groceries')])
+        self.assertEqual(['ref1', 'ref2'], [item.reference for item in self.history.get_transactions_by_month(8)])
+        self.assertEqual(['ref4', 'ref5', 'ref3'], [item.reference for item in self.history.get_transactions_by_month(9)])
+
+    def test_update_transaction_with_invalid_month_keeps_indexes(self):
+        self.add_transactions()
+        updated = Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', 'groceries', 'x', '', '', False)
+
+        with self.assertRaises((TypeError, ValueError)):
+            self.history.update_transaction(updated)
+
+        self.assertIn('ref3', [item.reference for item in self.history.get_transactions_by_month(8, 2024)])
+        self.assertIn('ref3', [item.reference for item in self.history.get_unreviewed_transactions()])
+        self.assertEqual(-22.05, self.history.aggregates.get_category_totals(8, 2024)[''])
+
+    def test_update_transaction_changed_in_place_moves_between_indexes(self):
+        self.add_transactions()
+        transaction = self.history.get_transaction('ref5')
+        transaction.category = 'groceries'
+        transaction.month = 8
+
+        self.history.update_transaction(transaction)
+
+        self.assertEqual(['ref3'], [item.reference for item in self.history.get_unreviewed_transactions()])
+        self.assertIn('ref5', [item.reference for item in self.history.get_transactions_by_category('groceries')])
+        self.assertIn('ref5', [item.reference for item in self.history.get_transactions_by_month(8)])
+        self.assertEqual(['ref4'], [item.reference for item in self.history.get_transactions_by_month(9)])
+
+    def test_delete_transaction_removes_from_indexes(self):
+        self.add_transactions()
+
+        self.history.delete_transaction('ref2')
+        self.history.delete_transaction('ref3')
+
+        self.assertEqual(['ref5'], [item.reference for item in self.history.get_unreviewed_transactions()])
+        self.assertEqual(['ref4'], [item.reference for item in self.history.get_transactions_by_category('groceries')])
+        self.assertEqual(['ref1'], [item.reference for item in self.history.get_transactions_by_month(8)])
+
+    def test_set_items_rebuilds_indexes(self):
+        self.add_transactions()
+
+        self.history.items = {self.transaction4.reference: self.transaction4, self.transaction5.reference: self.transaction5}
+
+        self.assertEqual(['ref5'], [item.reference for item in self.history.get_unreviewed_transactions()])
+        self.assertEqual([], self.history.get_transactions_by_month(8))
+        self.assertEqual(['ref4', 'ref5'], [item.reference for item in self.history.get_transactions_by_month(9)])
+
+    def test_aggregates_follow_mutations(self):
+        self.add_transactions()
+        updated = Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', 'groceries', 8, 'lidl', '', False)
+
+        self.history.update_transaction(updated)
+        self.history.delete_transaction('ref4')
+
+        self.assertEqual({'vacation': 1400.84, 'groceries': -10.33 + -22.05}, self.history.aggregates.get_category_totals(8))
+        self.assertEqual({'': -5.23}, self.history.aggregates.get_category_totals(9))
+        self.assertEqual({8: -10.33 + -22.05}, self.history.aggregates.get_monthly_totals('groceries'))
+        self.assertEqual(2, self.history.aggregates.cells[(2024, 8, 'groceries', 'lidl', False)].count)
+
+    def test_set_items_rebuilds_aggregates(self):
+        self.add_transactions()
+
+        self.history.items = {self.transaction4.reference: self.transaction4}
+
+        self.assertEqual({'groceries': {9: -132.47}}, self.history.aggregates.get_category_month_totals())
+
+    def test_changes_since_last_save(self):
+        self.add_transactions()
+        self.history.mark_saved('history.csv')
+        updated = Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', 'groceries', 8, 'lidl', '', False)
+
+        self.history.update_transaction(updated)
+        self.history.delete_transaction('ref4')
+        upserted, deleted = self.history.get_changes()
+
+        self.assertEqual('history.csv', self.history.checkpoint)
+        self.assertEqual(['ref3'], [item.reference for item in upserted])
+        self.assertEqual('groceries', upserted[0].category)
+        self.assertEqual(['ref4'], deleted)
+
+    def test_set_items_resets_changes(self):
+        self.add_transactions()
+        self.history.mark_saved('history.csv')
+
+        self.history.items = {self.transaction4.reference: self.transaction4}
+
+        self.assertIsNone(self.history.checkpoint)
+        self.assertEqual(([], []), self.history.get_changes())
+
+    def test_update_transactions(self):
+        self.add_transactions()
+        updated3 = Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', 'groceries', 8, 'lidl', '', False)
+        updated5 = Transaction('ref5', date(2024, 9, 15), 'source5', -5.23, 'nothing to add5', 'groceries', 9, '', '', False)
+
+        self.history.update_transactions([updated3, updated5])
+
+        self.assertEqual([], self.history.get_unreviewed_transactions())
+        self.assertEqual(['ref2', 'ref3', 'ref4', 'ref5'], sorted(item.reference for item in self.history.get_transactions_by_category('groceries')))
+
+    def test_update_transactions_validates_before_applying(self):
+        self.add_transactions()
+        updated3 = Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', 'groceries', 8, '', '', False)
+        missing = Transaction('ref9', date(2024, 9, 15), 'source9', -5.23, 'nothing to add9', 'groceries', 9, '', '', False)
+
+        with self.assertRaises(TransactionNotFoundException):
+            self.history.update_transactions([updated3, missing])
+
+        self.assertEqual(['ref3', 'ref5'], sorted(item.reference for item in self.history.get_unreviewed_transactions()))
+
+    def test_get_unreviewed_clusters(self):
+        self.history.add_transaction(Transaction('ref6', date(2024, 8, 3), 'BILLA DANKT', -12.40, 'POS 1234 BILLA 0450 K1 03.08. 10:12', '', 8, '', '', False))
+        self.history.add_transaction(Transaction('ref7', date(2024, 8, 4), 'OMV', -60.00, 'POS 1234 OMV 0021 K1 04.08. 18:40', '', 8, '', '', False))
+        self.history.add_transaction(Transaction('ref8', date(2024, 8, 5), 'BILLA DANKT', -30.15, 'POS 1234 BILLA 0451 K1 05.08. 09:03', '', 8, '', '', False))
+        self.history.add_transaction(Transaction('ref9', date(2024, 8, 6), 'BILLA DANKT', -8.10, 'POS 1234 BILLA 0450 K1 06.08. 17:55', 'groceries', 8, '', '', False))
+
+        clusters = self.history.get_unreviewed_clusters()
+
+        self.assertEqual([['ref6', 'ref8'], ['ref7']], [sorted(item.reference for item in cluster) for cluster in clusters])
+
+    def test_suggest_categories(self):
+        self.history.add_transaction(Transaction('ref6', date(2024, 8, 3), 'BILLA DANKT', -12.40, 'POS 1234 BILLA 0450', 'groceries', 8, '', '', False))
+        self.history.add_transaction(Transaction('ref7', date(2024, 8, 4), 'SPAR DANKT', -30.15, 'POS 1234 SPAR 0021', 'groceries', 8, '', '', False))
+        self.history.add_transaction(Transaction('ref8', date(2024, 8, 5), 'NETFLIX.COM', -12.99, 'NETFLIX.COM 866-579-7172', 'subscriptions', 8, '', '', False))
+        transaction = Transaction('ref9', date(2024, 8, 6), 'BILLA DANKT', -8.10, 'POS 5678 BILLA 0450', '', 8, '', '', False)
+
+        suggestions = self.history.suggest_categories(transaction)
+
+        self.assertEqual(['groceries', 'subscriptions'], [category for category, _ in suggestions])
+        self.assertAlmostEqual(1.0, sum(probability for _, probability in suggestions))
+        self.assertEqual(1, len(self.history.suggest_categories(transaction, 1)))
+
+    def test_suggest_categories_learns_from_updates(self):
+        self.add_transactions()
+        transaction = Transaction('ref9', date(2024, 8, 6), 'source5', -5.23, 'nothing to add5', '', 9, '', '', False)
+        self.assertNotEqual('eatingout', self.history.suggest_categories(transaction)[0][0])
+
+        updated = Transaction('ref5', date(2024, 9, 15), 'source5', -5.23, 'nothing to add5', 'eatingout', 9, '', '', False)
+        self.history.update_transaction(updated)
+
+        self.assertEqual('eatingout', self.history.suggest_categories(transaction)[0][0])
+
+        self.history.delete_transaction('ref5')
+
+        self.assertNotIn('eatingout', [category for category, _ in self.history.suggest_categories(transaction)])
+
+    def test_suggest_categories_after_setting_items(self):
+        self.add_transactions()
+        self.history.items = {self.transaction2.reference: self.transaction2, self.transaction3.reference: self.transaction3}
+        self.history.update_transaction(Transaction('ref3', date(2024, 8, 20), 'source3', -22.05, 'nothing to add3', 'car', 8, '', '', False))
+
+        suggestions = self.history.suggest_categories(self.transaction5)
+
+        self.assertEqual(['car', 'groceries'], sorted(category for category, _ in suggestions))
+
+    def test_suggest_categories_without_categorized_transactions(self):
+        self.history.add_transaction(self.transaction3)
+
+        self.assertEqual([], self.history.suggest_categories(self.transaction5))
+
+
+class TestColumnarHistory(TestHistory):
+
+    def create_history(self) -> History:
+        return ColumnarHistory()
+
+    def test_get_transaction_is_materialized_from_columns(self):
+        self.history.add_transaction(self.transaction1)
+
+        item = self.history.get_transaction(self.transaction1.reference)
+
+        self.assertIsNot(item, self.transaction1)
+        self.assertEqual(self.transaction1.to_dict(), item.to_dict())
+
+    def test_strings_are_dictionary_encoded(self):
+        self.add_transactions()
+
+        self.assertEqual(['vacation', 'groceries', ''], self.history.category_table.values)
+        self.assertEqual(['gift', 'lidl', '', 'oegk'], self.history.tag_table.values)
+
+    def test_delete_transactions_compacts_columns(self):
+        self.add_transactions()
+
+        for reference in ['ref1', 'ref2', 'ref3']:
+            self.history.delete_transaction(reference)
+
+        self.assertEqual(2, len(self.history.days))
+        self.assertEqual(['ref4', 'ref5'], [item.reference for item in self.history.list_transactions()])
+        self.assertEqual(['ref5'], [item.reference for item in self.history.get_unreviewed_transactions()])
+
+    def test_text_index_keeps_rows(self):
+        self.add_transactions()
+        for reference in ['ref1', 'ref2', 'ref3']:
+            self.history.delete_transaction(reference)
+
+        self.assertEqual([0], list(self.history._text_index.postings['source4']))
+        self.assertEqual(['ref4', 'ref5'], [item.reference for item in self.history.search_transactions('noth* add*')])
+        self.assertEqual([], self.history.search_transactions('source1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
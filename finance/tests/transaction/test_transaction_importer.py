@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import MagicMock, patch
+
+from finance.bench.generator import ErsteStatementGenerator
+from finance.infrastructure.importer import ErsteBankCsvTransactionImporter, ParallelTransactionImporter
+
+
+class TestParallelTransactionImporter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.filenames = [os.path.join(self.directory.name, f'statement-{seed}.csv') for seed in range(3)]
+        for seed, filename in enumerate(self.filenames):
+            ErsteStatementGenerator(20, seed=seed).write_statement(filename)
+        with open(os.path.join(self.directory.name, 'notes.txt'), 'w') as notes:
+            notes.write('not a statement')
+        self.importer = ErsteBankCsvTransactionImporter()
+        self.expected = [transaction for filename in self.filenames for transaction in self.importer.import_transactions(filename)]
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_import_directory(self):
+        transactions = list(ParallelTransactionImporter(self.importer, max_workers=2).import_transactions(self.directory.name))
+
+        self.assertEqual(self.expected, transactions)
+
+    def test_import_glob(self):
+        pattern = os.path.join(self.directory.name, 'statement-[12].csv')
+
+        transactions = list(ParallelTransactionImporter(self.importer, max_workers=1).import_transactions(pattern))
+
+        self.assertEqual(self.expected[20:], transactions)
+
+    def test_import_single_file(self):
+        transactions = list(ParallelTransactionImporter(self.importer).import_transactions(self.filenames[1]))
+
+        self.assertEqual(self.expected[20:40], transactions)
+
+    def test_import_files_returns_all_transactions_at_once(self):
+        for workers in [1, 2]:
+            transactions = ParallelTransactionImporter(self.importer, max_workers=workers).import_transactions(self.directory.name)
+
+            self.assertIsInstance(transactions, list)
+            self.assertEqual(self.expected, transactions)
+
+    def test_import_files_uses_worker_importer_in_pool(self):
+        importer = MagicMock(wraps=self.importer)
+        worker_importer = MagicMock(wraps=self.importer)
+
+        with patch('finance.infrastructure.importer.ProcessPoolExecutor', ThreadPoolExecutor):
+            transactions = ParallelTransactionImporter(importer, max_workers=2, worker_importer=worker_importer).import_transactions(self.directory.name)
+
+        self.assertEqual(self.expected, transactions)
+        importer.import_transactions.assert_not_called()
+        self.assertEqual(3, worker_importer.import_transactions.call_count)
+
+    def test_import_single_file_with_worker_importer(self):
+        importer = ErsteBankCsvTransactionImporter(workers=2, split_size=0)
+
+        transactions = list(ParallelTransactionImporter(importer, worker_importer=self.importer).import_transactions(self.filenames[1]))
+
+        self.assertEqual(self.expected[20:40], transactions)
+
+    def test_import_files_with_invalid_statement_raises_before_returning(self):
+        with open(os.path.join(self.directory.name, 'statement-9.csv'), 'w') as statement:
+            statement.write('header\n01.02.2024,source\n')
+
+        for workers in [1, 2]:
+            with self.assertRaises(IndexError):
+                ParallelTransactionImporter(self.importer, max_workers=workers).import_transactions(self.directory.name)
+
+    def test_import_without_matching_files(self):
+        with self.assertRaises(FileNotFoundError):
+            list(ParallelTransactionImporter(self.importer).import_transactions(os.path.join(self.directory.name, '*.xlsx')))
+
+
+class TestErsteBankCsvTransactionImporter(unittest.TestCase):
+
+    def test_import_splits_large_statement(self):
+        with TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'statement.csv')
+            ErsteStatementGenerator(500).write_statement(filename)
+
+            expected = list(ErsteBankCsvTransactionImporter().import_transactions(filename))
+            transactions = list(ErsteBankCsvTransactionImporter(workers=2, split_size=0).import_transactions(filename))
+
+        self.assertEqual(500, len(transactions))
+        self.assertEqual(expected, transactions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,9 @@ import unittest
 from unittest.mock import ANY, Mock, call
 from uuid import uuid4
 
-from finance.application.transaction_interactor import IgnoreTransactionUseCase, ImportTransactionsUseCase, ListTransactionsUseCase, UpdateTransactionUseCase
+from finance.application.transaction_interactor import BulkUpdateTransactionsUseCase, IgnoreTransactionUseCase, ImportTransactionsUseCase, ListTransactionsBetweenUseCase, ListTransactionsUseCase, LoadHistoryUseCase, QueryTransactionsUseCase, ReviewClustersUseCase, SaveHistoryUseCase, SearchTransactionsUseCase, SuggestCategoriesUseCase, UpdateTransactionUseCase
 from finance.application.dto import InteractorResultDto, TransactionDto
-from finance.application.interface import HistoryPresenterInterface, TransactionImporterInterface
+from finance.application.interface import HistoryPresenterInterface, HistoryRepositoryInterface, TransactionImporterInterface
 from finance.domain.transaction import History, Transaction
 
 
@@ -124,10 +124,7 @@ class TestHistoryUseCases(unittest.TestCase):
         self.mock_importer.import_transactions.return_value = [transaction_dto, transaction_dto, transaction_dto]
         response = {
             'imported': [Transaction.from_dict(transaction_dto.to_dict()).to_dict()],
-            'duplicated': [
-                'Failed to add transaction. Transaction with reference "reference" already exists',
-                'Failed to add transaction. Transaction with reference "reference" already exists'
-            ]
+            'duplicated': ['reference', 'reference']
         }
         result = InteractorResultDto(success=True, operation="Import Transactions", data=response)
 
@@ -151,6 +148,58 @@ class TestHistoryUseCases(unittest.TestCase):
         self.assertEqual(0, len(self.history.items))
         self.mock_presenter.present_import_transactions.assert_called_once_with(result)
 
+    def test_import_transaction_commits_each_batch_use_case(self):
+        filename = 'filename'
+        transaction_dtos = [TransactionDto(f'reference{index}', '2024-10-08', 'source', '10.5', 'notes', '', '10', '', '', 'False') for index in range(5)]
+        committed = []
+
+        def stream(_):
+            for transaction_dto in transaction_dtos:
+                committed.append(len(self.history.items))
+                yield transaction_dto
+
+        self.mock_importer.import_transactions.side_effect = stream
+        use_case = ImportTransactionsUseCase(self.history, self.mock_importer, self.mock_presenter, batch_size=2)
+
+        use_case.execute(filename)
+
+        self.assertEqual(5, len(self.history.items))
+        self.assertEqual([0, 0, 2, 2, 4], committed)
+        self.assertEqual(3, self.mock_presenter.present_import_transactions.call_count)
+        last_result = self.mock_presenter.present_import_transactions.call_args.args[0]
+        self.assertEqual([Transaction.from_dict(transaction_dtos[4].to_dict()).to_dict()], last_result.data['imported'])
+
+    def test_import_transaction_commits_list_at_once_use_case(self):
+        filename = 'filename'
+        transaction_dtos = [TransactionDto(f'reference{index % 4}', '2024-10-08', 'source', '10.5', 'notes', '', '10', '', '', 'False') for index in range(5)]
+        self.mock_importer.import_transactions.return_value = transaction_dtos
+        use_case = ImportTransactionsUseCase(self.history, self.mock_importer, self.mock_presenter, batch_size=2)
+
+        use_case.execute(filename)
+
+        self.assertEqual(4, len(self.history.items))
+        result = self.mock_presenter.present_import_transactions.call_args.args[0]
+        self.mock_presenter.present_import_transactions.assert_called_once()
+        self.assertEqual(4, len(result.data['imported']))
+        self.assertEqual(1, len(result.data['duplicated']))
+
+    def test_import_transaction_failure_keeps_committed_batches_use_case(self):
+        filename = 'filename'
+        transaction_dto = TransactionDto('reference', '2024-10-08', 'source', '10.5', 'notes', '', '10', '', '', 'False')
+
+        def stream(_):
+            yield transaction_dto
+            raise ValueError('malformed row')
+
+        self.mock_importer.import_transactions.side_effect = stream
+        use_case = ImportTransactionsUseCase(self.history, self.mock_importer, self.mock_presenter, batch_size=1)
+
+        use_case.execute(filename)
+
+        self.assertEqual(1, len(self.history.items))
+        result = InteractorResultDto(success=False, operation='Import Transactions', error='malformed row')
+        self.mock_presenter.present_import_transactions.assert_called_with(result)
+
     def test_update_transaction_use_case(self):
         reference = 'reference'
 
@@ -193,6 +242,33 @@ class TestHistoryUseCases(unittest.TestCase):
         self.assertNotIn(reference, self.history.items)
         self.mock_presenter.present_transaction.assert_called_once_with(result)
 
+    def test_update_transaction_parses_month(self):
+        transaction = Transaction('r1', date(2024, 10, 8), 'source', 1400.84, 'nothing to add', '', 10, '', '', False)
+        self.history.add_transaction(transaction)
+        use_case = UpdateTransactionUseCase(self.history, self.mock_presenter)
+
+        use_case.execute('r1', category='food', month='4')
+
+        self.assertEqual(4, self.history.get_transaction('r1').month)
+        self.assertEqual(['r1'], [item.reference for item in self.history.get_transactions_by_month(4, 2024)])
+        self.assertTrue(self.mock_presenter.present_transaction.call_args.args[0].success)
+
+    def test_update_transaction_with_invalid_month_returns_error(self):
+        transaction = Transaction('r1', date(2024, 10, 8), 'source', 1400.84, 'nothing to add', '', 10, '', '', False)
+        self.history.add_transaction(transaction)
+        use_case = UpdateTransactionUseCase(self.history, self.mock_presenter)
+
+        for month in ['april', '13']:
+            self.mock_presenter.reset_mock()
+
+            use_case.execute('r1', category='food', month=month)
+
+            result = self.mock_presenter.present_transaction.call_args.args[0]
+            self.assertFalse(result.success)
+            self.assertTrue(result.error.startswith('Failed to update transaction.'))
+            self.assertEqual('', self.history.get_transaction('r1').category)
+            self.assertEqual(['r1'], [item.reference for item in self.history.get_transactions_by_month(10, 2024)])
+
     def test_ignore_transaction_use_case(self):
         reference = 'reference'
         test_cases = [True, False]
@@ -248,6 +324,220 @@ class TestHistoryUseCases(unittest.TestCase):
 
         self.mock_presenter.present_history.assert_called_once_with(result)
 
+    def test_list_transactions_between_use_case(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'source1', 1400.84, 'nothing to add1', 'vacation', 8, 'gift', 'testing1', False)
+        transaction2 = Transaction('ref2', date(2024, 7, 31), 'source2', 10.33, 'nothing to add2', 'groceries', 8, 'lidl', 'testing2', False)
+        transaction3 = Transaction('ref3', date(2024, 9, 1), 'source3', 22.05, 'nothing to add3', 'eatingout', 8, 'tgtg', 'testing3', True)
+        transaction4 = Transaction('ref4', date(2024, 8, 1), 'source4', 132.47, 'nothing to add4', 'coinsurance', 9, 'oegk', 'testing4', False)
+        for transaction in [transaction1, transaction2, transaction3, transaction4]:
+            self.history.add_transaction(transaction)
+
+        response = [transaction4.to_dict(), transaction1.to_dict()]
+        result = InteractorResultDto(success=True, operation='List Transactions Between', data=response)
+        use_case = ListTransactionsBetweenUseCase(self.history, self.mock_presenter)
+
+        use_case.execute(date(2024, 8, 1), date(2024, 8, 31))
+
+        self.mock_presenter.present_history.assert_called_once_with(result)
+
+    def test_search_transactions_use_case(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'AMAZON EU SARL', -30.0, 'POS 1234 Amazon.de', '', 8, '', '', False)
+        transaction2 = Transaction('ref2', date(2024, 8, 1), 'BILLA DANKT', -10.33, 'POS 5678 Billa', 'groceries', 8, '', '', False)
+        self.history.add_transaction(transaction1)
+        self.history.add_transaction(transaction2)
+
+        result = InteractorResultDto(success=True, operation='Search Transactions', data=[transaction1.to_dict()])
+        use_case = SearchTransactionsUseCase(self.history, self.mock_presenter)
+
+        use_case.execute('amaz*')
+
+        self.mock_presenter.present_history.assert_called_once_with(result)
+
+    def test_review_clusters_use_case(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'BILLA DANKT', -30.0, 'POS 1234 BILLA 10.08.', '', 8, '', '', False)
+        transaction2 = Transaction('ref2', date(2024, 8, 1), 'OMV', -60.0, 'POS 5678 OMV 01.08.', '', 8, '', '', False)
+        transaction3 = Transaction('ref3', date(2024, 8, 12), 'BILLA DANKT', -10.33, 'POS 5678 BILLA 12.08.', '', 8, '', '', False)
+        for transaction in [transaction1, transaction2, transaction3]:
+            self.history.add_transaction(transaction)
+        use_case = ReviewClustersUseCase(self.history, self.mock_presenter)
+
+        clusters = use_case.execute()
+
+        self.assertEqual([['ref1', 'ref3'], ['ref2']], [[item.reference for item in cluster] for cluster in clusters])
+        self.mock_presenter.present_review_transactions.assert_called_once()
+
+    def test_bulk_update_transactions_use_case(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'BILLA DANKT', -30.0, 'POS 1234 BILLA', '', 8, '', '', False)
+        transaction2 = Transaction('ref2', date(2024, 8, 1), 'BILLA DANKT', -10.33, 'POS 5678 BILLA', '', 8, '', '', False)
+        self.history.add_transaction(transaction1)
+        self.history.add_transaction(transaction2)
+        use_case = BulkUpdateTransactionsUseCase(self.history, self.mock_presenter)
+
+        use_case.execute(['ref1', 'ref2'], category='groceries', tag='billa')
+
+        self.assertEqual([], self.history.get_unreviewed_transactions())
+        self.assertEqual('billa', self.history.get_transaction('ref2').tag)
+        result = InteractorResultDto(success=True, operation='Bulk Update Transactions', data='2 transactions updated')
+        self.mock_presenter.present_success.assert_called_once_with(result)
+
+    def test_bulk_update_transactions_where_use_case(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'BILLA DANKT', -30.0, 'POS 1234 BILLA', '', 8, '', '', False)
+        transaction2 = Transaction('ref2', date(2024, 9, 1), 'BILLA DANKT', -10.33, 'POS 5678 BILLA', '', 9, '', '', False)
+        transaction3 = Transaction('ref3', date(2024, 8, 12), 'OMV', -60.0, 'POS 9012 OMV', '', 8, '', '', False)
+        for transaction in [transaction1, transaction2, transaction3]:
+            self.history.add_transaction(transaction)
+        use_case = BulkUpdateTransactionsUseCase(self.history, self.mock_presenter)
+
+        use_case.execute(where='source~billa and month=8', category='groceries', month='9', ignore='true')
+
+        self.assertEqual(['ref2', 'ref3'], [item.reference for item in self.history.get_unreviewed_transactions()])
+        self.assertEqual(9, self.history.get_transaction('ref1').month)
+        self.assertTrue(self.history.get_transaction('ref1').ignore)
+        result = InteractorResultDto(success=True, operation='Bulk Update Transactions', data='1 transactions updated')
+        self.mock_presenter.present_success.assert_called_once_with(result)
+
+    def test_bulk_update_invalid_changes_returns_error(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'BILLA DANKT', -30.0, 'POS 1234 BILLA', '', 8, '', '', False)
+        self.history.add_transaction(transaction1)
+        use_case = BulkUpdateTransactionsUseCase(self.history, self.mock_presenter)
+
+        use_case.execute(where='source~billa', category='groceries', amount='10')
+        use_case.execute(where='source~billa', category='groceries', month='13')
+        use_case.execute(where='source~billa', category='groceries', ignore='maybe')
+        use_case.execute(where='source', category='groceries')
+
+        self.assertEqual([transaction1], self.history.get_unreviewed_transactions())
+        self.assertEqual(4, self.mock_presenter.present_failure.call_count)
+        self.mock_presenter.present_success.assert_not_called()
+
+    def test_bulk_update_non_existing_transaction_returns_error(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'BILLA DANKT', -30.0, 'POS 1234 BILLA', '', 8, '', '', False)
+        self.history.add_transaction(transaction1)
+        use_case = BulkUpdateTransactionsUseCase(self.history, self.mock_presenter)
+
+        use_case.execute(['ref1', 'ref2'], category='groceries')
+
+        self.assertEqual([transaction1], self.history.get_unreviewed_transactions())
+        self.mock_presenter.present_failure.assert_called_once()
+
+    def test_suggest_categories_use_case(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'BILLA DANKT', -30.0, 'POS 1234 BILLA', 'groceries', 8, '', '', False)
+        transaction2 = Transaction('ref2', date(2024, 8, 1), 'BILLA DANKT', -10.33, 'POS 5678 BILLA', '', 8, '', '', False)
+        self.history.add_transaction(transaction1)
+        self.history.add_transaction(transaction2)
+        use_case = SuggestCategoriesUseCase(self.history, self.mock_presenter)
+
+        suggestions = use_case.execute('ref2')
+
+        self.assertEqual(['groceries'], suggestions)
+        result = InteractorResultDto(success=True, operation='Suggest Categories', data=[{'category': 'groceries', 'probability': 1.0}])
+        self.mock_presenter.present_suggestions.assert_called_once_with(result)
+
+    def test_suggest_categories_non_existing_transaction_returns_error(self):
+        use_case = SuggestCategoriesUseCase(self.history, self.mock_presenter)
+
+        suggestions = use_case.execute('ref1')
+
+        self.assertEqual([], suggestions)
+        self.assertFalse(self.mock_presenter.present_suggestions.call_args.args[0].success)
+
+    def test_query_transactions_use_case(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'BILLA DANKT', -30.0, 'POS 1234 BILLA', 'groceries', 8, 'billa', '', False)
+        transaction2 = Transaction('ref2', date(2024, 8, 1), 'SPAR DANKT', -10.33, 'POS 5678 SPAR', 'groceries', 8, 'spar', '', False)
+        self.history.add_transaction(transaction1)
+        self.history.add_transaction(transaction2)
+        use_case = QueryTransactionsUseCase(self.history, self.mock_presenter)
+
+        use_case.execute('where category=groceries group by tag sum amount order by tag')
+
+        data = {'plan': 'category index groceries', 'fields': ['tag', 'sum(amount)'], 'rows': [['billa', -30.0], ['spar', -10.33]]}
+        result = InteractorResultDto(success=True, operation='Query Transactions', data=data)
+        self.mock_presenter.present_query.assert_called_once_with(result)
+
+    def test_query_transactions_invalid_query_returns_error(self):
+        use_case = QueryTransactionsUseCase(self.history, self.mock_presenter)
+
+        use_case.execute('select amount')
+
+        self.assertFalse(self.mock_presenter.present_query.call_args.args[0].success)
+
+    def test_save_history_use_case(self):
+        transaction = Transaction('ref1', date(2024, 8, 10), 'source1', 1400.84, 'nothing to add1', 'vacation', 8, 'gift', 'testing1', False)
+        self.history.add_transaction(transaction)
+        mock_repository = Mock(spec=HistoryRepositoryInterface)
+        use_case = SaveHistoryUseCase(self.history, mock_repository, self.mock_presenter)
+
+        use_case.execute('project')
+
+        mock_repository.save_history.assert_called_once_with('project/history.csv', [TransactionDto.from_dict(transaction.to_dict())])
+        mock_repository.save_history_changes.assert_not_called()
+        self.assertEqual('project/history.csv', self.history.checkpoint)
+
+    def test_save_history_changes_use_case(self):
+        transaction1 = Transaction('ref1', date(2024, 8, 10), 'source1', 1400.84, 'nothing to add1', 'vacation', 8, 'gift', 'testing1', False)
+        transaction2 = Transaction('ref2', date(2024, 8, 1), 'source2', 10.33, 'nothing to add2', '', 8, '', '', False)
+        self.history.add_transaction(transaction1)
+        self.history.add_transaction(transaction2)
+        self.history.mark_saved('project/history.csv')
+        self.history.delete_transaction('ref1')
+        mock_repository = Mock(spec=HistoryRepositoryInterface)
+        use_case = SaveHistoryUseCase(self.history, mock_repository, self.mock_presenter)
+
+        use_case.execute('project')
+
+        mock_repository.save_history_changes.assert_called_once_with('project/history.csv', [], ['ref1'])
+        mock_repository.save_history.assert_not_called()
+        self.assertEqual(([], []), self.history.get_changes())
+
+    def test_load_history_of_period_use_case(self):
+        transaction = TransactionDto('ref2', '2024-08-11', 'source2', '-10.33', 'notes2', 'groceries', '8', 'lidl', '', 'False')
+        mock_repository = Mock(spec=HistoryRepositoryInterface)
+        mock_repository.load_history.return_value = [transaction]
+        use_case = LoadHistoryUseCase(self.history, mock_repository, self.mock_presenter)
+
+        use_case.execute('project', month=8, category='groceries', year=2024)
+
+        mock_repository.load_history.assert_called_once_with('project/history.csv', month=8, category='groceries', year=2024)
+        self.assertEqual(['ref2'], list(self.history.items))
+        self.assertEqual('project/history.csv', self.history.checkpoint)
+
+    def test_import_into_partial_history_returns_error(self):
+        mock_repository = Mock(spec=HistoryRepositoryInterface)
+        mock_repository.load_history.return_value = []
+        LoadHistoryUseCase(self.history, mock_repository, self.mock_presenter).execute('project', month=3)
+        use_case = ImportTransactionsUseCase(self.history, self.mock_importer, self.mock_presenter)
+
+        use_case.execute('statement.csv')
+
+        self.mock_importer.import_transactions.assert_not_called()
+        result = self.mock_presenter.present_import_transactions.call_args.args[0]
+        self.assertFalse(result.success)
+        self.assertTrue(result.error.startswith('Failed to import transactions.'))
+
+    def test_save_partial_history_only_to_loaded_project(self):
+        mock_repository = Mock(spec=HistoryRepositoryInterface)
+        mock_repository.load_history.return_value = [TransactionDto('ref2', '2024-08-11', 'source2', '-10.33', 'notes2', 'groceries', '8', 'lidl', '', 'False')]
+        LoadHistoryUseCase(self.history, mock_repository, self.mock_presenter).execute('project', year=2024)
+        use_case = SaveHistoryUseCase(self.history, mock_repository, self.mock_presenter)
+
+        use_case.execute('other')
+        use_case.execute('project')
+
+        mock_repository.save_history.assert_not_called()
+        mock_repository.save_history_changes.assert_called_once_with('project/history.csv', [], [])
+        self.assertFalse(self.mock_presenter.present_failure.call_args.args[0].success)
+
+    def test_load_whole_history_clears_partial(self):
+        mock_repository = Mock(spec=HistoryRepositoryInterface)
+        mock_repository.load_history.return_value = []
+        use_case = LoadHistoryUseCase(self.history, mock_repository, self.mock_presenter)
+
+        use_case.execute('project', category='groceries')
+        self.assertTrue(self.history.partial)
+        use_case.execute('project')
+
+        self.assertFalse(self.history.partial)
+
 
 if __name__ == '__main__':
     unittest.main()
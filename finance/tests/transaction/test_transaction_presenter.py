@@ -0,0 +1,62 @@
+from datetime import date
+import unittest
+from unittest.mock import Mock
+
+from finance.application.dto import InteractorResultDto
+from finance.infrastructure.presenter import CmdHistoryPresenter
+from finance.interface.view import HistoryErrorViewModel, HistoryViewInterface, TransactionViewModel
+
+
+class TestCmdHistoryPresenter(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_view = Mock(spec=HistoryViewInterface)
+        self.presenter = CmdHistoryPresenter(self.mock_view)
+        self.data = {
+            'reference': 'ref1',
+            'day': date(2024, 8, 10),
+            'source': 'source',
+            'amount': -10.5,
+            'notes': 'notes',
+            'category': 'groceries',
+            'month': 8,
+            'tag': 'billa',
+            'comments': '',
+            'ignore': False,
+        }
+
+    def test_present_history_success(self):
+        result = InteractorResultDto(True, 'Search Transactions', [self.data])
+
+        self.presenter.present_history(result)
+
+        self.mock_view.show_list.assert_called_once_with('Search Transactions succeeded: 1 transactions', [TransactionViewModel.from_dict(self.data, 45)])
+
+    def test_present_history_without_transactions(self):
+        result = InteractorResultDto(True, 'List Transactions Between', [])
+
+        self.presenter.present_history(result)
+
+        self.mock_view.show_list.assert_not_called()
+        self.mock_view.show_failure.assert_called_once_with(HistoryErrorViewModel('List Transactions Between failed', 'No transactions were found'))
+
+    def test_present_history_failure(self):
+        result = InteractorResultDto(False, 'Search Transactions', error='The query is empty')
+
+        self.presenter.present_history(result)
+
+        self.mock_view.show_failure.assert_called_once_with(HistoryErrorViewModel('Search Transactions failed', 'The query is empty'))
+
+    def test_present_import_transactions_with_duplicates(self):
+        item = {'reference': 'ref2', 'day': '2024-08-11', 'source': 'source2', 'amount': -10.33, 'notes': 'notes2', 'category': '', 'month': 8, 'tag': '', 'comments': '', 'ignore': False}
+        result = InteractorResultDto(True, 'Import Transactions', data={'imported': [item], 'duplicated': ['ref1', 'ref3']})
+
+        self.presenter.present_import_transactions(result)
+
+        self.mock_view.show_list.assert_called_once()
+        error = HistoryErrorViewModel('Import Transactions warning: 2 transactions duplicated', 'Transaction with reference "ref1" already exists\n\tTransaction with reference "ref3" already exists')
+        self.mock_view.show_failure.assert_called_once_with(error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,255 @@
+import os
+import sqlite3
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from finance.application.dto import CategorizationRuleDto, TransactionDto
+from finance.infrastructure.repository import CsvHistoryRepository, CsvRuleRepository, SqliteHistoryRepository
+from finance.infrastructure.snapshot import write_snapshot
+
+
+class TestCsvHistoryRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'history.csv')
+        self.repository = CsvHistoryRepository(compaction_ratio=10.0)
+        self.transaction1 = TransactionDto('ref1', '2024-08-10', 'source1', '1400.84', 'notes1', 'salary', '8', '', '', 'False')
+        self.transaction2 = TransactionDto('ref2', '2024-08-11', 'source2', '-10.33', 'notes2', 'groceries', '8', 'lidl', '', 'False')
+        self.transaction3 = TransactionDto('ref3', '2024-09-01', 'source3', '-22.05', 'notes3', 'groceries', '9', '', 'comment', 'True')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_save_history_changes_appends_to_journal(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2])
+        with open(self.filename) as csv_file:
+            base = csv_file.read()
+        updated = TransactionDto('ref2', '2024-08-11', 'source2', '-10.33', 'notes2', 'eatingout', '8', 'lidl', '', 'False')
+
+        self.repository.save_history_changes(self.filename, [updated, self.transaction3], ['ref1'])
+
+        with open(self.filename) as csv_file:
+            self.assertEqual(base, csv_file.read())
+        self.assertTrue(os.path.exists(self.filename + '.journal'))
+        self.assertEqual([updated, self.transaction3], self.repository.load_history(self.filename))
+        self.assertEqual([self.transaction3], self.repository.load_history(self.filename, month=9))
+
+    def test_load_history_of_year(self) -> None:
+        transaction4 = TransactionDto('ref4', '2023-08-02', 'source4', '-5.00', 'notes4', 'groceries', '8', '', '', 'False')
+        self.repository.save_history(self.filename, [self.transaction1, transaction4])
+
+        self.assertEqual([transaction4], self.repository.load_history(self.filename, month=8, year=2023))
+
+    def test_load_history_splits_large_file(self) -> None:
+        transactions = [TransactionDto(f'ref{index}', '2024-08-10', 'source', '-1.00', f'notes\n"{index}"', '', '8', '', '', 'False') for index in range(300)]
+        self.repository.save_history(self.filename, transactions)
+
+        items = CsvHistoryRepository(workers=2, split_size=0).load_history(self.filename)
+
+        self.assertEqual(transactions, items)
+
+    def test_save_history_changes_compacts_journal(self) -> None:
+        repository = CsvHistoryRepository(compaction_ratio=0.5)
+        repository.save_history(self.filename, [self.transaction1, self.transaction2])
+
+        repository.save_history_changes(self.filename, [self.transaction3], ['ref1'])
+
+        self.assertFalse(os.path.exists(self.filename + '.journal'))
+        self.assertEqual([self.transaction2, self.transaction3], repository.load_history(self.filename))
+
+    def test_save_history_removes_journal(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1])
+        self.repository.save_history_changes(self.filename, [self.transaction2], [])
+
+        self.repository.save_history(self.filename, [self.transaction3])
+
+        self.assertFalse(os.path.exists(self.filename + '.journal'))
+        self.assertEqual([self.transaction3], self.repository.load_history(self.filename))
+
+    def test_load_history_from_snapshot(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2])
+        stat = os.stat(self.filename)
+        with open(self.filename, 'rb') as csv_file:
+            content = csv_file.read()
+        with open(self.filename, 'wb') as csv_file:
+            csv_file.write(content.replace(b'ref1', b'ref9'))
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual([self.transaction1, self.transaction2], self.repository.load_history(self.filename))
+        self.assertEqual(['ref9', 'ref2'], [item.reference for item in CsvHistoryRepository(snapshots=False).load_history(self.filename)])
+
+    def test_load_history_replays_journal_after_snapshot(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2])
+        updated = TransactionDto('ref2', '2024-08-11', 'source2', '-10.33', 'notes2', 'eatingout', '8', 'lidl', '', 'False')
+        self.repository.save_history_changes(self.filename, [updated], [])
+        snapshot = os.path.join(self.directory.name, 'history.snapshot')
+        modified = os.stat(snapshot).st_mtime_ns
+
+        self.repository.save_history_changes(self.filename, [self.transaction3], ['ref1'])
+
+        self.assertEqual([updated, self.transaction3], self.repository.load_history(self.filename))
+        self.assertEqual([updated, self.transaction3], CsvHistoryRepository(snapshots=False).load_history(self.filename))
+        self.assertEqual(modified, os.stat(snapshot).st_mtime_ns)
+
+    def test_compaction_writes_snapshot_once(self) -> None:
+        repository = CsvHistoryRepository(compaction_ratio=0.5)
+        repository.save_history(self.filename, [self.transaction1, self.transaction2])
+        os.remove(os.path.join(self.directory.name, 'history.snapshot'))
+
+        with patch('finance.infrastructure.repository.write_snapshot', wraps=write_snapshot) as mock_write_snapshot:
+            repository.save_history_changes(self.filename, [self.transaction3], ['ref1'])
+
+        mock_write_snapshot.assert_called_once()
+        self.assertEqual([self.transaction2, self.transaction3], repository.load_history(self.filename))
+
+    def test_load_history_refreshes_stale_snapshot(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2])
+        self.repository.save_history_changes(self.filename, [self.transaction3], ['ref1'])
+
+        self.assertEqual([self.transaction2, self.transaction3], self.repository.load_history(self.filename))
+        self.assertEqual([self.transaction2, self.transaction3], self.repository.load_history(self.filename))
+        self.assertEqual([self.transaction3], self.repository.load_history(self.filename, month=9))
+
+
+class TestSqliteHistoryRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'history.csv')
+        self.repository = SqliteHistoryRepository()
+        self.transaction1 = TransactionDto('ref1', '2024-08-10', 'source1', '1400.84', 'notes1', 'salary', '8', '', '', 'False')
+        self.transaction2 = TransactionDto('ref2', '2024-08-11', 'source2', '-10.33', 'notes2', 'groceries', '8', 'lidl', '', 'False')
+        self.transaction3 = TransactionDto('ref3', '2024-09-01', 'source3', '-22.05', 'notes3', 'groceries', '9', '', 'comment', 'True')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_save_and_load_history(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2, self.transaction3])
+
+        items = SqliteHistoryRepository().load_history(self.filename)
+
+        self.assertEqual([self.transaction1, self.transaction2, self.transaction3], items)
+
+    def test_load_history_with_predicates(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2, self.transaction3])
+
+        self.assertEqual([self.transaction1, self.transaction2], self.repository.load_history(self.filename, month=8))
+        self.assertEqual([self.transaction2, self.transaction3], self.repository.load_history(self.filename, category='groceries'))
+        self.assertEqual([self.transaction3], self.repository.load_history(self.filename, month=9, category='groceries'))
+
+    def test_load_history_of_year(self) -> None:
+        transaction4 = TransactionDto('ref4', '2023-08-02', 'source4', '-5.00', 'notes4', 'groceries', '8', '', '', 'False')
+        transaction5 = TransactionDto('ref5', '2023-12-30', 'source5', '3000.00', 'notes5', 'salary', '1', '', '', 'False')
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2, transaction4, transaction5])
+
+        self.assertEqual([self.transaction1, self.transaction2], self.repository.load_history(self.filename, month=8, year=2024))
+        self.assertEqual([transaction4], self.repository.load_history(self.filename, year=2023))
+        self.assertEqual([transaction5], self.repository.load_history(self.filename, month=1, year=2024))
+
+    def test_save_history_writes_only_changed_rows(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2, self.transaction3])
+        updated = TransactionDto('ref2', '2024-08-11', 'source2', '-10.33', 'notes2', 'eatingout', '8', 'lidl', '', 'False')
+        statements = []
+        connect = self.repository.connect
+
+        def traced_connect(filename):
+            connection = connect(filename)
+            connection.set_trace_callback(statements.append)
+            return connection
+
+        self.repository.connect = traced_connect
+        self.repository.save_history(self.filename, [self.transaction1, updated])
+
+        writes = [statement for statement in statements if statement.startswith(('INSERT', 'DELETE'))]
+        self.assertEqual(2, len(writes))
+        self.assertIn("'ref2'", writes[0])
+        self.assertIn("'ref3'", writes[1])
+        self.assertEqual([self.transaction1, updated], self.repository.load_history(self.filename))
+
+    def test_save_after_partial_load_keeps_other_rows(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2, self.transaction3])
+        repository = SqliteHistoryRepository()
+        items = repository.load_history(self.filename, month=9)
+
+        repository.save_history(self.filename, items)
+
+        self.assertEqual(3, len(repository.load_history(self.filename)))
+
+    def test_save_history_changes(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2])
+        updated = TransactionDto('ref2', '2024-08-11', 'source2', '-10.33', 'notes2', 'eatingout', '8', 'lidl', '', 'False')
+
+        self.repository.save_history_changes(self.filename, [updated, self.transaction3], ['ref1'])
+
+        self.assertEqual([updated, self.transaction3], SqliteHistoryRepository().load_history(self.filename))
+
+    def test_save_history_changes_writes_only_given_rows(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1, self.transaction2])
+        repository = SqliteHistoryRepository()
+        statements = []
+        connect = repository.connect
+
+        def traced_connect(filename):
+            connection = connect(filename)
+            connection.set_trace_callback(statements.append)
+            return connection
+
+        repository.connect = traced_connect
+        repository.save_history_changes(self.filename, [self.transaction3], ['ref1'])
+
+        writes = [statement for statement in statements if statement.startswith(('INSERT', 'DELETE'))]
+        self.assertEqual(2, len(writes))
+        self.assertTrue(writes[0].startswith('INSERT OR REPLACE') and "'ref3'" in writes[0])
+        self.assertTrue(writes[1].startswith('DELETE') and "'ref1'" in writes[1])
+        self.assertEqual([self.transaction2, self.transaction3], repository.load_history(self.filename))
+
+    def test_load_history_migrates_table_without_year(self) -> None:
+        connection = sqlite3.connect(os.path.join(self.directory.name, 'history.sqlite'))
+        with connection:
+            connection.execute('CREATE TABLE history (reference TEXT PRIMARY KEY, day TEXT, source TEXT, amount TEXT, notes TEXT, category TEXT, month INTEGER, tag TEXT, comments TEXT, ignore TEXT)')
+            connection.executemany('INSERT INTO history VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', [(*self.transaction1[:6], 8, *self.transaction1[7:]), ('ref5', '2023-12-30', 'source5', '3000.00', 'notes5', 'salary', 1, '', '', 'False')])
+        connection.close()
+
+        self.assertEqual([self.transaction1], self.repository.load_history(self.filename, year=2024, month=8))
+        self.assertEqual(['ref5'], [item.reference for item in self.repository.load_history(self.filename, year=2024, month=1)])
+        connection = sqlite3.connect(os.path.join(self.directory.name, 'history.sqlite'))
+        try:
+            indexes = {row[1] for row in connection.execute('PRAGMA index_list(history)')}
+        finally:
+            connection.close()
+        self.assertIn('history_period', indexes)
+
+    def test_database_uses_wal_and_indexes(self) -> None:
+        self.repository.save_history(self.filename, [self.transaction1])
+        connection = sqlite3.connect(os.path.join(self.directory.name, 'history.sqlite'))
+        try:
+            journal_mode = connection.execute('PRAGMA journal_mode').fetchone()[0]
+            indexes = {row[1] for row in connection.execute('PRAGMA index_list(history)')}
+        finally:
+            connection.close()
+
+        self.assertEqual('wal', journal_mode)
+        self.assertTrue({'history_period', 'history_category', 'history_day'} <= indexes)
+
+
+class TestCsvRuleRepository(unittest.TestCase):
+
+    def test_save_and_load_rules(self) -> None:
+        rules = [
+            CategorizationRuleDto('source', 'billa|spar', 'groceries', '', 'False'),
+            CategorizationRuleDto('notes', r'netflix\.com', 'subscriptions', 'streaming', 'True'),
+        ]
+        with TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'rules.csv')
+            repository = CsvRuleRepository()
+
+            repository.save_rules(filename, rules)
+
+            self.assertEqual(rules, repository.load_rules(filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+from datetime import date
 import unittest
 from unittest.mock import Mock, patch
 from uuid import uuid4
@@ -276,16 +277,25 @@ class TestHistoryCmd(unittest.TestCase):
 
         self.ui.do_list(args)
 
-        self.mock_controller.list_transactions.assert_called_once_with(month)
+        self.mock_controller.list_transactions.assert_called_once_with(month, None)
 
-    def test_list_more_than_one_parameter_success(self):
+    def test_list_year_success(self):
         month = 8
-        trailer = 'and more words'
-        args = f'{month} {trailer}'
+        year = 2024
+        args = f'{month} {year}'
 
         self.ui.do_list(args)
 
-        self.mock_controller.list_transactions.assert_called_once_with(month)
+        self.mock_controller.list_transactions.assert_called_once_with(month, year)
+
+    @patch('builtins.print')
+    def test_list_year_invalid_fails(self, mock_print):
+        args = '8 last'
+
+        self.ui.do_list(args)
+
+        mock_print.assert_called_once_with('The year should be a number. invalid literal for int() with base 10: \'last\'')
+        self.mock_controller.list_transactions.assert_not_called()
 
     @patch.object(HistoryCmd, 'do_help')
     def test_list_less_than_one_parameter_fails(self, mock_do_help):
@@ -305,6 +315,156 @@ class TestHistoryCmd(unittest.TestCase):
 
         mock_print.assert_called_once_with('The month should be a number. invalid literal for int() with base 10: \'august\'')
 
+    def test_range_success(self):
+        args = '2024-08-01 2024-08-31'
+
+        self.ui.do_range(args)
+
+        self.mock_controller.list_transactions_between.assert_called_once_with(date(2024, 8, 1), date(2024, 8, 31))
+
+    @patch.object(HistoryCmd, 'do_help')
+    def test_range_less_than_two_parameters_fails(self, mock_do_help):
+        self.ui.do_range('2024-08-01')
+
+        mock_do_help.assert_called_once_with('range')
+
+    @patch('builtins.print')
+    def test_range_invalid_day_fails(self, mock_print):
+        self.ui.do_range('2024-08-01 august')
+
+        mock_print.assert_called_once_with('The days should be dates in the format YYYY-MM-DD. Invalid isoformat string: \'august\'')
+        self.mock_controller.list_transactions_between.assert_not_called()
+
+    def test_search_success(self):
+        self.ui.do_search(' amazon  gift* ')
+
+        self.mock_controller.search_transactions.assert_called_once_with('amazon  gift*')
+
+    @patch.object(HistoryCmd, 'do_help')
+    def test_search_without_terms_fails(self, mock_do_help):
+        self.ui.do_search('  ')
+
+        mock_do_help.assert_called_once_with('search')
+
+    def test_add_rule_success(self):
+        self.ui.do_add_rule('source billa|spar groceries supermarket true')
+
+        self.mock_controller.add_rule.assert_called_once_with('source', 'billa|spar', 'groceries', 'supermarket', True)
+
+    def test_add_rule_defaults(self):
+        self.ui.do_add_rule('notes netflix subscriptions')
+
+        self.mock_controller.add_rule.assert_called_once_with('notes', 'netflix', 'subscriptions', '', False)
+
+    def test_add_rule_with_quoted_pattern(self):
+        self.ui.do_add_rule('notes "card payment  spar" groceries')
+
+        self.mock_controller.add_rule.assert_called_once_with('notes', 'card payment  spar', 'groceries', '', False)
+
+    def test_add_rule_unbalanced_quotes(self):
+        self.ui.do_add_rule('notes "card payment groceries')
+
+        self.mock_controller.add_rule.assert_not_called()
+
+    @patch.object(HistoryCmd, 'do_help')
+    def test_add_rule_missing_parameters(self, mock_do_help):
+        self.ui.do_add_rule('source billa')
+
+        mock_do_help.assert_called_once_with('add_rule')
+        self.mock_controller.add_rule.assert_not_called()
+
+    def test_add_rule_invalid_ignore(self):
+        self.ui.do_add_rule('source billa groceries supermarket maybe')
+
+        self.mock_controller.add_rule.assert_not_called()
+
+    def test_list_rules(self):
+        self.ui.do_list_rules('')
+
+        self.mock_controller.list_rules.assert_called_once_with()
+
+    @patch('os.makedirs')
+    def test_save_rules(self, mock_makedirs):
+        self.ui.do_save_rules('project')
+
+        mock_makedirs.assert_called_once_with('project', exist_ok=True)
+        self.mock_controller.save_rules.assert_called_once_with('project')
+
+    def test_load_rules(self):
+        self.ui.do_load_rules('project')
+
+        self.mock_controller.load_rules.assert_called_once_with('project')
+
+    def test_load(self):
+        self.ui.do_load('project')
+
+        self.mock_controller.load_budget.assert_called_once_with('project')
+
+    def test_load_period(self):
+        self.ui.do_load('project month=8 year=2024 category=groceries')
+
+        self.mock_controller.load_budget.assert_called_once_with('project', month=8, year=2024, category='groceries')
+
+    @patch('builtins.print')
+    def test_load_invalid_filter_fails(self, mock_print):
+        self.ui.do_load('project month=august')
+        self.ui.do_load('project tag=car')
+
+        self.assertEqual(2, mock_print.call_count)
+        self.mock_controller.load_budget.assert_not_called()
+
+    def test_review(self):
+        self.ui.do_review('')
+
+        self.mock_controller.review_transactions.assert_called_once_with()
+        self.mock_controller.review_clusters.assert_not_called()
+
+    def test_review_batch(self):
+        self.ui.do_review('batch')
+
+        self.mock_controller.review_clusters.assert_called_once_with()
+        self.mock_controller.review_transactions.assert_not_called()
+
+    def test_update_where_success(self):
+        self.ui.do_update_where('source~billa and notes~"pos 12" set category=groceries comments="weekly shop"')
+
+        self.mock_controller.update_transactions_where.assert_called_once_with('source~billa and notes~"pos 12"', category='groceries', comments='weekly shop')
+
+    def test_update_where_splits_on_first_unquoted_set(self):
+        self.ui.do_update_where('notes~"set top box" set comments="reset set x" tag=set')
+
+        self.mock_controller.update_transactions_where.assert_called_once_with('notes~"set top box"', comments='reset set x', tag='set')
+
+    @patch.object(HistoryCmd, 'do_help')
+    def test_update_where_with_quoted_set_only(self, mock_do_help):
+        self.ui.do_update_where('source~billa "set" category=groceries')
+
+        mock_do_help.assert_called_once_with('update_where')
+        self.mock_controller.update_transactions_where.assert_not_called()
+
+    @patch.object(HistoryCmd, 'do_help')
+    def test_update_where_without_changes(self, mock_do_help):
+        self.ui.do_update_where('source~billa')
+
+        mock_do_help.assert_called_once_with('update_where')
+        self.mock_controller.update_transactions_where.assert_not_called()
+
+    def test_update_where_invalid_change(self):
+        self.ui.do_update_where('source~billa set groceries')
+
+        self.mock_controller.update_transactions_where.assert_not_called()
+
+    def test_query_success(self):
+        self.ui.do_query(' where month in 1..3 group by tag sum amount ')
+
+        self.mock_controller.query_transactions.assert_called_once_with('where month in 1..3 group by tag sum amount')
+
+    @patch.object(HistoryCmd, 'do_help')
+    def test_query_without_query_fails(self, mock_do_help):
+        self.ui.do_query('')
+
+        mock_do_help.assert_called_once_with('query')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file